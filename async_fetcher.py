@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步网络抓取模块
+与 web_fetcher 中的同步抓取器共用数据源定义（请求参数、解析逻辑），
+基于 aiohttp 非阻塞请求 + asyncio.sleep 节流，所有抓取器共享一个连接池，
+单个事件循环即可并发完成成千上万次搜索建议查询
+"""
+
+import asyncio
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+import aiohttp
+
+from rate_limiter import HostRateLimiter, THROTTLE_STATUS, default_limiter
+from suggestion_cache import SuggestionCache
+from web_fetcher import (
+    EnhancedFetcher, SourceSpec,
+    BaiduSource, BilibiliSource, TaobaoSource, ZhihuSource, WeiboSource,
+    GoogleSource, BingSource
+)
+
+logger = logging.getLogger(__name__)
+
+# 与同步抓取器的 urllib3 Retry 策略保持一致
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 1
+
+
+def create_session(limit: int = 100, limit_per_host: int = 4,
+                   timeout: int = 15) -> aiohttp.ClientSession:
+    """
+    创建共享连接池
+
+    Args:
+        limit: 连接池总连接数上限
+        limit_per_host: 单个主机的连接数上限
+        timeout: 单次请求总超时（秒）
+
+    Returns:
+        aiohttp.ClientSession，需在事件循环内创建并由调用方关闭
+    """
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        cookie_jar=aiohttp.CookieJar()
+    )
+
+
+class AsyncEnhancedFetcher(SourceSpec):
+    """异步增强版网络抓取器"""
+
+    HEADERS_POOL = EnhancedFetcher.HEADERS_POOL
+
+    def __init__(self, session: aiohttp.ClientSession, use_proxy=False, proxy_list=None,
+                 rate_limiter: HostRateLimiter = None, cache: SuggestionCache = None):
+        """
+        初始化抓取器
+
+        Args:
+            session: 共享的 aiohttp 会话（见 create_session）
+            use_proxy: 是否使用代理
+            proxy_list: 代理列表 ['http://...']
+            rate_limiter: 按主机限速器（默认使用进程内共享的限速器）
+            cache: 结果缓存（None 表示不缓存）
+        """
+        self.session = session
+        self.use_proxy = use_proxy
+        self.proxy_list = proxy_list or []
+        self.rate_limiter = rate_limiter or default_limiter
+        self.cache = cache
+
+    def _get_random_headers(self):
+        """获取随机请求头"""
+        return random.choice(self.HEADERS_POOL).copy()
+
+    def _get_proxy(self):
+        """获取随机代理"""
+        if not self.use_proxy or not self.proxy_list:
+            return None
+        proxy = random.choice(self.proxy_list)
+        # 兼容同步抓取器的 {'http': ..., 'https': ...} 格式
+        if isinstance(proxy, dict):
+            return proxy.get("http") or proxy.get("https")
+        return proxy
+
+    async def fetch(self, url: str, params: dict = None, method: str = "GET",
+                    source_name: str = "") -> Optional[str]:
+        """
+        安全的异步HTTP请求
+
+        Args:
+            url: 请求URL
+            params: 查询参数
+            method: 请求方法 GET/POST
+            source_name: 数据源名称（用于日志）
+
+        Returns:
+            响应文本或None
+        """
+        host = HostRateLimiter.host_of(url)
+        self.rate_limiter.configure(host, *self.RATE_LIMIT)
+
+        for attempt in range(RETRY_TOTAL + 1):
+            # 按主机限速，避免请求过快（重试同样计入限速）
+            await self.rate_limiter.acquire_async(host)
+            try:
+                kwargs = {"headers": self._get_random_headers(), "proxy": self._get_proxy()}
+                if method.upper() == "GET":
+                    kwargs["params"] = params
+                else:
+                    kwargs["data"] = params
+
+                async with self.session.request(method.upper(), url, **kwargs) as response:
+                    self.rate_limiter.record(host, status=response.status)
+                    if response.status in THROTTLE_STATUS and attempt < RETRY_TOTAL:
+                        await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+                        continue
+
+                    if response.status == 200:
+                        text = await response.text(encoding=self.ENCODING, errors="replace")
+                        logger.info(f"✅ {source_name}: 成功")
+                        return text
+
+                    logger.warning(f"⚠️  {source_name}: HTTP {response.status}")
+                    return None
+
+            except asyncio.TimeoutError:
+                self.rate_limiter.record(host, throttled=True)
+                logger.warning(f"⚠️  {source_name}: 超时")
+                return None
+            except aiohttp.ClientError as e:
+                logger.warning(f"⚠️  {source_name}: {type(e).__name__}")
+                return None
+            except Exception as e:
+                logger.warning(f"⚠️  {source_name}: 未知错误 - {str(e)[:50]}")
+                return None
+
+        return None
+
+    async def fetch_suggestions(self, keyword: str) -> List[str]:
+        """抓取搜索建议"""
+        cached = self._cache_get(keyword)
+        if cached is not None:
+            return cached
+
+        logger.info(f"  🔍 {self.LABEL}: {keyword}")
+        text = await self.fetch(self.SUGGEST_URL, params=self.suggest_params(keyword),
+                                source_name=self.SOURCE_NAME)
+        if text is None:
+            return []
+        suggestions = self._parse(self.parse_suggestions, text)
+        self._cache_set(keyword, suggestions)
+        return suggestions
+
+    async def fetch_hot_topics(self) -> List[str]:
+        """抓取热榜话题"""
+        cached = self._cache_get()
+        if cached is not None:
+            return cached
+
+        logger.info(f"  🔍 {self.SOURCE_NAME}")
+        text = await self.fetch(self.HOT_URL, source_name=self.SOURCE_NAME)
+        if text is None:
+            return []
+        topics = self._parse(self.parse_hot_topics, text)
+        self._cache_set("", topics)
+        return topics
+
+
+class AsyncBaiduFetcher(BaiduSource, AsyncEnhancedFetcher):
+    """百度搜索建议异步抓取器"""
+
+
+class AsyncBilibiliFetcher(BilibiliSource, AsyncEnhancedFetcher):
+    """B站搜索建议异步抓取器"""
+
+
+class AsyncTaobaoFetcher(TaobaoSource, AsyncEnhancedFetcher):
+    """淘宝搜索建议异步抓取器"""
+
+
+class AsyncZhihuFetcher(ZhihuSource, AsyncEnhancedFetcher):
+    """知乎热榜异步抓取器"""
+
+
+class AsyncWeiboFetcher(WeiboSource, AsyncEnhancedFetcher):
+    """微博热搜异步抓取器"""
+
+
+class AsyncGoogleAutoCompleteFetcher(GoogleSource, AsyncEnhancedFetcher):
+    """Google自动补全异步抓取器"""
+
+
+class AsyncBingAutoCompleteFetcher(BingSource, AsyncEnhancedFetcher):
+    """Bing自动补全异步抓取器"""
+
+
+# 工厂函数
+def create_async_fetcher(source: str, session: aiohttp.ClientSession, **kwargs) -> AsyncEnhancedFetcher:
+    """
+    创建异步抓取器实例
+
+    Args:
+        source: 数据源名称 (baidu/bilibili/taobao/zhihu/weibo/google/bing)
+        session: 共享的 aiohttp 会话
+        **kwargs: 其他参数
+
+    Returns:
+        对应的异步抓取器实例
+    """
+    fetchers = {
+        "baidu": AsyncBaiduFetcher,
+        "bilibili": AsyncBilibiliFetcher,
+        "taobao": AsyncTaobaoFetcher,
+        "zhihu": AsyncZhihuFetcher,
+        "weibo": AsyncWeiboFetcher,
+        "google": AsyncGoogleAutoCompleteFetcher,
+        "bing": AsyncBingAutoCompleteFetcher
+    }
+
+    fetcher_class = fetchers.get(source.lower(), AsyncEnhancedFetcher)
+    return fetcher_class(session, **kwargs)
+
+
+async def fetch_suggestions_matrix(fetchers: Dict[str, AsyncEnhancedFetcher],
+                                   keywords: Iterable[str],
+                                   source_limits: Optional[Dict[str, int]] = None,
+                                   default_limit: int = 1) -> List[Tuple[str, str, List[str]]]:
+    """
+    在一个事件循环内并发抓取 关键词 × 数据源 矩阵
+
+    Args:
+        fetchers: 数据源名称 -> 异步抓取器
+        keywords: 关键词列表
+        source_limits: 各数据源的并发上限 {名称: 并发数}
+        default_limit: 未单独配置的数据源使用的并发上限
+
+    Returns:
+        (关键词, 数据源, 建议词列表) 列表，顺序为关键词优先，其次数据源
+    """
+    keywords = list(keywords)
+    semaphores = {
+        name: asyncio.Semaphore(max(1, (source_limits or {}).get(name, default_limit)))
+        for name in fetchers
+    }
+
+    async def run_one(keyword, source):
+        async with semaphores[source]:
+            try:
+                return keyword, source, await fetchers[source].fetch_suggestions(keyword)
+            except Exception as e:
+                logger.warning(f"  ⚠️  {source}: {keyword} 抓取异常 - {str(e)[:50]}")
+                return keyword, source, []
+
+    return await asyncio.gather(*(
+        run_one(keyword, source) for keyword in keywords for source in fetchers
+    ))
+
+
+if __name__ == "__main__":
+    # 测试代码
+    async def _demo():
+        async with create_session() as session:
+            fetchers = {name: create_async_fetcher(name, session) for name in ("baidu", "bilibili", "google")}
+            for keyword, source, results in await fetch_suggestions_matrix(fetchers, ["养生"]):
+                print(f"{source}结果: {results[:5] if results else '无'}")
+
+    asyncio.run(_demo())
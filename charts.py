@@ -5,406 +5,680 @@ SEO关键词数据可视化模块
 生成多种图表帮助分析关键词数据
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
-import pandas as pd
+import hashlib
+import importlib.util
 import numpy as np
 from pathlib import Path
+import heapq
 import json
+import os
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from history_store import HistoryStore, HISTORY_DB
+from suggestion_cache import atomic_write_json
+from time_series import RunTimeSeries, WINDOW_NAMES
+
+# 并行渲染图表的进程数：None 表示 min(图表数, CPU核数)，1 表示在主进程内逐个渲染
+CHART_WORKERS = None
+
+# TOP关键词条形图的关键词数、词云的最多词数
+TOP_N_KEYWORDS = 20
+WORDCLOUD_MAX_WORDS = 200
+
+# 历史趋势图：时间窗口（"hour"/"day"/"week"，None 表示按历史跨度自动选择）和最多点数
+TREND_WINDOW = None
+TREND_MAX_POINTS = 60
+
+# 图表指纹清单：记录每个图表上次渲染时的输入数据哈希，数据不变时沿用已有图片
+MANIFEST_FILE = "chart_manifest.json"
+
+# 图表样式版本：修改渲染函数的样式后递增，使所有图表重新渲染
+CHART_VERSION = 1
+
+# 绘图依赖（只在真正渲染图表时才导入，导入本模块不加载它们）
+PLOTTING_PACKAGES = ("matplotlib", "seaborn", "wordcloud")
+
+_plotting_modules = None
 
-# 设置中文字体
-plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'DejaVu Sans']
-plt.rcParams['axes.unicode_minus'] = False
-
-# 设置配色方案
-sns.set_palette("husl")
-sns.set_style("whitegrid")
 
+def missing_plotting_packages():
+    """未安装的绘图依赖（只查找，不导入）"""
+    return [name for name in PLOTTING_PACKAGES if importlib.util.find_spec(name) is None]
+
+
+def _plotting():
+    """
+    按需导入 matplotlib（非交互式 Agg 后端）和 seaborn，并设置全局样式；每个进程只执行一次
+
+    Returns:
+        (pyplot, seaborn)
+    """
+    global _plotting_modules
+    if _plotting_modules is None:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        # 设置中文字体
+        plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'DejaVu Sans']
+        plt.rcParams['axes.unicode_minus'] = False
+
+        # 设置配色方案
+        sns.set_palette("husl")
+        sns.set_style("whitegrid")
+
+        _plotting_modules = (plt, sns)
+    return _plotting_modules
+
+
+def chart_fingerprint(render, payload):
+    """
+    图表输入数据的哈希（渲染函数 + 样式版本 + 数据）
+
+    Args:
+        render: 渲染函数
+        payload: 渲染函数的数据参数
+
+    Returns:
+        16位十六进制哈希
+    """
+    digest = hashlib.sha256(f"{render.__name__}:{CHART_VERSION}".encode("utf-8"))
+    for key in sorted(payload):
+        value = payload[key]
+        digest.update(key.encode("utf-8"))
+        if isinstance(value, np.ndarray):
+            digest.update(str(value.dtype).encode("utf-8"))
+            digest.update(np.ascontiguousarray(value).tobytes())
+        else:
+            # 计数器和列表保持原有顺序（同数量的项按顺序绘制，顺序不同图片也不同）
+            digest.update(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+# ==================== 图表渲染 ====================
+# 每个渲染函数只接收预先提取好的可序列化数据，可以直接在子进程中运行；绘图库在渲染时才导入
+
+def render_score_distribution(output_dir, scores):
+    """评分分布直方图 + 箱线图"""
+    plt, _ = _plotting()
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    # 直方图
+    axes[0].hist(scores, bins=20, color='skyblue', edgecolor='black', alpha=0.7)
+    axes[0].set_xlabel('评分', fontsize=12)
+    axes[0].set_ylabel('关键词数量', fontsize=12)
+    axes[0].set_title('关键词评分分布', fontsize=14, fontweight='bold')
+    axes[0].grid(axis='y', alpha=0.3)
+
+    # 箱线图
+    axes[1].boxplot(scores, vert=True, patch_artist=True,
+                   boxprops=dict(facecolor='lightblue', alpha=0.7),
+                   medianprops=dict(color='red', linewidth=2))
+    axes[1].set_ylabel('评分', fontsize=12)
+    axes[1].set_title('评分统计箱线图', fontsize=14, fontweight='bold')
+    axes[1].grid(axis='y', alpha=0.3)
+
+    # 添加统计信息
+    mean_score = np.mean(scores)
+    median_score = np.median(scores)
+    axes[1].text(1.1, mean_score, f'平均: {mean_score:.1f}', fontsize=10)
+    axes[1].text(1.1, median_score, f'中位数: {median_score:.1f}', fontsize=10)
+
+    plt.tight_layout()
+    output_path = Path(output_dir) / "score_distribution.png"
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
+    return output_path
+
+
+def render_intent_pie(output_dir, intent_counts):
+    """意图标签饼图"""
+    plt, sns = _plotting()
+    # 按数量排序
+    sorted_intents = dict(sorted(intent_counts.items(), key=lambda x: x[1], reverse=True))
+
+    fig, ax = plt.subplots(figsize=(10, 8))
+
+    colors = sns.color_palette("Set3", len(sorted_intents))
+    wedges, texts, autotexts = ax.pie(
+        sorted_intents.values(),
+        labels=sorted_intents.keys(),
+        autopct='%1.1f%%',
+        colors=colors,
+        startangle=90,
+        textprops={'fontsize': 11}
+    )
+
+    # 美化文本
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+
+    ax.set_title('关键词意图标签分布', fontsize=16, fontweight='bold', pad=20)
+
+    # 添加图例
+    ax.legend(wedges, [f'{k}: {v}' for k, v in sorted_intents.items()],
+             title="意图分类",
+             loc="center left",
+             bbox_to_anchor=(1, 0, 0.5, 1))
+
+    plt.tight_layout()
+    output_path = Path(output_dir) / "intent_distribution.png"
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
+    return output_path
+
+
+def render_source_bar(output_dir, source_counts):
+    """关键词来源分布条形图"""
+    plt, sns = _plotting()
+    sorted_sources = dict(sorted(source_counts.items(), key=lambda x: x[1], reverse=True))
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    sources_list = list(sorted_sources.keys())
+    counts_list = list(sorted_sources.values())
+
+    colors = sns.color_palette("viridis", len(sources_list))
+    bars = ax.barh(sources_list, counts_list, color=colors)
+
+    # 添加数值标签
+    for bar, count in zip(bars, counts_list):
+        width = bar.get_width()
+        ax.text(width + 0.5, bar.get_y() + bar.get_height()/2,
+               f'{count}',
+               ha='left', va='center', fontsize=10, fontweight='bold')
+
+    ax.set_xlabel('关键词数量', fontsize=12)
+    ax.set_ylabel('数据源', fontsize=12)
+    ax.set_title('各数据源关键词数量分布', fontsize=14, fontweight='bold')
+    ax.grid(axis='x', alpha=0.3)
+
+    plt.tight_layout()
+    output_path = Path(output_dir) / "source_distribution.png"
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
+    return output_path
+
+
+def render_top_keywords_bar(output_dir, top_keywords, top_n):
+    """TOP关键词条形图"""
+    plt, _ = _plotting()
+    keywords_list = [kw for kw, _ in top_keywords]
+    scores_list = [score for _, score in top_keywords]
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+
+    colors = plt.cm.RdYlGn_r(np.linspace(0.2, 0.8, len(keywords_list)))
+    bars = ax.barh(range(len(keywords_list)), scores_list, color=colors)
+
+    # 设置Y轴标签
+    ax.set_yticks(range(len(keywords_list)))
+    ax.set_yticklabels(keywords_list, fontsize=9)
+
+    # 添加数值标签
+    for i, (bar, score) in enumerate(zip(bars, scores_list)):
+        width = bar.get_width()
+        ax.text(width + 0.3, bar.get_y() + bar.get_height()/2,
+               f'{score}',
+               ha='left', va='center', fontsize=9, fontweight='bold')
+
+    ax.set_xlabel('评分', fontsize=12)
+    ax.set_title(f'TOP {top_n} 高分关键词', fontsize=14, fontweight='bold')
+    ax.grid(axis='x', alpha=0.3)
+
+    # 反转Y轴，让最高的在顶部
+    ax.invert_yaxis()
+
+    plt.tight_layout()
+    output_path = Path(output_dir) / f"top_{top_n}_keywords.png"
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
+    return output_path
+
+
+def render_wordcloud(output_dir, word_freq):
+    """关键词词云"""
+    from wordcloud import WordCloud
+
+    plt, _ = _plotting()
+
+    # 生成词云
+    wordcloud = WordCloud(
+        width=1600,
+        height=800,
+        background_color='white',
+        colormap='viridis',
+        max_words=WORDCLOUD_MAX_WORDS,
+        relative_scaling=0.5,
+        min_font_size=10
+    ).generate_from_frequencies(word_freq)
+
+    fig, ax = plt.subplots(figsize=(16, 8))
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.axis('off')
+    ax.set_title('SEO关键词词云（字体大小=评分权重）', fontsize=16, fontweight='bold', pad=20)
+
+    plt.tight_layout(pad=0)
+    output_path = Path(output_dir) / "wordcloud.png"
+    plt.savefig(output_path, dpi=300, bbox_inches='tight', pad_inches=0.1)
+    plt.close()
+
+    return output_path
+
+
+def render_trend_line(output_dir, series):
+    """历史趋势图（每个时间窗口一个点：平均值连线，最小~最大值为阴影带）"""
+    plt, _ = _plotting()
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    x = np.arange(len(series["labels"]))
+    lines = [("keywords_count", '关键词总数', 'steelblue'), ("high_score_count", '高分关键词(≥8)', 'coral')]
+    for metric, label, color in lines:
+        # 旧版导入的运行没有高分关键词数，对应窗口为 None（不画点）
+        mean = np.array(series[metric]["mean"], dtype=float)
+        if np.isnan(mean).all():
+            continue
+        low = np.array(series[metric]["min"], dtype=float)
+        high = np.array(series[metric]["max"], dtype=float)
+        ax.plot(x, mean, marker='o' if len(x) <= 30 else None,
+                linewidth=2, markersize=6, label=f'{label}（平均）', color=color)
+        ax.fill_between(x, low, high, color=color, alpha=0.15, label=f'{label}（最小~最大）')
+
+    # 坐标轴标签最多约12个
+    step = max(1, -(-len(x) // 12))
+    ax.set_xticks(x[::step])
+    ax.set_xticklabels(series["labels"][::step], rotation=30, ha='right')
+
+    window_name = WINDOW_NAMES[series["window"]]
+    ax.set_xlabel(f'时间（每{window_name}）', fontsize=12)
+    ax.set_ylabel('关键词数量', fontsize=12)
+    ax.set_title(f'关键词数量历史趋势（按{window_name}聚合，共 {sum(series["runs"])} 次运行）',
+                 fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    output_path = Path(output_dir) / "historical_trend.png"
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
+    return output_path
+
+
+def render_summary_dashboard(output_dir, stats, scores, intent_counts, source_counts, top10):
+    """数据概览仪表板"""
+    plt, sns = _plotting()
+    fig = plt.figure(figsize=(16, 10))
+
+    # 创建网格布局
+    gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
+
+    # 1. 关键词总数
+    ax1 = fig.add_subplot(gs[0, 0])
+    ax1.text(0.5, 0.5, f'{stats["total"]}',
+            ha='center', va='center', fontsize=48, fontweight='bold', color='steelblue')
+    ax1.text(0.5, 0.2, '关键词总数', ha='center', va='center', fontsize=14)
+    ax1.axis('off')
+
+    # 2. 高分关键词数
+    ax2 = fig.add_subplot(gs[0, 1])
+    high_score = int(np.count_nonzero(scores >= 8))
+    ax2.text(0.5, 0.5, f'{high_score}',
+            ha='center', va='center', fontsize=48, fontweight='bold', color='coral')
+    ax2.text(0.5, 0.2, '高分关键词(≥8)', ha='center', va='center', fontsize=14)
+    ax2.axis('off')
+
+    # 3. 平均评分
+    ax3 = fig.add_subplot(gs[0, 2])
+    avg_score = np.mean(scores)
+    ax3.text(0.5, 0.5, f'{avg_score:.1f}',
+            ha='center', va='center', fontsize=48, fontweight='bold', color='green')
+    ax3.text(0.5, 0.2, '平均评分', ha='center', va='center', fontsize=14)
+    ax3.axis('off')
+
+    # 4. 评分分布
+    ax4 = fig.add_subplot(gs[1, :])
+    ax4.hist(scores, bins=20, color='skyblue', edgecolor='black', alpha=0.7)
+    ax4.set_xlabel('评分', fontsize=11)
+    ax4.set_ylabel('数量', fontsize=11)
+    ax4.set_title('评分分布', fontsize=12, fontweight='bold')
+    ax4.grid(axis='y', alpha=0.3)
+
+    # 5. 意图分布饼图
+    ax5 = fig.add_subplot(gs[2, 0])
+    ax5.pie(intent_counts.values(), labels=intent_counts.keys(), autopct='%1.1f%%',
+            colors=sns.color_palette("Set3", len(intent_counts)))
+    ax5.set_title('意图分布', fontsize=12, fontweight='bold')
+
+    # 6. 数据源分布
+    ax6 = fig.add_subplot(gs[2, 1])
+    sorted_sources = dict(sorted(source_counts.items(), key=lambda x: x[1], reverse=True)[:5])
+    ax6.barh(list(sorted_sources.keys()), list(sorted_sources.values()),
+            color=sns.color_palette("viridis", len(sorted_sources)))
+    ax6.set_xlabel('数量', fontsize=11)
+    ax6.set_title('数据源分布', fontsize=12, fontweight='bold')
+    ax6.invert_yaxis()
+
+    # 7. TOP10关键词
+    ax7 = fig.add_subplot(gs[2, 2])
+    keywords_list = [f"{kw[:10]}..." for kw, _ in top10]
+    scores_list = [score for _, score in top10]
+    ax7.barh(keywords_list, scores_list, color=plt.cm.RdYlGn_r(np.linspace(0.3, 0.7, 10)))
+    ax7.set_xlabel('评分', fontsize=11)
+    ax7.set_title('TOP10关键词', fontsize=12, fontweight='bold')
+    ax7.invert_yaxis()
+
+    fig.suptitle('SEO关键词数据概览仪表板', fontsize=18, fontweight='bold', y=0.98)
+
+    plt.tight_layout()
+    output_path = Path(output_dir) / "summary_dashboard.png"
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
+    return output_path
+
+
+# ==================== 可视化器 ====================
 
 class KeywordVisualizer:
     """关键词数据可视化器"""
 
-    def __init__(self, output_dir="output/charts"):
+    def __init__(self, output_dir="output/charts", workers=CHART_WORKERS, trend_window=TREND_WINDOW):
+        """
+        Args:
+            output_dir: 图表输出目录
+            workers: 并行渲染的进程数（None 表示 min(图表数, CPU核数)）
+            trend_window: 历史趋势图的时间窗口（None 表示自动选择）
+        """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = workers
+        self.trend_window = trend_window
+        self.manifest_path = self.output_dir / MANIFEST_FILE
+        # 仅在一次 generate_all_charts 调用期间有效的汇总数据，调用结束即清空
+        self._aggregates = None
+
+    # ---------- 数据提取（在主进程中运行） ----------
+
+    @staticmethod
+    def aggregate(keywords_data):
+        """
+        一次遍历关键词，计算所有图表共用的汇总数据（每次调用都重新计算，不做缓存）
+
+        Args:
+            keywords_data: 按排名排列的 (关键词, 数据) 列表
+
+        Returns:
+            {"scores": 评分数组, "intent_counts": 首个意图计数, "source_counts": 来源计数,
+             "top_keywords": 前 TOP_N_KEYWORDS 个 (关键词, 评分), "word_freq": 词云权重最高的词}
+        """
+        scores = np.empty(len(keywords_data), dtype=np.int64)
+        intent_counts = Counter()
+        source_counts = Counter()
+        word_freq = {}
+        for i, (kw, data) in enumerate(keywords_data):
+            score = data['score']
+            scores[i] = score
+            intent_counts[data['intent'].split('/')[0] or '通用'] += 1  # 取第一个意图
+            source_counts[data['source']] += 1
+            # 词云按评分加权
+            word_freq[kw] = word_freq.get(kw, 0) + score
+
+        return {
+            "scores": scores,
+            "intent_counts": intent_counts,
+            "source_counts": source_counts,
+            "top_keywords": [(kw, data['score']) for kw, data in keywords_data[:TOP_N_KEYWORDS]],
+            # 词云只会用到权重最高的 WORDCLOUD_MAX_WORDS 个词（与词云内部的稳定排序一致）
+            "word_freq": dict(heapq.nlargest(WORDCLOUD_MAX_WORDS, word_freq.items(), key=lambda item: item[1])),
+        }
+
+    def _aggregates_of(self, keywords_data):
+        """generate_all_charts 本轮已汇总的数据；单独生成某个图表时当场汇总"""
+        if self._aggregates is not None:
+            return self._aggregates
+        return self.aggregate(keywords_data)
+
+    def _score_payload(self, keywords_data):
+        return {"scores": self._aggregates_of(keywords_data)["scores"]}
+
+    def _intent_payload(self, keywords_data):
+        return {"intent_counts": self._aggregates_of(keywords_data)["intent_counts"]}
+
+    def _source_payload(self, keywords_data):
+        return {"source_counts": self._aggregates_of(keywords_data)["source_counts"]}
+
+    def _top_keywords_payload(self, keywords_data, top_n=TOP_N_KEYWORDS):
+        if top_n <= TOP_N_KEYWORDS:
+            top_keywords = self._aggregates_of(keywords_data)["top_keywords"][:top_n]
+        else:
+            top_keywords = [(kw, data['score']) for kw, data in keywords_data[:top_n]]
+        return {"top_keywords": top_keywords, "top_n": top_n}
+
+    def _wordcloud_payload(self, keywords_data):
+        return {"word_freq": self._aggregates_of(keywords_data)["word_freq"]}
+
+    def _trend_payload(self, history_db=HISTORY_DB):
+        with HistoryStore(history_db) as store:
+            series = RunTimeSeries(store).series(window=self.trend_window, max_points=TREND_MAX_POINTS,
+                                                 metrics=("keywords_count", "high_score_count"))
+
+        if series is None or sum(series["runs"]) < 2:
+            print("  ⚠️  历史数据不足，跳过趋势图")
+            return None
 
-    def generate_score_distribution(self, keywords_data):
-        """生成关键词评分分布直方图"""
-        scores = [data['score'] for _, data in keywords_data]
-
-        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-        # 直方图
-        axes[0].hist(scores, bins=20, color='skyblue', edgecolor='black', alpha=0.7)
-        axes[0].set_xlabel('评分', fontsize=12)
-        axes[0].set_ylabel('关键词数量', fontsize=12)
-        axes[0].set_title('关键词评分分布', fontsize=14, fontweight='bold')
-        axes[0].grid(axis='y', alpha=0.3)
-
-        # 箱线图
-        axes[1].boxplot(scores, vert=True, patch_artist=True,
-                       boxprops=dict(facecolor='lightblue', alpha=0.7),
-                       medianprops=dict(color='red', linewidth=2))
-        axes[1].set_ylabel('评分', fontsize=12)
-        axes[1].set_title('评分统计箱线图', fontsize=14, fontweight='bold')
-        axes[1].grid(axis='y', alpha=0.3)
-
-        # 添加统计信息
-        mean_score = np.mean(scores)
-        median_score = np.median(scores)
-        axes[1].text(1.1, mean_score, f'平均: {mean_score:.1f}', fontsize=10)
-        axes[1].text(1.1, median_score, f'中位数: {median_score:.1f}', fontsize=10)
-
-        plt.tight_layout()
-        output_path = self.output_dir / "score_distribution.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
-
-        return output_path
-
-    def generate_intent_pie(self, keywords_data):
-        """生成意图标签饼图"""
-        intents = []
-        for _, data in keywords_data:
-            intent = data['intent'].split('/')[0]  # 取第一个意图
-            intents.append(intent if intent else '通用')
-
-        intent_counts = Counter(intents)
-
-        # 按数量排序
-        sorted_intents = dict(sorted(intent_counts.items(), key=lambda x: x[1], reverse=True))
-
-        fig, ax = plt.subplots(figsize=(10, 8))
-
-        colors = sns.color_palette("Set3", len(sorted_intents))
-        wedges, texts, autotexts = ax.pie(
-            sorted_intents.values(),
-            labels=sorted_intents.keys(),
-            autopct='%1.1f%%',
-            colors=colors,
-            startangle=90,
-            textprops={'fontsize': 11}
-        )
+        return {"series": series}
 
-        # 美化文本
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
+    def _dashboard_payload(self, keywords_data, stats):
+        aggregates = self._aggregates_of(keywords_data)
+        return {
+            "stats": stats,
+            "scores": aggregates["scores"],
+            "intent_counts": aggregates["intent_counts"],
+            "source_counts": aggregates["source_counts"],
+            "top10": aggregates["top_keywords"][:10],
+        }
 
-        ax.set_title('关键词意图标签分布', fontsize=16, fontweight='bold', pad=20)
+    # ---------- 单个图表 ----------
 
-        # 添加图例
-        ax.legend(wedges, [f'{k}: {v}' for k, v in sorted_intents.items()],
-                 title="意图分类",
-                 loc="center left",
-                 bbox_to_anchor=(1, 0, 0.5, 1))
+    def _render_one(self, render, payload):
+        """渲染单个图表（数据未变化时沿用已有图片），失败时抛出异常"""
+        result = self._render([(render.__name__, render, payload)])[0][0]
+        if isinstance(result, Exception):
+            raise result
+        return result
 
-        plt.tight_layout()
-        output_path = self.output_dir / "intent_distribution.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+    def generate_score_distribution(self, keywords_data):
+        """生成关键词评分分布直方图"""
+        return self._render_one(render_score_distribution, self._score_payload(keywords_data))
 
-        return output_path
+    def generate_intent_pie(self, keywords_data):
+        """生成意图标签饼图"""
+        return self._render_one(render_intent_pie, self._intent_payload(keywords_data))
 
     def generate_source_bar(self, keywords_data):
         """生成关键词来源分布条形图"""
-        sources = []
-        for _, data in keywords_data:
-            source = data['source']
-            sources.append(source)
-
-        source_counts = Counter(sources)
-        sorted_sources = dict(sorted(source_counts.items(), key=lambda x: x[1], reverse=True))
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-
-        sources_list = list(sorted_sources.keys())
-        counts_list = list(sorted_sources.values())
-
-        colors = sns.color_palette("viridis", len(sources_list))
-        bars = ax.barh(sources_list, counts_list, color=colors)
-
-        # 添加数值标签
-        for bar, count in zip(bars, counts_list):
-            width = bar.get_width()
-            ax.text(width + 0.5, bar.get_y() + bar.get_height()/2,
-                   f'{count}',
-                   ha='left', va='center', fontsize=10, fontweight='bold')
-
-        ax.set_xlabel('关键词数量', fontsize=12)
-        ax.set_ylabel('数据源', fontsize=12)
-        ax.set_title('各数据源关键词数量分布', fontsize=14, fontweight='bold')
-        ax.grid(axis='x', alpha=0.3)
-
-        plt.tight_layout()
-        output_path = self.output_dir / "source_distribution.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        return self._render_one(render_source_bar, self._source_payload(keywords_data))
 
-        return output_path
-
-    def generate_top_keywords_bar(self, keywords_data, top_n=20):
+    def generate_top_keywords_bar(self, keywords_data, top_n=TOP_N_KEYWORDS):
         """生成TOP关键词条形图"""
-        top_keywords = keywords_data[:top_n]
-
-        keywords_list = [kw for kw, _ in top_keywords]
-        scores_list = [data['score'] for _, data in top_keywords]
-
-        fig, ax = plt.subplots(figsize=(12, 8))
-
-        colors = plt.cm.RdYlGn_r(np.linspace(0.2, 0.8, len(keywords_list)))
-        bars = ax.barh(range(len(keywords_list)), scores_list, color=colors)
-
-        # 设置Y轴标签
-        ax.set_yticks(range(len(keywords_list)))
-        ax.set_yticklabels(keywords_list, fontsize=9)
-
-        # 添加数值标签
-        for i, (bar, score) in enumerate(zip(bars, scores_list)):
-            width = bar.get_width()
-            ax.text(width + 0.3, bar.get_y() + bar.get_height()/2,
-                   f'{score}',
-                   ha='left', va='center', fontsize=9, fontweight='bold')
-
-        ax.set_xlabel('评分', fontsize=12)
-        ax.set_title(f'TOP {top_n} 高分关键词', fontsize=14, fontweight='bold')
-        ax.grid(axis='x', alpha=0.3)
-
-        # 反转Y轴，让最高的在顶部
-        ax.invert_yaxis()
-
-        plt.tight_layout()
-        output_path = self.output_dir / f"top_{top_n}_keywords.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
-
-        return output_path
+        return self._render_one(render_top_keywords_bar, self._top_keywords_payload(keywords_data, top_n))
 
     def generate_wordcloud(self, keywords_data):
         """生成关键词词云"""
-        # 根据评分权重生成词频
-        word_freq = {}
-        for kw, data in keywords_data:
-            # 使用评分作为权重
-            weight = data['score']
-            word_freq[kw] = word_freq.get(kw, 0) + weight
-
-        # 生成词云
-        wordcloud = WordCloud(
-            width=1600,
-            height=800,
-            background_color='white',
-            colormap='viridis',
-            max_words=200,
-            relative_scaling=0.5,
-            min_font_size=10
-        ).generate_from_frequencies(word_freq)
-
-        fig, ax = plt.subplots(figsize=(16, 8))
-        ax.imshow(wordcloud, interpolation='bilinear')
-        ax.axis('off')
-        ax.set_title('SEO关键词词云（字体大小=评分权重）', fontsize=16, fontweight='bold', pad=20)
-
-        plt.tight_layout(pad=0)
-        output_path = self.output_dir / "wordcloud.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight', pad_inches=0.1)
-        plt.close()
-
-        return output_path
-
-    def generate_trend_line(self, history_dir="history"):
-        """生成历史趋势图"""
-        history_files = sorted(Path(history_dir).glob("history_*.json"))
-
-        if len(history_files) < 2:
-            print("  ⚠️  历史数据不足，跳过趋势图")
-            return None
-
-        timestamps = []
-        keyword_counts = []
-        high_score_counts = []
+        return self._render_one(render_wordcloud, self._wordcloud_payload(keywords_data))
 
-        for hist_file in history_files:
-            try:
-                with open(hist_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    timestamps.append(data.get('datetime', '')[:10])  # 只取日期
-                    keyword_counts.append(data.get('keywords_count', 0))
-                    high_score_counts.append(0)  # 历史数据中未记录
-            except:
-                pass
-
-        if not timestamps:
+    def generate_trend_line(self, history_db=HISTORY_DB):
+        """生成历史趋势图"""
+        payload = self._trend_payload(history_db)
+        if payload is None:
             return None
+        return self._render_one(render_trend_line, payload)
 
-        fig, ax = plt.subplots(figsize=(12, 6))
+    def generate_summary_dashboard(self, keywords_data, stats):
+        """生成数据概览仪表板"""
+        return self._render_one(render_summary_dashboard, self._dashboard_payload(keywords_data, stats))
 
-        ax.plot(range(len(timestamps)), keyword_counts,
-               marker='o', linewidth=2, markersize=8, label='关键词总数', color='steelblue')
+    # ---------- 全部图表 ----------
 
-        ax.set_xlabel('时间', fontsize=12)
-        ax.set_ylabel('关键词数量', fontsize=12)
-        ax.set_title('关键词数量历史趋势', fontsize=14, fontweight='bold')
-        ax.set_xticks(range(len(timestamps)))
-        ax.set_xticklabels(timestamps, rotation=45, ha='right')
-        ax.legend()
-        ax.grid(True, alpha=0.3)
+    def _load_manifest(self):
+        """读取图表指纹清单：图表键 -> {"fingerprint": 哈希, "path": 图片路径}"""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  图表指纹清单读取失败，全部重新渲染: {e}")
+            return {}
+        return manifest if isinstance(manifest, dict) else {}
+
+    @staticmethod
+    def _chart_key(render, payload):
+        """清单中的图表键（TOP关键词图按关键词数区分文件）"""
+        if "top_n" in payload:
+            return f"{render.__name__}:{payload['top_n']}"
+        return render.__name__
+
+    def _render_pending(self, jobs):
+        """
+        渲染图表：多个图表时交给进程池并行渲染
+
+        Args:
+            jobs: (名称, 渲染函数, 数据) 列表
+
+        Returns:
+            与 jobs 顺序一致的结果列表（图表路径或异常）
+        """
+        if not jobs:
+            return []
+
+        workers = self.workers or min(len(jobs), os.cpu_count() or 1)
+        if workers > 1 and len(jobs) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_plotting) as executor:
+                    futures = [executor.submit(render, self.output_dir, **payload) for _, render, payload in jobs]
+                    results = [future.exception() or future.result() for future in futures]
+            except (OSError, BrokenProcessPool) as e:
+                print(f"  ⚠️  并行渲染不可用，改为逐个渲染: {e}")
+                return self._render_serial(jobs)
+
+            # 工作进程中途退出时，未完成的图表以 BrokenProcessPool 返回：这些图表改为逐个渲染
+            broken = [i for i, result in enumerate(results) if isinstance(result, BrokenProcessPool)]
+            if broken:
+                print(f"  ⚠️  渲染进程异常退出，{len(broken)} 个图表改为逐个渲染")
+                for i, result in zip(broken, self._render_serial([jobs[i] for i in broken])):
+                    results[i] = result
+            return results
+
+        return self._render_serial(jobs)
+
+    def _render_serial(self, jobs):
+        """在主进程中逐个渲染图表，返回与 jobs 顺序一致的结果列表（图表路径或异常）"""
+        results = []
+        for _, render, payload in jobs:
+            try:
+                results.append(render(self.output_dir, **payload))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _render(self, jobs):
+        """
+        增量渲染：输入数据的指纹与上次相同且图片仍在时直接沿用，其余图表重新渲染并更新清单
+
+        Args:
+            jobs: (名称, 渲染函数, 数据) 列表
+
+        Returns:
+            与 jobs 顺序一致的 (图表路径或异常, 是否沿用) 列表
+        """
+        manifest = self._load_manifest()
+        results = [None] * len(jobs)
+        pending, fingerprints = [], {}
+        for i, (name, render, payload) in enumerate(jobs):
+            key = self._chart_key(render, payload)
+            fingerprints[i] = (key, chart_fingerprint(render, payload))
+            entry = manifest.get(key)
+            if entry and entry.get("fingerprint") == fingerprints[i][1] and Path(entry.get("path", "")).exists():
+                results[i] = (Path(entry["path"]), True)
+            else:
+                pending.append(i)
+
+        if not pending:
+            return results
+
+        for i, result in zip(pending, self._render_pending([jobs[i] for i in pending])):
+            results[i] = (result, False)
+            key, fingerprint = fingerprints[i]
+            if isinstance(result, Exception):
+                manifest.pop(key, None)
+            else:
+                manifest[key] = {"fingerprint": fingerprint, "path": str(result)}
 
-        plt.tight_layout()
-        output_path = self.output_dir / "historical_trend.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        try:
+            atomic_write_json(self.manifest_path, manifest)
+        except OSError as e:
+            print(f"  ⚠️  图表指纹清单保存失败: {e}")
+        return results
 
-        return output_path
+    def generate_all_charts(self, keywords_data, stats=None, history_db=HISTORY_DB):
+        """生成所有图表（数据在主进程中提取，渲染并行进行；输入数据未变化的图表沿用上次的图片）"""
+        missing = missing_plotting_packages()
+        if missing:
+            raise ImportError(f"缺少绘图依赖: {', '.join(missing)}")
 
-    def generate_summary_dashboard(self, keywords_data, stats):
-        """生成数据概览仪表板"""
-        fig = plt.figure(figsize=(16, 10))
-
-        # 创建网格布局
-        gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
-
-        # 1. 关键词总数
-        ax1 = fig.add_subplot(gs[0, 0])
-        ax1.text(0.5, 0.5, f'{stats["total"]}',
-                ha='center', va='center', fontsize=48, fontweight='bold', color='steelblue')
-        ax1.text(0.5, 0.2, '关键词总数', ha='center', va='center', fontsize=14)
-        ax1.axis('off')
-
-        # 2. 高分关键词数
-        ax2 = fig.add_subplot(gs[0, 1])
-        high_score = sum(1 for _, d in keywords_data if d['score'] >= 8)
-        ax2.text(0.5, 0.5, f'{high_score}',
-                ha='center', va='center', fontsize=48, fontweight='bold', color='coral')
-        ax2.text(0.5, 0.2, '高分关键词(≥8)', ha='center', va='center', fontsize=14)
-        ax2.axis('off')
-
-        # 3. 平均评分
-        ax3 = fig.add_subplot(gs[0, 2])
-        avg_score = np.mean([d['score'] for _, d in keywords_data])
-        ax3.text(0.5, 0.5, f'{avg_score:.1f}',
-                ha='center', va='center', fontsize=48, fontweight='bold', color='green')
-        ax3.text(0.5, 0.2, '平均评分', ha='center', va='center', fontsize=14)
-        ax3.axis('off')
-
-        # 4. 评分分布
-        ax4 = fig.add_subplot(gs[1, :])
-        scores = [data['score'] for _, data in keywords_data]
-        ax4.hist(scores, bins=20, color='skyblue', edgecolor='black', alpha=0.7)
-        ax4.set_xlabel('评分', fontsize=11)
-        ax4.set_ylabel('数量', fontsize=11)
-        ax4.set_title('评分分布', fontsize=12, fontweight='bold')
-        ax4.grid(axis='y', alpha=0.3)
-
-        # 5. 意图分布饼图
-        ax5 = fig.add_subplot(gs[2, 0])
-        intents = [data['intent'].split('/')[0] for _, data in keywords_data]
-        intent_counts = Counter(intents)
-        ax5.pie(intent_counts.values(), labels=intent_counts.keys(), autopct='%1.1f%%',
-                colors=sns.color_palette("Set3", len(intent_counts)))
-        ax5.set_title('意图分布', fontsize=12, fontweight='bold')
-
-        # 6. 数据源分布
-        ax6 = fig.add_subplot(gs[2, 1])
-        sources = [data['source'] for _, data in keywords_data]
-        source_counts = Counter(sources)
-        sorted_sources = dict(sorted(source_counts.items(), key=lambda x: x[1], reverse=True)[:5])
-        ax6.barh(list(sorted_sources.keys()), list(sorted_sources.values()),
-                color=sns.color_palette("viridis", len(sorted_sources)))
-        ax6.set_xlabel('数量', fontsize=11)
-        ax6.set_title('数据源分布', fontsize=12, fontweight='bold')
-        ax6.invert_yaxis()
-
-        # 7. TOP10关键词
-        ax7 = fig.add_subplot(gs[2, 2])
-        top10 = keywords_data[:10]
-        keywords_list = [f"{kw[:10]}..." for kw, _ in top10]
-        scores_list = [data['score'] for _, data in top10]
-        ax7.barh(keywords_list, scores_list, color=plt.cm.RdYlGn_r(np.linspace(0.3, 0.7, 10)))
-        ax7.set_xlabel('评分', fontsize=11)
-        ax7.set_title('TOP10关键词', fontsize=12, fontweight='bold')
-        ax7.invert_yaxis()
-
-        fig.suptitle('SEO关键词数据概览仪表板', fontsize=18, fontweight='bold', y=0.98)
-
-        plt.tight_layout()
-        output_path = self.output_dir / "summary_dashboard.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
-
-        return output_path
-
-    def generate_all_charts(self, keywords_data, stats=None):
-        """生成所有图表"""
         print("\n📊 生成数据可视化图表...")
         print("-" * 70)
 
         if stats is None:
             stats = {"total": len(keywords_data)}
 
-        charts = []
-
-        # 1. 评分分布
-        try:
-            path = self.generate_score_distribution(keywords_data)
-            charts.append(("评分分布图", path))
-            print(f"✅ 评分分布图: {path}")
-        except Exception as e:
-            print(f"⚠️  评分分布图生成失败: {e}")
-
-        # 2. 意图分布饼图
-        try:
-            path = self.generate_intent_pie(keywords_data)
-            charts.append(("意图分布饼图", path))
-            print(f"✅ 意图分布饼图: {path}")
-        except Exception as e:
-            print(f"⚠️  意图分布饼图生成失败: {e}")
-
-        # 3. 数据源分布
+        specs = [
+            ("评分分布图", render_score_distribution, lambda: self._score_payload(keywords_data)),
+            ("意图分布饼图", render_intent_pie, lambda: self._intent_payload(keywords_data)),
+            ("数据源分布图", render_source_bar, lambda: self._source_payload(keywords_data)),
+            (f"TOP{TOP_N_KEYWORDS}关键词图", render_top_keywords_bar, lambda: self._top_keywords_payload(keywords_data)),
+            ("词云图", render_wordcloud, lambda: self._wordcloud_payload(keywords_data)),
+            ("历史趋势图", render_trend_line, lambda: self._trend_payload(history_db)),
+            ("概览仪表板", render_summary_dashboard, lambda: self._dashboard_payload(keywords_data, stats)),
+        ]
+
+        # 所有图表共用一次汇总；只在本次调用内有效，调用方之后修改 keywords_data 也不会读到旧数据
+        jobs = []
+        self._aggregates = self.aggregate(keywords_data)
         try:
-            path = self.generate_source_bar(keywords_data)
-            charts.append(("数据源分布图", path))
-            print(f"✅ 数据源分布图: {path}")
-        except Exception as e:
-            print(f"⚠️  数据源分布图生成失败: {e}")
+            for name, render, build_payload in specs:
+                try:
+                    payload = build_payload()
+                except Exception as e:
+                    print(f"⚠️  {name}生成失败: {e}")
+                    continue
+                if payload is not None:
+                    jobs.append((name, render, payload))
+        finally:
+            self._aggregates = None
 
-        # 4. TOP20关键词
-        try:
-            path = self.generate_top_keywords_bar(keywords_data, top_n=20)
-            charts.append(("TOP20关键词图", path))
-            print(f"✅ TOP20关键词图: {path}")
-        except Exception as e:
-            print(f"⚠️  TOP20关键词图生成失败: {e}")
-
-        # 5. 词云
-        try:
-            path = self.generate_wordcloud(keywords_data)
-            charts.append(("词云图", path))
-            print(f"✅ 词云图: {path}")
-        except Exception as e:
-            print(f"⚠️  词云图生成失败: {e}")
-
-        # 6. 历史趋势
-        try:
-            path = self.generate_trend_line()
-            if path:
-                charts.append(("历史趋势图", path))
-                print(f"✅ 历史趋势图: {path}")
-        except Exception as e:
-            print(f"⚠️  历史趋势图生成失败: {e}")
-
-        # 7. 仪表板
-        try:
-            path = self.generate_summary_dashboard(keywords_data, stats)
-            charts.append(("概览仪表板", path))
-            print(f"✅ 概览仪表板: {path}")
-        except Exception as e:
-            print(f"⚠️  概览仪表板生成失败: {e}")
+        charts = []
+        reused = 0
+        for (name, _, _), (result, is_reused) in zip(jobs, self._render(jobs)):
+            if isinstance(result, Exception):
+                print(f"⚠️  {name}生成失败: {result}")
+            else:
+                charts.append((name, result))
+                reused += is_reused
+                print(f"{'♻️ ' if is_reused else '✅'} {name}: {result}{'（数据未变化，沿用）' if is_reused else ''}")
 
         print("-" * 70)
-        print(f"✅ 共生成 {len(charts)} 个图表，保存在: {self.output_dir}/")
+        print(f"✅ 共生成 {len(charts)} 个图表（其中 {reused} 个数据未变化，沿用上次的图片），保存在: {self.output_dir}/")
 
         return charts
 
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式输出模块
+关键词逐行写入 Markdown / CSV / JSON / JSON Lines 文件，不在内存中拼接整个文件内容，
+多个输出文件由同一个关键词迭代器一次遍历写完
+"""
+
+import csv
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+
+def _dumps(value, level: int) -> str:
+    """与 json.dump(indent=2) 相同的格式，嵌套在第 level 层"""
+    text = json.dumps(value, ensure_ascii=False, indent=2)
+    return text.replace("\n", "\n" + "  " * level)
+
+
+class KeywordWriter:
+    """关键词输出基类：最多写入 limit 行（None 表示不限）"""
+
+    def __init__(self, path, limit: Optional[int] = None):
+        self.path = Path(path)
+        self.limit = limit
+        self.count = 0
+        self.file = None
+
+    @property
+    def full(self) -> bool:
+        return self.limit is not None and self.count >= self.limit
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.write_header()
+
+    def write(self, keyword: str, record):
+        """写入一行（超出上限时忽略）"""
+        if self.full:
+            return
+        self.write_row(keyword, record)
+        self.count += 1
+
+    def close(self):
+        if self.file is not None:
+            self.write_footer()
+            self.file.close()
+            self.file = None
+
+    def write_header(self):
+        pass
+
+    def write_row(self, keyword: str, record):
+        raise NotImplementedError
+
+    def write_footer(self):
+        pass
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MarkdownKeywordWriter(KeywordWriter):
+    """SEO关键词 Markdown 表格"""
+
+    def __init__(self, path, total: int, high_score: int, limit: Optional[int] = None):
+        super().__init__(path, limit)
+        self.total = total
+        self.high_score = high_score
+
+    def write_header(self):
+        self.file.write(f"""# SEO长尾词挖掘结果
+
+> 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+> 总关键词数: {self.total}
+> 高分关键词(≥8分): {self.high_score}
+
+---
+
+| 关键词 | 来源 | 意图标签 | 推荐指数 | 爆款标题建议 |
+|--------|------|----------|----------|--------------|
+""")
+
+    def write_row(self, keyword, record):
+        self.file.write(f"| {keyword} | {record['source']} | {record['intent']} | {record['score']} | {record['catchy_title']} |\n")
+
+
+class CsvKeywordWriter(KeywordWriter):
+    """SEO关键词 CSV（带BOM，方便 Excel 打开）"""
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "w", encoding="utf-8-sig", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["关键词", "来源", "意图标签", "推荐指数", "爆款标题建议"])
+
+    def write_row(self, keyword, record):
+        self.writer.writerow([keyword, record["source"], record["intent"], record["score"], record["catchy_title"]])
+
+
+class JsonKeywordWriter(KeywordWriter):
+    """
+    SEO关键词 JSON：逐条写入列表，格式与 json.dump(indent=2) 一致
+
+    文件结构为 {head..., list_key: [关键词...], tail...}
+    """
+
+    def __init__(self, path, head: dict, list_key: str, tail: Optional[dict] = None,
+                 limit: Optional[int] = None):
+        super().__init__(path, limit)
+        self.head = head
+        self.list_key = list_key
+        self.tail = tail or {}
+
+    def write_header(self):
+        self.file.write("{")
+        for key, value in self.head.items():
+            self.file.write(f"\n  {_dumps(key, 1)}: {_dumps(value, 1)},")
+        self.file.write(f"\n  {_dumps(self.list_key, 1)}: [")
+
+    def write_row(self, keyword, record):
+        separator = "," if self.count else ""
+        self.file.write(f"{separator}\n    {_dumps({'keyword': keyword, **record.to_dict()}, 2)}")
+
+    def write_footer(self):
+        self.file.write("\n  ]" if self.count else "]")
+        for key, value in self.tail.items():
+            self.file.write(f",\n  {_dumps(key, 1)}: {_dumps(value, 1)}")
+        self.file.write("\n}")
+
+
+class JsonLinesKeywordWriter(KeywordWriter):
+    """SEO关键词 JSON Lines：每行一个关键词对象"""
+
+    def write_row(self, keyword, record):
+        self.file.write(json.dumps({"keyword": keyword, **record.to_dict()}, ensure_ascii=False))
+        self.file.write("\n")
+
+
+def export_keywords(rows: Iterable[Tuple[str, object]], writers: List[KeywordWriter]) -> List[KeywordWriter]:
+    """
+    一次遍历关键词迭代器，同时写入所有输出文件
+
+    Args:
+        rows: (关键词, 记录) 迭代器，按输出顺序排列
+        writers: 输出器列表；全部写满后提前停止遍历
+
+    Returns:
+        writers（每个 writer.count 为实际写入的行数）
+    """
+    for writer in writers:
+        writer.open()
+    try:
+        for keyword, record in rows:
+            active = False
+            for writer in writers:
+                if not writer.full:
+                    writer.write(keyword, record)
+                    active = True
+            if not active:
+                break
+    finally:
+        for writer in writers:
+            writer.close()
+    return writers
+
+
+def write_hot_topics_md(path, topics: Iterable[dict], sources: str, limit: int = 10,
+                        rising: Optional[List[dict]] = None, new: Optional[List[dict]] = None):
+    """
+    逐条写入热点选题 Markdown
+
+    Args:
+        path: 输出路径
+        topics: 按排名排列的热点选题
+        sources: 数据源说明
+        limit: 最多写入的选题数
+        rising: 排名上升的关键词趋势（None 表示不输出该部分）
+        new: 新出现的关键词趋势（None 表示不输出该部分）
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"""# 养生/饮食热点选题 TOP10
+
+> 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+> 数据源: {sources}
+
+---
+
+""")
+        for i, topic in enumerate(topics, 1):
+            if i > limit:
+                break
+            f.write(f"""## {i}. {topic['title']}
+
+- **来源**: {topic['source']}
+- **争议点/角度**: {topic['angle']}
+- **适合写的角度**: 深度解析 / 避坑指南 / 科普向
+- **💥 爆款标题建议**: {topic['title'][:40]}...这篇告诉你真相
+
+---
+
+""")
+
+        if rising is not None:
+            f.write("""## 📈 上升关键词
+
+| 关键词 | 排名速度(百分位/次) | 来源数 | 来源数变化 | 出现频率 | 首次出现 |
+|--------|---------------------|--------|------------|----------|----------|
+""")
+            for trend in rising:
+                f.write(f"| {trend['keyword']} | +{trend['velocity']:.1f} | {trend['source_count']} | "
+                        f"{trend['source_growth']:+d} | {trend['frequency']:.0%} | {trend['first_seen'][:16]} |\n")
+            if not rising:
+                f.write("| 暂无 | | | | | |\n")
+            f.write("\n---\n\n")
+
+        if new is not None:
+            f.write("## 🆕 新出现关键词\n\n")
+            for trend in new:
+                f.write(f"- {trend['keyword']}（来源数 {trend['source_count']}）\n")
+            if not new:
+                f.write("- 暂无\n")
+            f.write("\n")
+
+
+def write_diff_md(path, diff: dict, limit: int = 50):
+    """
+    写入运行间差异 Markdown
+
+    Args:
+        path: 输出路径
+        diff: run_diff.diff_latest() 的结果
+        limit: 每个部分最多列出的关键词数
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    counts = diff["counts"]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"""# 关键词变化（与上次运行对比）
+
+> 上次运行: {diff['previous_run']}
+> 本次运行: {diff['current_run']}
+> 新增: {counts['new']} / 消失: {counts['dropped']} / 规则分或来源变化: {counts['changed']}
+
+---
+
+""")
+        for title, key in (("🆕 新增关键词", "new"), ("👋 消失关键词", "dropped")):
+            rows = diff[key]
+            f.write(f"## {title}（{len(rows)}）\n\n| 关键词 | 来源 | 推荐指数 |\n|--------|------|----------|\n")
+            for row in rows[:limit]:
+                f.write(f"| {row['keyword']} | {row['source']} | {row['score']} |\n")
+            if len(rows) > limit:
+                f.write(f"\n> 仅列出前 {limit} 个，完整列表见 JSON\n")
+            f.write("\n")
+
+        rows = diff["changed"]
+        f.write(f"## 🔀 规则分或来源变化（{len(rows)}）\n\n"
+                "| 关键词 | 规则分 | 推荐指数 | 来源 |\n|--------|--------|----------|------|\n")
+        for row in rows[:limit]:
+            cells = []
+            for old_key, key in (("old_base_score", "base_score"), ("old_score", "score"), ("old_source", "source")):
+                cells.append(f"{row[old_key]} → {row[key]}" if row[old_key] != row[key] else str(row[key]))
+            f.write(f"| {row['keyword']} | {' | '.join(cells)} |\n")
+        if len(rows) > limit:
+            f.write(f"\n> 仅列出前 {limit} 个，完整列表见 JSON\n")
+
+
+def write_diff_json(path, diff: dict):
+    """写入运行间差异 JSON（完整列表）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(diff, f, ensure_ascii=False, indent=2)
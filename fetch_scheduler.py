@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并发抓取调度模块
+把 种子词 × 数据源 矩阵并发执行：同一数据源按并发上限排队（仍然限速），
+不同数据源之间互相重叠，总耗时取决于最慢的数据源而不是所有数据源之和
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 每个数据源默认的并发上限（同一主机同时在途的请求数）
+DEFAULT_SOURCE_CONCURRENCY = 1
+
+
+def budget_jobs(jobs: Dict[str, List[str]], max_queries: int) -> Dict[str, List[str]]:
+    """
+    把总查询预算轮流分给各数据源（每轮每个数据源取一个），各数据源保留列表中靠前的关键词
+
+    Args:
+        jobs: 数据源名称 -> 按优先级排列的关键词列表
+        max_queries: 所有数据源合计的最多查询数
+
+    Returns:
+        截断后的 数据源名称 -> 关键词列表
+    """
+    quota = dict.fromkeys(jobs, 0)
+    remaining = max(0, max_queries)
+    while remaining:
+        open_sources = [source for source in jobs if quota[source] < len(jobs[source])]
+        if not open_sources:
+            break
+        for source in open_sources[:remaining]:
+            quota[source] += 1
+        remaining -= min(remaining, len(open_sources))
+    return {source: list(keywords[:quota[source]]) for source, keywords in jobs.items()}
+
+
+class ConcurrentFetchScheduler:
+    """种子词 × 数据源 并发调度器"""
+
+    def __init__(self, sources: Dict[str, Callable[[str], List]],
+                 source_limits: Optional[Dict[str, int]] = None,
+                 default_limit: int = DEFAULT_SOURCE_CONCURRENCY):
+        """
+        初始化调度器
+
+        Args:
+            sources: 数据源名称 -> 抓取函数（接收关键词，返回建议词列表），按输出顺序排列
+            source_limits: 各数据源的并发上限 {名称: 并发数}
+            default_limit: 未单独配置的数据源使用的并发上限
+        """
+        self.sources = dict(sources)
+        self.source_limits = {
+            name: max(1, (source_limits or {}).get(name, default_limit))
+            for name in self.sources
+        }
+        self.elapsed: Dict[str, float] = {}
+        self.skipped: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    def _run_lane(self, source: str, fetch: Callable[[str], List],
+                  jobs: "queue.Queue", results: Dict[Tuple[int, str], List],
+                  lock: threading.Lock, started: float, max_misses: Optional[int]):
+        """单个数据源的工作通道：依次取出该数据源的任务执行"""
+        while True:
+            try:
+                index, keyword = jobs.get_nowait()
+            except queue.Empty:
+                with lock:
+                    self.elapsed[source] = max(self.elapsed.get(source, 0.0), time.time() - started)
+                return
+
+            if source in self.skipped:
+                with lock:
+                    self.skipped[source] += 1
+                continue
+
+            try:
+                items = fetch(keyword) or []
+            except Exception as e:
+                logger.warning(f"  ⚠️  {source}: {keyword} 抓取异常 - {str(e)[:50]}")
+                items = []
+
+            with lock:
+                results[(index, source)] = items
+                self._misses[source] = 0 if items else self._misses.get(source, 0) + 1
+                if max_misses and self._misses[source] >= max_misses and source not in self.skipped:
+                    self.skipped[source] = 0
+                    logger.warning(f"  ⚠️  {source}: 连续 {max_misses} 次无结果，跳过剩余查询")
+
+    def run(self, keywords: Iterable[str]) -> List[Tuple[str, str, List]]:
+        """
+        并发执行所有 种子词 × 数据源 任务
+
+        Args:
+            keywords: 种子词列表
+
+        Returns:
+            (种子词, 数据源, 结果列表) 列表，顺序与串行执行时一致（种子词优先，其次数据源）
+        """
+        keywords = list(keywords)
+        return self.run_jobs({source: keywords for source in self.sources})
+
+    def run_jobs(self, jobs: Dict[str, List[str]],
+                 max_misses: Optional[int] = None) -> List[Tuple[str, str, List]]:
+        """
+        并发执行每个数据源各自的关键词列表
+
+        Args:
+            jobs: 数据源名称 -> 该数据源要查询的关键词列表
+            max_misses: 某个数据源连续这么多次失败或无结果后跳过它剩余的查询（None 表示不跳过），
+                跳过的查询数记录在 skipped 中
+
+        Returns:
+            (关键词, 数据源, 结果列表) 列表，按列表下标优先、其次数据源的顺序排列
+        """
+        results: Dict[Tuple[int, str], List] = {}
+        lock = threading.Lock()
+
+        source_jobs = {}
+        for source in self.sources:
+            queued = queue.Queue()
+            for index, keyword in enumerate(jobs.get(source, [])):
+                queued.put((index, keyword))
+            source_jobs[source] = queued
+
+        self.elapsed = {}
+        self.skipped = {}
+        self._misses = {}
+        max_workers = sum(self.source_limits.values()) or 1
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch") as executor:
+            futures = [
+                executor.submit(self._run_lane, source, fetch, source_jobs[source], results, lock, started,
+                                max_misses)
+                for source, fetch in self.sources.items()
+                for _ in range(self.source_limits[source])
+            ]
+            for future in futures:
+                future.result()
+        self.elapsed["total"] = time.time() - started
+
+        longest = max((len(jobs.get(source, [])) for source in self.sources), default=0)
+        return [
+            (jobs[source][index], source, results.get((index, source), []))
+            for index in range(longest)
+            for source in self.sources
+            if index < len(jobs.get(source, []))
+        ]
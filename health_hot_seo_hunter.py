@@ -5,17 +5,36 @@
 多数据源抓取 + 意图识别 + 评分排序 + 历史对比 + 数据可视化 + 增强版网络抓取
 """
 
+import argparse
 import requests
-from bs4 import BeautifulSoup
 import json
+import logging
 import re
 import time
 import random
 from urllib.parse import quote
 from datetime import datetime
-import csv
 import os
-from pathlib import Path
+
+from fetch_scheduler import ConcurrentFetchScheduler, budget_jobs
+from history_store import HistoryStore
+from exporters import (
+    MarkdownKeywordWriter, CsvKeywordWriter, JsonKeywordWriter, JsonLinesKeywordWriter,
+    export_keywords, write_hot_topics_md, write_diff_md, write_diff_json
+)
+from keyword_expander import KeywordExpander
+from near_duplicates import NearDuplicateClusterer, collapse_near_duplicates
+from keyword_index import KeywordIndex
+from keyword_ranker import TopKRanker
+from keyword_store import KeywordStore, SOURCE_NAMES
+from keyword_scoring import calculate_score, analyze_keywords, PARALLEL_THRESHOLD
+from rate_limiter import HostRateLimiter, default_limiter
+from run_diff import diff_latest
+from snapshot_store import SnapshotStore
+from source_weights import SourceWeighting
+from trend_engine import TrendEngine
+from suggestion_cache import SuggestionCache
+from text_normalizer import normalize_keyword
 
 # 导入增强版网络抓取模块
 try:
@@ -38,6 +57,22 @@ SEED_KEYWORDS = [
 OUTPUT_DIR = "output"
 HISTORY_DIR = "history"
 CONFIG_FILE = "config.json"
+CACHE_FILE = "cache/suggestions.json"
+INDEX_FILE = "cache/keyword_index.json"
+HISTORY_DB = f"{HISTORY_DIR}/history.db"
+SNAPSHOT_DIR = f"{HISTORY_DIR}/snapshots"
+SAVE_SNAPSHOTS = True  # 每次运行保存完整关键词表的列式快照
+
+# 趋势统计：上升/新出现/来源数增加的关键词在推荐指数上加分，并写入热点选题的上升榜
+TREND_ENABLED = True
+TREND_WEIGHTS = {"new": 1, "rising": 2, "source_growth": 1}
+TREND_TOP_N = 10
+
+GENERATE_CHARTS = True  # 生成可视化图表（--no-charts 可临时关闭，关闭时不加载绘图库）
+CHART_WORKERS = None  # 并行渲染图表的进程数，None 表示 min(图表数, CPU核数)，1 表示逐个渲染
+TREND_CHART_WINDOW = None  # 历史趋势图的时间窗口："hour"/"day"/"week"，None 表示按历史跨度自动选择
+
+DIFF_TOP_N = 50  # diff.md 每个部分列出的关键词数（diff.json 为完整列表）
 
 # 请求配置（避免被封）
 HEADERS_LIST = [
@@ -48,6 +83,44 @@ HEADERS_LIST = [
 
 TIMEOUT = 10
 
+# 并发抓取配置：每个数据源同时在途的请求数（同一主机仍然限速，不同主机并行）
+SOURCE_CONCURRENCY = {
+    "百度": 1,
+    "B站": 1,
+    "淘宝": 1,
+    "Google": 2,
+    "Bing": 2,
+}
+
+# 前缀扩展：对排在前面的种子词查询"种子词+a/b/.../的/怎么..."，覆盖更多补全结果
+PREFIX_EXPANSION = True
+PREFIX_TOP_SEEDS = 3      # 只扩展 SEED_KEYWORDS 中的前几个种子词
+PREFIX_MAX_QUERIES = 90   # 所有数据源合计的最多查询数（轮流分给各数据源，百度 2次/秒 时约多 10 秒）
+PREFIX_MAX_MISSES = 3     # 某个数据源连续这么多次失败或无结果后跳过它剩余的前缀查询
+
+# 长尾词扩展配置：把建议词作为新查询词继续抓取
+# 深度：种子词为第0层，种子词的建议词为第1层；设为1即关闭扩展
+EXPAND_MAX_DEPTH = 2
+# 最多扩展的关键词数（每个关键词会查询所有数据源）
+EXPAND_MAX_QUERIES = 100
+
+# 近似重复合并：去掉助词/标点/空白后字符二元组 Jaccard 相似度达到阈值的关键词只保留来源最多的一个
+DEDUP_ENABLED = True
+DEDUP_THRESHOLD = 0.8
+
+# 关键词分析配置：关键词数达到阈值时按块交给进程池
+ANALYSIS_WORKERS = None            # 进程数，None 表示CPU核数
+ANALYSIS_PARALLEL_THRESHOLD = PARALLEL_THRESHOLD
+TITLE_SEED = None                  # 爆款标题随机种子，固定后每次运行标题可复现
+
+# 输出配置
+TOP_N_TABLE = 100                  # Markdown/CSV 输出的关键词数
+TOP_N_JSON = 50                    # JSON 输出的关键词数
+EXPORT_JSONL = True                # 额外输出全部关键词的 JSON Lines 文件
+TOP_N_CONSOLE = 30                 # 控制台预览的关键词数
+HISTORY_TOP_N = 100                # 每次运行写入历史数据库的关键词数
+TOP_K = max(TOP_N_TABLE, TOP_N_JSON, TOP_N_CONSOLE, HISTORY_TOP_N)  # 排名保留的关键词数
+
 
 # ==================== 工具函数 ====================
 def get_random_headers():
@@ -60,157 +133,71 @@ def get_random_headers():
 
 def safe_request(url, params=None, source_name=""):
     """安全请求，失败返回None"""
+    host = HostRateLimiter.host_of(url)
     try:
-        time.sleep(random.uniform(0.3, 1.0))  # 减少延迟
+        default_limiter.acquire(host)  # 按主机限速，与增强版抓取器共用令牌桶
         headers = get_random_headers()
         resp = requests.get(url, params=params, headers=headers, timeout=TIMEOUT)
+        default_limiter.record(host, status=resp.status_code)
         if resp.status_code == 200:
             return resp
         print(f"  ⚠️  {source_name}: HTTP {resp.status_code}")
         return None
+    except requests.exceptions.Timeout:
+        default_limiter.record(host, throttled=True)
+        print(f"  ⚠️  {source_name}: Timeout")
+        return None
     except Exception as e:
         print(f"  ⚠️  {source_name}: {type(e).__name__}")
         return None
 
 
-def calculate_score(keyword):
-    """计算关键词推荐指数（优化版）"""
-    score = 0
-
-    # 疑问高意图（权重提升）
-    if any(w in keyword for w in ["怎么", "为什么", "真的", "副作用", "危害", "能不能", "多久", "有用吗", "有效吗", "是否", "如何"]):
-        score += 6
-
-    # 购买意图
-    if any(w in keyword for w in ["排行榜", "推荐", "哪个牌子", "价格", "怎么买", "测评", "京东", "淘宝", "购买", "哪里买"]):
-        score += 5
-
-    # 长尾词（分级加分）
-    length = len(keyword)
-    if length >= 10:
-        score += 4
-    elif length >= 8:
-        score += 3
-    elif length >= 6:
-        score += 2
-
-    # 领域强相关
-    if any(w in keyword for w in ["控糖", "抗炎", "减脂", "祛湿", "养胃", "补气血", "熬夜", "养生", "饮食"]):
-        score += 3
-
-    # 紧迫感关键词
-    if any(w in keyword for w in ["快速", "立即", "马上", "紧急", "最佳", "最好", "必须"]):
-        score += 2
-
-    # 数字关键词（通常更具体）
-    if re.search(r'\d+', keyword):
-        score += 1
-
-    return score
-
-
-def detect_intent(keyword):
-    """检测意图标签（增强版）"""
-    intents = []
-
-    if any(w in keyword for w in ["怎么", "为什么", "如何", "什么", "是否", "能不能", "有用吗", "有效吗", "方法"]):
-        intents.append("疑问")
-    if any(w in keyword for w in ["功效", "作用", "好处", "益处", "效果"]):
-        intents.append("功效")
-    if any(w in keyword for w in ["副作用", "危害", "风险", "禁忌", "注意事项"]):
-        intents.append("副作用")
-    if any(w in keyword for w in ["排行榜", "推荐", "哪个牌子", "价格", "怎么买", "测评", "购买", "哪里买"]):
-        intents.append("购买")
-    if any(w in keyword for w in ["和", "vs", "VS", "还是", "对比", "区别"]):
-        intents.append("对比")
-    if any(w in keyword for w in ["食谱", "菜单", "吃什么", "做法"]):
-        intents.append("食谱")
-
-    return "/".join(intents) if intents else "通用"
-
-
-def generate_catchy_title(keyword, intent):
-    """生成爆款标题建议（优化版）"""
-    templates = {
-        "疑问": [
-            f"{keyword}？真相让人意外",
-            f"医生不说，但{keyword}你必须知道",
-            f"90%的人都不知道的{keyword}真相",
-            f"{keyword}！看完这篇你就懂了",
-        ],
-        "功效": [
-            f"{keyword}的5个神奇效果，第3个很多人不知道",
-            f"坚持{keyword}，30天后身体的变化",
-            f"为什么明星都在{keyword}？效果惊人",
-        ],
-        "副作用": [
-            f"{keyword}的副作用，再不知道就晚了",
-            f"别乱{keyword}！这3类人要注意",
-            f"{keyword}的禁忌，很多人第一个就错了",
-        ],
-        "购买": [
-            f"{keyword}排行榜TOP5，第1名没想到",
-            f"买前必看！{keyword}避坑指南",
-            f"{keyword}怎么选？内行人告诉你真相",
-        ],
-        "对比": [
-            f"{keyword}：一文看懂区别",
-            f"到底选哪个？{keyword}深度对比",
-            f"别再纠结了！{keyword}选哪个最好",
-        ],
-        "食谱": [
-            f"{keyword}大全，7天不重样",
-            f"营养师的{keyword}秘诀",
-            f"7天{keyword}计划，效果看得见",
-        ],
-        "通用": [
-            f"{keyword}：新手完全指南",
-            f"关于{keyword}，你需要知道的一切",
-            f"{keyword}的正确打开方式",
-        ]
-    }
-
-    intent_key = intent.split("/")[0] if intent else "通用"
-    templates_list = templates.get(intent_key, templates["通用"])
-    return random.choice(templates_list)
-
-
-def save_history(keywords, topics):
-    """保存历史数据"""
-    os.makedirs(HISTORY_DIR, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-    history_data = {
-        "timestamp": timestamp,
-        "datetime": datetime.now().isoformat(),
-        "keywords_count": len(keywords),
-        "topics_count": len(topics),
-        "top_keywords": [kw for kw, _ in list(keywords.items())[:20]],
-        "topics": [t["title"] for t in topics[:10]]
-    }
-
-    history_file = f"{HISTORY_DIR}/history_{timestamp}.json"
-    with open(history_file, "w", encoding="utf-8") as f:
-        json.dump(history_data, f, ensure_ascii=False, indent=2)
-
-    print(f"✅ 已保存历史数据: {history_file}")
+def save_history(keywords, ranked_keywords, topics, high_score_count=None, snapshots=None):
+    """
+    保存历史数据：运行记录写入历史数据库，完整关键词表写入列式快照
+
+    Args:
+        keywords: 全部关键词（KeywordStore）
+        ranked_keywords: 按排名排列的 (关键词, 记录)
+        topics: 按排名排列的热点选题
+        high_score_count: 高分关键词数
+        snapshots: 快照存储（None 表示不保存快照）
+    """
+    # run_at 在历史数据库中唯一，保留微秒，同一秒内的两次运行不会冲突
+    run_at = datetime.now()
+    with HistoryStore(HISTORY_DB) as store:
+        run_id = store.record_run(
+            run_at, len(keywords), len(topics), high_score_count,
+            ((kw, data.score, data.intent, data.source) for kw, data in ranked_keywords[:HISTORY_TOP_N]),
+            ((t["title"], t["source"]) for t in topics)
+        )
+
+    print(f"✅ 已保存历史数据: {HISTORY_DB} (第{run_id}次运行)")
+
+    if snapshots is not None:
+        snapshot = snapshots.save(
+            run_at,
+            ((kw, data.source_mask, data.score, data.base_score, data.intent) for kw, data in keywords.items()),
+            SOURCE_NAMES
+        )
+        print(f"✅ 已保存关键词快照: {snapshot} ({len(keywords)} 条)")
 
 
 def load_recent_history(limit=5):
-    """加载最近的历史记录"""
-    if not os.path.exists(HISTORY_DIR):
-        return []
-
-    files = sorted(Path(HISTORY_DIR).glob("history_*.json"), reverse=True)[:limit]
+    """加载最近的历史记录（从新到旧）"""
     history = []
-
-    for file in files:
-        try:
-            with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                history.append(data)
-        except:
-            pass
+    with HistoryStore(HISTORY_DB) as store:
+        for run in store.runs(limit=limit, newest_first=True):
+            run_at = datetime.fromisoformat(run["run_at"])
+            history.append({
+                "timestamp": run_at.strftime("%Y%m%d_%H%M%S"),
+                "datetime": run["run_at"],
+                "keywords_count": run["keywords_count"],
+                "topics_count": run["topics_count"],
+                "high_score_count": run["high_score_count"],
+                "top_keywords": [row["keyword"] for row in store.run_keywords(run["id"], limit=20)],
+                "topics": [row["title"] for row in store.run_topics(run["id"])[:10]]
+            })
 
     return history
 
@@ -329,15 +316,18 @@ def fetch_weibo_hot():
 
 # ==================== 增强版抓取 ====================
 # 尝试导入并使用增强版抓取器
+# 各抓取器共用一个本地缓存，定时任务重复运行时大部分结果直接从缓存读取
+suggestion_cache = SuggestionCache(CACHE_FILE)
+
 if USE_ENHANCED_FETCHER:
     try:
-        baidu_enhanced = BaiduFetcher()
-        bili_enhanced = BilibiliFetcher()
-        taobao_enhanced = TaobaoFetcher()
-        zhihu_enhanced = ZhihuFetcher()
-        weibo_enhanced = WeiboFetcher()
-        google_enhanced = GoogleAutoCompleteFetcher()
-        bing_enhanced = BingAutoCompleteFetcher()
+        baidu_enhanced = BaiduFetcher(cache=suggestion_cache)
+        bili_enhanced = BilibiliFetcher(cache=suggestion_cache)
+        taobao_enhanced = TaobaoFetcher(cache=suggestion_cache)
+        zhihu_enhanced = ZhihuFetcher(cache=suggestion_cache)
+        weibo_enhanced = WeiboFetcher(cache=suggestion_cache)
+        google_enhanced = GoogleAutoCompleteFetcher(cache=suggestion_cache)
+        bing_enhanced = BingAutoCompleteFetcher(cache=suggestion_cache)
         print("✅ 增强版网络抓取器已启用")
     except Exception as e:
         print(f"⚠️  增强版抓取器初始化失败: {e}")
@@ -395,6 +385,86 @@ def fetch_weibo_enhanced():
     return fetch_weibo_hot()
 
 
+# ==================== 并发抓取 ====================
+def get_suggestion_sources():
+    """种子词阶段使用的数据源（按输出顺序排列）"""
+    return {
+        "百度": fetch_baidu_enhanced,
+        "B站": fetch_bilibili_enhanced,
+        "淘宝": fetch_taobao_enhanced,
+        "Google": fetch_google_suggestions,
+        "Bing": fetch_bing_suggestions,
+    }
+
+
+def merge_suggestions(all_keywords, results, source):
+    """把某个数据源返回的建议词规范化后合并进关键词表（KeywordStore），返回本次合并的关键词列表"""
+    merged = []
+    for kw in results:
+        # 淘宝/Google/Bing可能返回列表或字符串
+        if isinstance(kw, list):
+            kw = kw[0] if kw else ""
+        if isinstance(kw, str):
+            kw = normalize_keyword(kw)
+            if kw:
+                all_keywords.add(kw, source)
+                merged.append(kw)
+    return merged
+
+
+def fetch_seed_suggestions(keywords, all_keywords):
+    """并发抓取 种子词 × 数据源 矩阵，合并进关键词表，返回各数据源的建议词数量"""
+    scheduler = ConcurrentFetchScheduler(get_suggestion_sources(), source_limits=SOURCE_CONCURRENCY)
+    counts = {}
+    for keyword, source, results in scheduler.run(keywords):
+        counts[source] = counts.get(source, 0) + len(merge_suggestions(all_keywords, results, source))
+
+    slowest = max(scheduler.elapsed.get(source, 0.0) for source in scheduler.sources)
+    print(f"  ⏱️  并发抓取耗时: {scheduler.elapsed['total']:.1f}秒 (最慢数据源: {slowest:.1f}秒)")
+    return counts
+
+
+def fetch_prefix_suggestions(keywords, all_keywords):
+    """并发抓取各数据源的前缀扩展查询词，合并进关键词表，返回各数据源的建议词数量"""
+    if not USE_ENHANCED_FETCHER:
+        return {}
+
+    fetchers = {
+        "百度": baidu_enhanced,
+        "B站": bili_enhanced,
+        "淘宝": taobao_enhanced,
+        "Google": google_enhanced,
+        "Bing": bing_enhanced,
+    }
+    seeds = list(keywords)[:PREFIX_TOP_SEEDS]
+    jobs = budget_jobs({
+        source: [variant for keyword in seeds for variant in fetcher.prefix_variants(keyword)]
+        for source, fetcher in fetchers.items()
+    }, PREFIX_MAX_QUERIES)
+    print(f"  🔤 前缀扩展 {len(seeds)} 个种子词，查询 {sum(len(v) for v in jobs.values())} 次")
+
+    scheduler = ConcurrentFetchScheduler(get_suggestion_sources(), source_limits=SOURCE_CONCURRENCY)
+    counts = {}
+    for keyword, source, results in scheduler.run_jobs(jobs, max_misses=PREFIX_MAX_MISSES):
+        counts[source] = counts.get(source, 0) + len(merge_suggestions(all_keywords, results, source))
+
+    skipped = sum(scheduler.skipped.values())
+    print(f"  ⏱️  前缀扩展耗时: {scheduler.elapsed['total']:.1f}秒" + (f"（跳过 {skipped} 次查询）" if skipped else ""))
+    return counts
+
+
+def expand_long_tail(all_keywords):
+    """把第一阶段的建议词作为新查询词逐层扩展，返回新增的关键词数"""
+    expander = KeywordExpander(
+        get_suggestion_sources(), merge_suggestions, calculate_score,
+        max_depth=EXPAND_MAX_DEPTH, max_queries=EXPAND_MAX_QUERIES,
+        source_limits=SOURCE_CONCURRENCY
+    )
+    added = expander.expand(SEED_KEYWORDS, all_keywords)
+    print(f"  🌿 扩展查询 {expander.queries} 个关键词，新增 {added} 个长尾词")
+    return added
+
+
 # ==================== 备用数据生成 ====================
 def generate_fallback_keywords():
     """生成备用关键词"""
@@ -432,67 +502,40 @@ def generate_fallback_hot_topics():
 
 
 # ==================== 主逻辑 ====================
-def main():
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="养生/饮食热点 + SEO长尾词挖掘器")
+    parser.add_argument("--no-charts", action="store_true", help="不生成可视化图表（跳过绘图库的加载）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     start_time = time.time()
     print("=" * 70)
     print("🍵 养生/饮食热点 + SEO长尾词挖掘器 v2.0")
     print("=" * 70)
 
-    all_keywords = {}
+    all_keywords = KeywordStore()
     hot_topics = []
 
     # 1. 基于种子词抓取各平台的建议词
     print("\n📊 第一阶段：基于种子词抓取搜索建议")
     print("-" * 70)
 
-    for keyword in SEED_KEYWORDS:
-        print(f"\n🌱 种子词: [{keyword}]")
-
-        # 多源并行（使用增强版）
-        baidu_results = fetch_baidu_enhanced(keyword)
-        for kw in baidu_results:
-            if kw not in all_keywords:
-                all_keywords[kw] = {"sources": [], "score": 0, "intent": ""}
-            all_keywords[kw]["sources"].append("百度")
-
-        bili_results = fetch_bilibili_enhanced(keyword)
-        for kw in bili_results:
-            if kw not in all_keywords:
-                all_keywords[kw] = {"sources": [], "score": 0, "intent": ""}
-            all_keywords[kw]["sources"].append("B站")
-
-        taobao_results = fetch_taobao_enhanced(keyword)
-        for kw in taobao_results:
-            # 淘宝可能返回列表或字符串
-            if isinstance(kw, list):
-                kw = kw[0] if kw else ""
-            if isinstance(kw, str) and kw:
-                if kw not in all_keywords:
-                    all_keywords[kw] = {"sources": [], "score": 0, "intent": ""}
-                all_keywords[kw]["sources"].append("淘宝")
-
-        # 新增：Google和Bing数据源
-        google_results = fetch_google_suggestions(keyword)
-        for kw in google_results:
-            # 确保是字符串
-            if isinstance(kw, list):
-                kw = kw[0] if kw else ""
-            if isinstance(kw, str) and kw:
-                if kw not in all_keywords:
-                    all_keywords[kw] = {"sources": [], "score": 0, "intent": ""}
-                all_keywords[kw]["sources"].append("Google")
-
-        bing_results = fetch_bing_suggestions(keyword)
-        for kw in bing_results:
-            # 确保是字符串
-            if isinstance(kw, list):
-                kw = kw[0] if kw else ""
-            if isinstance(kw, str) and kw:
-                if kw not in all_keywords:
-                    all_keywords[kw] = {"sources": [], "score": 0, "intent": ""}
-                all_keywords[kw]["sources"].append("Bing")
-
-        time.sleep(random.uniform(0.5, 1.0))
+    for source, count in fetch_seed_suggestions(SEED_KEYWORDS, all_keywords).items():
+        print(f"  📥 {source}: {count} 个建议词")
+
+    if PREFIX_EXPANSION:
+        print("\n🔤 前缀扩展")
+        for source, count in fetch_prefix_suggestions(SEED_KEYWORDS, all_keywords).items():
+            print(f"  📥 {source}: {count} 个建议词")
+
+    if all_keywords and EXPAND_MAX_DEPTH > 1:
+        print("\n🌿 长尾词扩展")
+        expand_long_tail(all_keywords)
 
     # 2. 抓取热榜
     print("\n\n📊 第二阶段：抓取平台热榜")
@@ -511,6 +554,13 @@ def main():
             if any(kw in title for kw in SEED_KEYWORDS):
                 hot_topics.append({"title": title, "source": "微博热搜", "angle": "热点追踪"})
 
+    try:
+        suggestion_cache.save()
+        cache_stats = suggestion_cache.stats()
+        print(f"\n  💾 缓存命中 {cache_stats['hits']} 次，未命中 {cache_stats['misses']} 次，共 {cache_stats['entries']} 条")
+    except OSError as e:
+        print(f"\n  ⚠️  缓存保存失败: {e}")
+
     # 3. 如果外部源全部失败，使用备用数据
     if not all_keywords and not hot_topics:
         print("\n  ⚠️  所有外部数据源均不可用，启用备用数据生成方案")
@@ -518,20 +568,68 @@ def main():
 
         fallback_keywords = generate_fallback_keywords()
         for kw in fallback_keywords:
-            all_keywords[kw] = {"sources": ["备用生成"], "score": 0, "intent": ""}
+            all_keywords.add(kw, "备用生成")
         hot_topics = generate_fallback_hot_topics()
 
     # 4. 计算分数和意图
     print("\n\n📊 第三阶段：分析关键词")
     print("-" * 70)
 
-    for kw, data in all_keywords.items():
-        data["score"] = calculate_score(kw)
-        data["intent"] = detect_intent(kw)
-        data["catchy_title"] = generate_catchy_title(kw, data["intent"])
-        data["source"] = "+".join(set(data["sources"]))
-
-    sorted_keywords = sorted(all_keywords.items(), key=lambda x: x[1]["score"], reverse=True)
+    # 近似重复的关键词（如"养生怎么吃"/"养生的怎么吃"）只保留一个，来源合并
+    if DEDUP_ENABLED:
+        before = len(all_keywords)
+        removed = collapse_near_duplicates(all_keywords, NearDuplicateClusterer(threshold=DEDUP_THRESHOLD))
+        print(f"  🧬 近似重复合并: {before} → {len(all_keywords)} 个关键词（合并 {removed} 个）")
+
+    # 标题按 (种子, 关键词) 在输出时按需生成，不为每个关键词保存标题字符串
+    title_seed = TITLE_SEED if TITLE_SEED is not None else random.randrange(2 ** 32)
+
+    # 只分析索引中没有的新关键词，其余直接复用上次的结果
+    keyword_index = KeywordIndex(INDEX_FILE)
+    new_keywords = [kw for kw in all_keywords if kw not in keyword_index]
+    analysis = analyze_keywords(
+        new_keywords, seed=title_seed,
+        workers=ANALYSIS_WORKERS, threshold=ANALYSIS_PARALLEL_THRESHOLD, with_titles=False
+    )
+    keyword_index.update(zip(analysis.index, analysis["score"].tolist(), analysis["intent"].tolist()), title_seed)
+    print(f"  ♻️  复用已分析关键词 {len(all_keywords) - len(new_keywords)} 个，新分析 {len(new_keywords)} 个")
+
+    # 趋势：用本次的基础分和来源数增量更新历史聚合，上升/新出现/来源增加的关键词加分
+    trend_bonus, rising_trends, fresh_trends = {}, None, None
+    if TREND_ENABLED:
+        with HistoryStore(HISTORY_DB) as history:
+            trends = TrendEngine(history)
+            run_no = trends.update(datetime.now(), (
+                (kw, keyword_index.get(kw)[0], len(record.sources)) for kw, record in all_keywords.items()
+            ))
+            trend_bonus = trends.bonuses(TREND_WEIGHTS)
+            rising_trends = trends.rising(TREND_TOP_N)
+            fresh_trends = trends.new_keywords(TREND_TOP_N)
+        print(f"  📈 趋势统计第{run_no}次：上升 {len(rising_trends)} 个，新出现 {len(fresh_trends)} 个，"
+              f"趋势加分 {len(trend_bonus)} 个")
+
+    # 来源加分：各数据源权重 + 跨数据源权重（见 config.json 的 source_weighting）
+    source_weighting = SourceWeighting.from_config(CONFIG_FILE)
+
+    # 边评分边排名：只保留前 TOP_K 个，不对全部关键词排序
+    ranker = TopKRanker(TOP_K)
+    high_score_count = 0
+    total_score = 0
+    for kw, record in all_keywords.items():
+        base_score, intent, seed = keyword_index.get(kw)
+        score = base_score + trend_bonus.get(kw, 0) + source_weighting.bonus(record.source_mask)
+        all_keywords.set_analysis(kw, score, intent, seed, base_score)
+        ranker.push(kw, record, score)
+        high_score_count += score >= 8
+        total_score += score
+
+    ranked_keywords = ranker.top()
+
+    keyword_index.touch(all_keywords)
+    try:
+        keyword_index.save()
+    except OSError as e:
+        print(f"  ⚠️  关键词索引保存失败: {e}")
     sorted_topics = sorted(hot_topics, key=lambda x: len(x["title"]), reverse=True)
 
     # 5. 生成输出文件
@@ -541,93 +639,67 @@ def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     # 5.1 热点选题 TOP10
-    hot_topics_md = f"""# 养生/饮食热点选题 TOP10
-
-> 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-> 数据源: {'+'.join(set([t['source'] for t in hot_topics])) if hot_topics else '备用生成'}
-
----
-
-"""
-    for i, topic in enumerate(sorted_topics[:10], 1):
-        hot_topics_md += f"""## {i}. {topic['title']}
-
-- **来源**: {topic['source']}
-- **争议点/角度**: {topic['angle']}
-- **适合写的角度**: 深度解析 / 避坑指南 / 科普向
-- **💥 爆款标题建议**: {topic['title'][:40]}...这篇告诉你真相
-
----
-
-"""
-
-    with open(f"{OUTPUT_DIR}/hot_topics.md", "w", encoding="utf-8") as f:
-        f.write(hot_topics_md)
+    topic_sources = '+'.join(set([t['source'] for t in hot_topics])) if hot_topics else '备用生成'
+    write_hot_topics_md(f"{OUTPUT_DIR}/hot_topics.md", sorted_topics, topic_sources, limit=10,
+                        rising=rising_trends, new=fresh_trends)
     print(f"✅ 已生成: {OUTPUT_DIR}/hot_topics.md")
 
-    # 5.2 SEO关键词 Markdown表格
-    seo_keywords_md = f"""# SEO长尾词挖掘结果
-
-> 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-> 总关键词数: {len(sorted_keywords)}
-> 高分关键词(≥8分): {sum(1 for _, d in sorted_keywords if d['score'] >= 8)}
-
----
-
-| 关键词 | 来源 | 意图标签 | 推荐指数 | 爆款标题建议 |
-|--------|------|----------|----------|--------------|
-"""
-    for kw, data in sorted_keywords[:100]:
-        seo_keywords_md += f"| {kw} | {data['source']} | {data['intent']} | {data['score']} | {data['catchy_title']} |\n"
-
-    with open(f"{OUTPUT_DIR}/seo_keywords.md", "w", encoding="utf-8") as f:
-        f.write(seo_keywords_md)
-    print(f"✅ 已生成: {OUTPUT_DIR}/seo_keywords.md")
-
-    # 5.3 SEO关键词 CSV
-    with open(f"{OUTPUT_DIR}/seo_keywords.csv", "w", encoding="utf-8-sig", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["关键词", "来源", "意图标签", "推荐指数", "爆款标题建议"])
-        for kw, data in sorted_keywords[:100]:
-            writer.writerow([kw, data["source"], data["intent"], data["score"], data["catchy_title"]])
-    print(f"✅ 已生成: {OUTPUT_DIR}/seo_keywords.csv")
-
-    # 5.4 JSON格式（新增）
-    json_output = {
-        "generated_at": datetime.now().isoformat(),
-        "total_keywords": len(sorted_keywords),
-        "high_score_keywords": [
-            {"keyword": kw, **data}
-            for kw, data in sorted_keywords[:50]
-        ],
-        "hot_topics": sorted_topics[:10]
-    }
+    # 5.2 SEO关键词：Markdown / CSV / JSON / JSON Lines 一次遍历写完
+    writers = [
+        MarkdownKeywordWriter(f"{OUTPUT_DIR}/seo_keywords.md", len(all_keywords), high_score_count,
+                              limit=TOP_N_TABLE),
+        CsvKeywordWriter(f"{OUTPUT_DIR}/seo_keywords.csv", limit=TOP_N_TABLE),
+        JsonKeywordWriter(
+            f"{OUTPUT_DIR}/seo_keywords.json",
+            head={"generated_at": datetime.now().isoformat(), "total_keywords": len(all_keywords)},
+            list_key="high_score_keywords",
+            tail={"hot_topics": sorted_topics[:10]},
+            limit=TOP_N_JSON
+        ),
+    ]
+    rows = ranked_keywords
+    if EXPORT_JSONL:
+        # 全量输出：前 TOP_K 个按排名，其余按发现顺序
+        writers.append(JsonLinesKeywordWriter(f"{OUTPUT_DIR}/seo_keywords.jsonl"))
+        rows = ranker.iter_all(all_keywords.items())
 
-    with open(f"{OUTPUT_DIR}/seo_keywords.json", "w", encoding="utf-8") as f:
-        json.dump(json_output, f, ensure_ascii=False, indent=2)
-    print(f"✅ 已生成: {OUTPUT_DIR}/seo_keywords.json")
+    for writer in export_keywords(rows, writers):
+        print(f"✅ 已生成: {writer.path} ({writer.count} 条)")
 
     # 6. 保存历史数据
-    save_history(all_keywords, hot_topics)
-
-    # 7. 生成可视化图表
-    try:
-        from charts import KeywordVisualizer
-
-        stats = {
-            "total": len(sorted_keywords),
-            "high_score": sum(1 for _, d in sorted_keywords if d['score'] >= 8),
-            "avg_score": sum(d['score'] for _, d in sorted_keywords) / len(sorted_keywords)
-        }
-
-        visualizer = KeywordVisualizer(output_dir=f"{OUTPUT_DIR}/charts")
-        charts = visualizer.generate_all_charts(sorted_keywords, stats)
-
-    except ImportError as e:
-        print(f"\n⚠️  可视化模块导入失败: {e}")
-        print("💡 如需生成图表，请运行: pip install matplotlib seaborn wordcloud")
-    except Exception as e:
-        print(f"\n⚠️  图表生成失败: {e}")
+    snapshots = SnapshotStore(SNAPSHOT_DIR) if SAVE_SNAPSHOTS else None
+    save_history(all_keywords, ranked_keywords, sorted_topics, high_score_count, snapshots)
+
+    # 6.1 与上次运行对比
+    diff = diff_latest(snapshots) if snapshots is not None else None
+    if diff:
+        write_diff_md(f"{OUTPUT_DIR}/diff.md", diff, limit=DIFF_TOP_N)
+        write_diff_json(f"{OUTPUT_DIR}/diff.json", diff)
+        print(f"✅ 已生成: {OUTPUT_DIR}/diff.md / diff.json")
+
+    # 7. 生成可视化图表（绘图库只在此处按需加载）
+    if GENERATE_CHARTS and not args.no_charts:
+        try:
+            from charts import KeywordVisualizer
+
+            stats = {
+                "total": len(all_keywords),
+                "high_score": high_score_count,
+                "avg_score": total_score / len(all_keywords)
+            }
+
+            # 图表只依赖前20名的顺序，其余关键词无需排序
+            visualizer = KeywordVisualizer(output_dir=f"{OUTPUT_DIR}/charts", workers=CHART_WORKERS,
+                                          trend_window=TREND_CHART_WINDOW)
+            charts = visualizer.generate_all_charts(
+                list(ranker.iter_all(all_keywords.items())), stats, history_db=HISTORY_DB
+            )
+
+        except ImportError as e:
+            print(f"\n⚠️  可视化模块导入失败: {e}")
+            print("💡 如需生成图表，请运行: pip install matplotlib seaborn wordcloud")
+        except Exception as e:
+            print(f"\n⚠️  图表生成失败: {e}")
 
     # 8. 打印预览
     elapsed = time.time() - start_time
@@ -635,19 +707,23 @@ def main():
     print("🎉 数据挖掘完成！")
     print("=" * 70)
     print(f"⏱️  耗时: {elapsed:.1f}秒")
-    print(f"📊 关键词总数: {len(sorted_keywords)}")
-    print(f"🔥 高分关键词(≥8分): {sum(1 for _, d in sorted_keywords if d['score'] >= 8)}")
+    print(f"📊 关键词总数: {len(all_keywords)}")
+    print(f"🔥 高分关键词(≥8分): {high_score_count}")
+    if diff:
+        counts = diff["counts"]
+        print(f"🔀 与上次运行相比: 新增 {counts['new']}，消失 {counts['dropped']}，"
+              f"规则分或来源变化 {counts['changed']}")
 
     print("\n📈 热点选题 TOP10:")
     print("-" * 70)
     for i, topic in enumerate(sorted_topics[:10], 1):
         print(f"{i:2d}. {topic['title'][:60]}")
 
-    print("\n\n📈 SEO关键词 TOP30:")
+    print(f"\n\n📈 SEO关键词 TOP{TOP_N_CONSOLE}:")
     print("-" * 70)
     print(f"{'排名':<4} {'关键词':<28} {'分数':<4} {'意图':<12}")
     print("-" * 70)
-    for i, (kw, data) in enumerate(sorted_keywords[:30], 1):
+    for i, (kw, data) in enumerate(ranked_keywords[:TOP_N_CONSOLE], 1):
         print(f"{i:<4} {kw[:26]:<28} {data['score']:<4} {data['intent']:<12}")
 
     print(f"\n\n💾 输出文件位于 {OUTPUT_DIR}/ 目录")
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+历史数据库（SQLite）
+每次运行一行 runs 记录，排名靠前的关键词（推荐指数、意图、来源）和热点选题分表保存，
+按时间、按关键词的范围查询都走索引；旧版 history_*.json 在第一次打开时自动导入一次
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DB = "history/history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_at TEXT NOT NULL UNIQUE,
+    keywords_count INTEGER NOT NULL,
+    topics_count INTEGER NOT NULL,
+    high_score_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    id INTEGER PRIMARY KEY,
+    keyword TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS run_keywords (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    keyword_id INTEGER NOT NULL REFERENCES keywords(id),
+    rank INTEGER NOT NULL,
+    score INTEGER,
+    intent TEXT,
+    source TEXT,
+    PRIMARY KEY (run_id, keyword_id)
+);
+CREATE INDEX IF NOT EXISTS idx_run_keywords_keyword ON run_keywords (keyword_id, run_id);
+CREATE TABLE IF NOT EXISTS run_topics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    rank INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    source TEXT,
+    PRIMARY KEY (run_id, rank)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _time_text(value) -> Optional[str]:
+    """datetime / ISO字符串 -> 统一的 ISO 字符串（按字典序即按时间排序；有微秒时保留微秒）"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _time_range(column: str, start, end) -> Tuple[List[str], List[str]]:
+    """
+    时间范围条件：只为给出的边界生成 "列 >= ?" / "列 < ?"，列在左侧才能走 run_at 索引
+
+    Returns:
+        (条件列表, 参数列表)
+    """
+    conditions, params = [], []
+    if start is not None:
+        conditions.append(f"{column} >= ?")
+        params.append(_time_text(start))
+    if end is not None:
+        conditions.append(f"{column} < ?")
+        params.append(_time_text(end))
+    return conditions, params
+
+
+class HistoryStore:
+    """运行历史的 SQLite 存储"""
+
+    def __init__(self, path: str = HISTORY_DB, legacy_dir: Optional[str] = None):
+        """
+        打开（必要时创建）历史数据库
+
+        Args:
+            path: 数据库文件路径
+            legacy_dir: 旧版 history_*.json 所在目录，默认为数据库所在目录
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.import_legacy(legacy_dir if legacy_dir is not None else self.path.parent)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- 写入 ----------
+
+    def _keyword_ids(self, keywords: List[str]) -> List[int]:
+        self.conn.executemany("INSERT OR IGNORE INTO keywords (keyword) VALUES (?)", ((kw,) for kw in keywords))
+        ids = {}
+        # SQLite 默认最多 999 个绑定参数
+        for i in range(0, len(keywords), 900):
+            chunk = keywords[i:i + 900]
+            placeholders = ",".join("?" * len(chunk))
+            for row in self.conn.execute(
+                    f"SELECT id, keyword FROM keywords WHERE keyword IN ({placeholders})", chunk):
+                ids[row["keyword"]] = row["id"]
+        return [ids[kw] for kw in keywords]
+
+    def _insert_run(self, run_at, keywords_count: int, topics_count: int,
+                    high_score_count: Optional[int],
+                    keywords: Iterable[Tuple[str, Optional[int], Optional[str], Optional[str]]],
+                    topics: Iterable[Tuple[str, Optional[str]]]) -> int:
+        cursor = self.conn.execute(
+            "INSERT INTO runs (run_at, keywords_count, topics_count, high_score_count) VALUES (?, ?, ?, ?)",
+            (_time_text(run_at), keywords_count, topics_count, high_score_count)
+        )
+        run_id = cursor.lastrowid
+
+        # 同一次运行里重复出现的关键词只保留排名最靠前的一条
+        rows = {}
+        for keyword, score, intent, source in keywords:
+            rows.setdefault(keyword, (score, intent, source))
+        ids = self._keyword_ids(list(rows))
+        self.conn.executemany(
+            "INSERT INTO run_keywords (run_id, keyword_id, rank, score, intent, source) VALUES (?, ?, ?, ?, ?, ?)",
+            ((run_id, keyword_id, rank, *values)
+             for rank, (keyword_id, values) in enumerate(zip(ids, rows.values()), 1))
+        )
+        self.conn.executemany(
+            "INSERT INTO run_topics (run_id, rank, title, source) VALUES (?, ?, ?, ?)",
+            ((run_id, rank, title, source) for rank, (title, source) in enumerate(topics, 1))
+        )
+        return run_id
+
+    def record_run(self, run_at, keywords_count: int, topics_count: int, high_score_count: Optional[int],
+                   keywords: Iterable[Tuple[str, int, str, str]],
+                   topics: Iterable[Tuple[str, str]]) -> int:
+        """
+        保存一次运行
+
+        Args:
+            run_at: 运行时间（datetime）
+            keywords_count: 关键词总数
+            topics_count: 热点选题总数
+            high_score_count: 高分关键词数
+            keywords: 按排名排列的 (关键词, 推荐指数, 意图标签, 来源)
+            topics: 按排名排列的 (选题标题, 来源)
+
+        Returns:
+            运行编号
+        """
+        with self.conn:
+            return self._insert_run(run_at, keywords_count, topics_count, high_score_count, keywords, topics)
+
+    def import_legacy(self, legacy_dir) -> int:
+        """导入旧版 history_*.json（只执行一次），返回导入的运行数"""
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+            return 0
+
+        imported = 0
+        with self.conn:
+            for file in sorted(Path(legacy_dir).glob("history_*.json")):
+                try:
+                    with open(file, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    run_at = data.get("datetime") or datetime.strptime(data["timestamp"], "%Y%m%d_%H%M%S")
+                    if self.conn.execute("SELECT 1 FROM runs WHERE run_at = ?", (_time_text(run_at),)).fetchone():
+                        continue
+                    self._insert_run(
+                        run_at, data.get("keywords_count", 0), data.get("topics_count", 0), None,
+                        ((kw, None, None, None) for kw in data.get("top_keywords", [])),
+                        ((title, None) for title in data.get("topics", []))
+                    )
+                    imported += 1
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"⚠️  历史文件导入失败 {file.name}: {e}")
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('legacy_imported', ?)",
+                              (_time_text(datetime.now()),))
+
+        if imported:
+            logger.info(f"  📥 已导入旧版历史记录 {imported} 条")
+        return imported
+
+    # ---------- 查询 ----------
+
+    def runs(self, start=None, end=None, limit: Optional[int] = None, newest_first: bool = False) -> List[dict]:
+        """
+        按时间范围查询运行记录
+
+        Args:
+            start: 起始时间（含），datetime 或 ISO 字符串
+            end: 结束时间（不含）
+            limit: 最多返回条数
+            newest_first: 是否从新到旧排列
+
+        Returns:
+            运行记录字典列表（id, run_at, keywords_count, topics_count, high_score_count）
+        """
+        conditions, params = _time_range("run_at", start, end)
+        sql = "SELECT * FROM runs"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY run_at DESC" if newest_first else " ORDER BY run_at"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def run_keywords(self, run_id: int, limit: Optional[int] = None) -> List[dict]:
+        """某次运行保存的关键词（按排名）"""
+        sql = """SELECT k.keyword, rk.rank, rk.score, rk.intent, rk.source
+                 FROM run_keywords rk JOIN keywords k ON k.id = rk.keyword_id
+                 WHERE rk.run_id = ? ORDER BY rk.rank"""
+        params = [run_id]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def run_topics(self, run_id: int) -> List[dict]:
+        """某次运行保存的热点选题（按排名）"""
+        return [dict(row) for row in self.conn.execute(
+            "SELECT title, source, rank FROM run_topics WHERE run_id = ? ORDER BY rank", (run_id,))]
+
+    def keyword_history(self, keyword: str, start=None, end=None) -> List[dict]:
+        """
+        单个关键词在时间范围内每次运行的记录
+
+        Returns:
+            按时间排列的 (run_at, rank, score, intent, source) 字典列表；从未出现过返回空列表
+        """
+        conditions, params = _time_range("r.run_at", start, end)
+        sql = """SELECT r.run_at, rk.rank, rk.score, rk.intent, rk.source
+                 FROM keywords k
+                 JOIN run_keywords rk ON rk.keyword_id = k.id
+                 JOIN runs r ON r.id = rk.run_id
+                 WHERE """ + " AND ".join(["k.keyword = ?"] + conditions) + " ORDER BY r.run_at"
+        return [dict(row) for row in self.conn.execute(sql, [keyword] + params)]
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
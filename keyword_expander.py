@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+长尾词递归扩展模块
+把抓取到的建议词作为新的查询词继续抓取（广度优先）：
+深度上限 + 总查询预算 + 按评分排序的待扩展队列（最有潜力的词优先扩展）+ 已查询集合（同一个词只查询一次）
+"""
+
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional
+import logging
+
+from fetch_scheduler import ConcurrentFetchScheduler
+
+logger = logging.getLogger(__name__)
+
+# 每批并发扩展的关键词数
+DEFAULT_BATCH_SIZE = 20
+
+
+class KeywordExpander:
+    """广度优先的长尾词扩展器"""
+
+    def __init__(self, sources: Dict[str, Callable[[str], List]],
+                 merge: Callable[[dict, List, str], List[str]],
+                 score: Callable[[str], int],
+                 max_depth: int = 2, max_queries: int = 100,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 source_limits: Optional[Dict[str, int]] = None):
+        """
+        初始化扩展器
+
+        Args:
+            sources: 数据源名称 -> 抓取函数
+            merge: 合并函数 (关键词表, 结果列表, 数据源) -> 本次合并的关键词列表
+            score: 评分函数，决定待扩展队列的顺序
+            max_depth: 最大深度（种子词为第0层，种子词的建议词为第1层）
+            max_queries: 最多扩展的关键词数（每个关键词会查询所有数据源）
+            batch_size: 每批并发扩展的关键词数
+            source_limits: 各数据源的并发上限
+        """
+        self.scheduler = ConcurrentFetchScheduler(sources, source_limits=source_limits)
+        self.merge = merge
+        self.score = score
+        self.max_depth = max_depth
+        self.max_queries = max_queries
+        self.batch_size = max(1, batch_size)
+
+        self.frontier = []
+        self.seen = set()
+        self.queries = 0
+        self._seq = 0
+
+    def _push(self, keyword: str, depth: int):
+        """加入待扩展队列（已查询或已在队列中的词会被忽略）"""
+        if keyword in self.seen or depth >= self.max_depth:
+            return
+        self.seen.add(keyword)
+        # 分数高的优先；同分时浅层优先，再按发现顺序
+        heapq.heappush(self.frontier, (-self.score(keyword), depth, self._seq, keyword))
+        self._seq += 1
+
+    def _next_batch(self) -> List[tuple]:
+        batch = []
+        while self.frontier and len(batch) < self.batch_size and self.queries + len(batch) < self.max_queries:
+            _, depth, _, keyword = heapq.heappop(self.frontier)
+            batch.append((keyword, depth))
+        return batch
+
+    def expand(self, seeds: Iterable[str], all_keywords: dict) -> int:
+        """
+        从已有关键词出发逐层扩展，结果直接合并进关键词表
+
+        Args:
+            seeds: 已经查询过的种子词
+            all_keywords: 关键词表（第一阶段的结果，视为第1层）
+
+        Returns:
+            新增的关键词数
+        """
+        before = len(all_keywords)
+        self.seen.update(seeds)
+        for keyword in list(all_keywords):
+            self._push(keyword, 1)
+
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                break
+
+            depths = dict(batch)
+            self.queries += len(batch)
+            logger.info(f"  🌿 扩展 {len(batch)} 个关键词（已查询 {self.queries}/{self.max_queries}，待扩展 {len(self.frontier)}）")
+
+            for keyword, source, results in self.scheduler.run(depths):
+                child_depth = depths[keyword] + 1
+                for child in self.merge(all_keywords, results, source):
+                    self._push(child, child_depth)
+
+        return len(all_keywords) - before
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+已分析关键词索引
+持久化保存每个关键词的推荐指数、意图标签和标题种子，下次运行只分析新出现的关键词；
+索引带评分规则的哈希，规则一改，旧结果自动作废
+"""
+
+import json
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+import logging
+
+from keyword_scoring import rules_fingerprint
+from suggestion_cache import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "cache/keyword_index.json"
+
+# 最多保留的关键词数，超出时淘汰最久未出现的关键词
+MAX_ENTRIES = 500000
+
+
+class KeywordIndex:
+    """关键词 -> (推荐指数, 意图标签, 标题种子)"""
+
+    def __init__(self, path: str = INDEX_FILE, max_entries: int = MAX_ENTRIES):
+        """
+        加载索引；规则哈希不一致时丢弃全部旧结果
+
+        Args:
+            path: 索引文件路径
+            max_entries: 最多保留的关键词数
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.fingerprint = rules_fingerprint()
+        self.entries = self._load()
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  关键词索引读取失败，已忽略: {e}")
+            return {}
+
+        if data.get("fingerprint") != self.fingerprint:
+            logger.info("  ♻️  评分规则已变化，关键词索引重建")
+            return {}
+        return data.get("entries", {})
+
+    def __contains__(self, keyword) -> bool:
+        return keyword in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, keyword: str) -> Optional[Tuple[int, str, int]]:
+        """返回 (推荐指数, 意图标签, 标题种子)，未分析过返回None"""
+        entry = self.entries.get(keyword)
+        return tuple(entry) if entry is not None else None
+
+    def update(self, results: Iterable[Tuple[str, int, str]], title_seed: int):
+        """写入新分析的 (关键词, 推荐指数, 意图标签)"""
+        for keyword, score, intent in results:
+            self.entries[keyword] = [score, intent, title_seed]
+
+    def touch(self, keywords: Iterable[str]):
+        """标记本次出现的关键词（移到末尾，最后被淘汰）"""
+        for keyword in keywords:
+            entry = self.entries.pop(keyword, None)
+            if entry is not None:
+                self.entries[keyword] = entry
+
+    def save(self):
+        """淘汰最久未出现的关键词后原子写入"""
+        overflow = len(self.entries) - self.max_entries
+        if overflow > 0:
+            for keyword in list(self.entries)[:overflow]:
+                del self.entries[keyword]
+        atomic_write_json(self.path, {"fingerprint": self.fingerprint, "entries": self.entries})
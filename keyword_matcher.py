@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多模式匹配模块（Aho–Corasick 自动机）
+把所有触发词表一次性编译成自动机，对关键词扫描一遍即可得到命中的全部类别
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+class KeywordMatcher:
+    """Aho–Corasick 多模式匹配器，匹配结果为类别位掩码"""
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        """
+        编译自动机
+
+        Args:
+            categories: 类别名称 -> 触发词列表；同一个词可以属于多个类别
+        """
+        self.names: List[str] = list(categories)
+        self.bits: Dict[str, int] = {name: 1 << i for i, name in enumerate(self.names)}
+
+        # 状态 0 为根；goto[状态] = {字符: 下一状态}
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[int] = [0]
+
+        for name, words in categories.items():
+            for word in words:
+                self._add(word, self.bits[name])
+        self._build_failure_links()
+
+    def _add(self, word: str, bit: int):
+        state = 0
+        for char in word:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(0)
+            state = next_state
+        self.output[state] |= bit
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                # 后缀状态的输出合并进来，匹配时无需沿失败链回溯
+                self.output[next_state] |= self.output[self.fail[next_state]]
+
+    def match(self, text: str) -> int:
+        """
+        扫描一遍文本
+
+        Returns:
+            命中类别的位掩码（用 self.bits[类别] 检查）
+        """
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        mask = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            mask |= output[state]
+        return mask
+
+    def categories(self, text: str) -> List[str]:
+        """命中的类别名称（按定义顺序）"""
+        mask = self.match(text)
+        return [name for name in self.names if mask & self.bits[name]]
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Top-K 排名模块
+边评分边用容量为 K 的小顶堆保留最高分的 K 个关键词，排名成本 O(n log k)；
+同分时先出现的关键词排在前面，结果与对全部关键词做稳定降序排序后取前 K 个完全一致
+"""
+
+import heapq
+from typing import Iterable, Iterator, List, Tuple
+
+
+class TopKRanker:
+    """有界堆 Top-K 排名器"""
+
+    def __init__(self, k: int):
+        """
+        Args:
+            k: 保留的关键词数
+        """
+        self.k = k
+        self.heap: List[tuple] = []
+        self.seq = 0
+
+    def push(self, keyword: str, record, score) -> None:
+        """加入一个已评分的关键词（按加入顺序决定同分时的先后）"""
+        # 堆顶是当前第K名：分数最低、同分时最晚加入的那个
+        item = (score, -self.seq, keyword, record)
+        self.seq += 1
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+        elif item[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, item)
+
+    def extend(self, rows: Iterable[Tuple[str, object]], key=lambda record: record.score) -> "TopKRanker":
+        """批量加入 (关键词, 记录)"""
+        for keyword, record in rows:
+            self.push(keyword, record, key(record))
+        return self
+
+    def top(self) -> List[Tuple[str, object]]:
+        """按分数从高到低返回 (关键词, 记录) 列表"""
+        return [(keyword, record) for _, _, keyword, record in sorted(self.heap, reverse=True)]
+
+    def iter_all(self, rows: Iterable[Tuple[str, object]]) -> Iterator[Tuple[str, object]]:
+        """
+        完整输出：先按排名输出前K个，再按原顺序（不排序）输出其余关键词
+
+        Args:
+            rows: 全部 (关键词, 记录)
+        """
+        ranked = self.top()
+        yield from ranked
+        ranked_keywords = {keyword for keyword, _ in ranked}
+        for keyword, record in rows:
+            if keyword not in ranked_keywords:
+                yield keyword, record
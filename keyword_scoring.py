@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键词评分模块
+评分/意图规则表、单个关键词分析、基于 NumPy/pandas 的批量评分，以及大数据量时的多进程分析
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from keyword_matcher import KeywordMatcher
+
+
+# ==================== 评分/意图规则 ====================
+# 评分规则: (类别, 加分, 触发词)
+SCORE_RULES = [
+    # 疑问高意图（权重提升）
+    ("疑问高意图", 6, ["怎么", "为什么", "真的", "副作用", "危害", "能不能", "多久", "有用吗", "有效吗", "是否", "如何"]),
+    # 购买意图
+    ("购买意图", 5, ["排行榜", "推荐", "哪个牌子", "价格", "怎么买", "测评", "京东", "淘宝", "购买", "哪里买"]),
+    # 领域强相关
+    ("领域强相关", 3, ["控糖", "抗炎", "减脂", "祛湿", "养胃", "补气血", "熬夜", "养生", "饮食"]),
+    # 紧迫感关键词
+    ("紧迫感", 2, ["快速", "立即", "马上", "紧急", "最佳", "最好", "必须"]),
+]
+
+# 长尾词长度分级加分: (最小长度, 加分)，从长到短匹配第一档
+LENGTH_RULES = [(10, 4), (8, 3), (6, 2)]
+
+# 数字关键词（通常更具体）
+DIGIT_PATTERN = re.compile(r'\d')
+DIGIT_POINTS = 1
+
+# 意图规则: (意图标签, 触发词)，按顺序拼接
+INTENT_RULES = [
+    ("疑问", ["怎么", "为什么", "如何", "什么", "是否", "能不能", "有用吗", "有效吗", "方法"]),
+    ("功效", ["功效", "作用", "好处", "益处", "效果"]),
+    ("副作用", ["副作用", "危害", "风险", "禁忌", "注意事项"]),
+    ("购买", ["排行榜", "推荐", "哪个牌子", "价格", "怎么买", "测评", "购买", "哪里买"]),
+    ("对比", ["和", "vs", "VS", "还是", "对比", "区别"]),
+    ("食谱", ["食谱", "菜单", "吃什么", "做法"]),
+]
+
+# 所有触发词编译成一个自动机，一次扫描得到全部命中类别
+KEYWORD_MATCHER = KeywordMatcher({
+    **{f"score:{name}": words for name, _, words in SCORE_RULES},
+    **{f"intent:{name}": words for name, words in INTENT_RULES},
+})
+SCORE_BITS = [(KEYWORD_MATCHER.bits[f"score:{name}"], points) for name, points, _ in SCORE_RULES]
+INTENT_BITS = [(KEYWORD_MATCHER.bits[f"intent:{name}"], name) for name, _ in INTENT_RULES]
+
+
+def _score_from_mask(keyword, mask):
+    score = 0
+    for bit, points in SCORE_BITS:
+        if mask & bit:
+            score += points
+
+    length = len(keyword)
+    for min_length, points in LENGTH_RULES:
+        if length >= min_length:
+            score += points
+            break
+
+    if DIGIT_PATTERN.search(keyword):
+        score += DIGIT_POINTS
+
+    return score
+
+
+def _intent_from_mask(mask):
+    intents = [name for bit, name in INTENT_BITS if mask & bit]
+    return "/".join(intents) if intents else "通用"
+
+
+def calculate_score(keyword):
+    """计算关键词推荐指数（优化版）"""
+    return _score_from_mask(keyword, KEYWORD_MATCHER.match(keyword))
+
+
+def detect_intent(keyword):
+    """检测意图标签（增强版）"""
+    return _intent_from_mask(KEYWORD_MATCHER.match(keyword))
+
+
+def analyze_keyword(keyword):
+    """一次扫描同时得到推荐指数和意图标签，返回 (score, intent)"""
+    mask = KEYWORD_MATCHER.match(keyword)
+    return _score_from_mask(keyword, mask), _intent_from_mask(mask)
+
+
+# 爆款标题模板: 意图标签 -> 模板列表（{keyword} 处填入关键词）
+TITLE_TEMPLATES = {
+    "疑问": [
+        "{keyword}？真相让人意外",
+        "医生不说，但{keyword}你必须知道",
+        "90%的人都不知道的{keyword}真相",
+        "{keyword}！看完这篇你就懂了",
+    ],
+    "功效": [
+        "{keyword}的5个神奇效果，第3个很多人不知道",
+        "坚持{keyword}，30天后身体的变化",
+        "为什么明星都在{keyword}？效果惊人",
+    ],
+    "副作用": [
+        "{keyword}的副作用，再不知道就晚了",
+        "别乱{keyword}！这3类人要注意",
+        "{keyword}的禁忌，很多人第一个就错了",
+    ],
+    "购买": [
+        "{keyword}排行榜TOP5，第1名没想到",
+        "买前必看！{keyword}避坑指南",
+        "{keyword}怎么选？内行人告诉你真相",
+    ],
+    "对比": [
+        "{keyword}：一文看懂区别",
+        "到底选哪个？{keyword}深度对比",
+        "别再纠结了！{keyword}选哪个最好",
+    ],
+    "食谱": [
+        "{keyword}大全，7天不重样",
+        "营养师的{keyword}秘诀",
+        "7天{keyword}计划，效果看得见",
+    ],
+    "通用": [
+        "{keyword}：新手完全指南",
+        "关于{keyword}，你需要知道的一切",
+        "{keyword}的正确打开方式",
+    ]
+}
+
+
+def generate_catchy_title(keyword, intent, rng=None):
+    """
+    生成爆款标题建议（优化版）
+
+    Args:
+        keyword: 关键词
+        intent: 意图标签
+        rng: 随机数生成器（默认使用全局 random，传入 keyword_rng 的结果可复现）
+    """
+    intent_key = intent.split("/")[0] if intent else "通用"
+    templates_list = TITLE_TEMPLATES.get(intent_key, TITLE_TEMPLATES["通用"])
+    return (rng or random).choice(templates_list).format(keyword=keyword)
+
+
+class _KeywordRandom:
+    """由 (种子, 关键词) 的哈希值决定的选择器（逐个构造 random.Random 的初始化开销太大）"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def choice(self, seq):
+        return seq[self.value % len(seq)]
+
+
+def keyword_rng(keyword, seed):
+    """按 (种子, 关键词) 生成独立的选择器，结果与分块方式和处理顺序无关"""
+    return _KeywordRandom(zlib.crc32(keyword.encode("utf-8"), seed & 0xFFFFFFFF))
+
+
+# 评分逻辑版本：修改计算方式（而不只是上面的规则表）时手动加一，使已缓存的分析结果失效
+SCORING_VERSION = 1
+
+
+def rules_fingerprint() -> str:
+    """评分/意图/标题规则的哈希，规则有任何变化都会改变"""
+    payload = json.dumps({
+        "version": SCORING_VERSION,
+        "score": SCORE_RULES,
+        "length": LENGTH_RULES,
+        "digit": [DIGIT_PATTERN.pattern, DIGIT_POINTS],
+        "intent": INTENT_RULES,
+        "titles": TITLE_TEMPLATES,
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# ==================== 批量评分 ====================
+def score_keywords_batch(keywords: Sequence[str]) -> pd.DataFrame:
+    """
+    批量计算推荐指数和意图标签，结果与逐个调用 analyze_keyword 完全一致
+
+    自动机扫描仍是每个关键词一次，其余（长度分级、数字检测、类别加分、意图拼接）
+    都是整列的数组运算；意图标签只对出现过的类别组合各拼接一次
+
+    Args:
+        keywords: 关键词列表
+
+    Returns:
+        DataFrame，索引为关键词，列为 score / intent / length
+    """
+    keywords = pd.Series(list(keywords), dtype=object)
+    n = len(keywords)
+
+    masks = np.fromiter((KEYWORD_MATCHER.match(kw) for kw in keywords), dtype=np.int64, count=n)
+
+    # 类别加分：(n × 类别数) 的命中矩阵乘以加分向量
+    score_bits = np.array([bit for bit, _ in SCORE_BITS], dtype=np.int64)
+    score_points = np.array([points for _, points in SCORE_BITS], dtype=np.int64)
+    scores = ((masks[:, None] & score_bits) != 0).astype(np.int64) @ score_points
+
+    # 长度分级
+    lengths = keywords.str.len().to_numpy(dtype=np.int64)
+    scores += np.select(
+        [lengths >= min_length for min_length, _ in LENGTH_RULES],
+        [points for _, points in LENGTH_RULES],
+        default=0
+    )
+
+    # 数字检测
+    scores += keywords.str.contains(DIGIT_PATTERN.pattern, regex=True).to_numpy(dtype=bool) * DIGIT_POINTS
+
+    # 意图标签：按意图类别组合去重后查表
+    intent_mask = 0
+    for bit, _ in INTENT_BITS:
+        intent_mask |= bit
+    combos, inverse = np.unique(masks & intent_mask, return_inverse=True)
+    labels = np.array([_intent_from_mask(int(combo)) for combo in combos], dtype=object)
+
+    return pd.DataFrame(
+        {"score": scores, "intent": labels[inverse.reshape(-1)], "length": lengths},
+        index=pd.Index(keywords, name="keyword")
+    )
+
+
+# ==================== 多进程分析 ====================
+# 关键词数达到该阈值才启用进程池（小数据量时进程启动开销大于收益）
+PARALLEL_THRESHOLD = 50000
+# 每个子进程任务处理的关键词数
+CHUNK_SIZE = 20000
+
+
+def analyze_chunk(keywords: Sequence[str], seed: int, with_titles: bool = True) -> pd.DataFrame:
+    """分析一批关键词：评分、意图、爆款标题（进程池任务，也用于单进程）"""
+    analysis = score_keywords_batch(keywords)
+    if not with_titles:
+        return analysis
+    analysis["catchy_title"] = [
+        generate_catchy_title(kw, intent, keyword_rng(kw, seed))
+        for kw, intent in zip(analysis.index, analysis["intent"])
+    ]
+    return analysis
+
+
+def analyze_keywords(keywords: Sequence[str], seed: Optional[int] = None,
+                     workers: Optional[int] = None,
+                     threshold: int = PARALLEL_THRESHOLD,
+                     chunk_size: int = CHUNK_SIZE,
+                     with_titles: bool = True) -> pd.DataFrame:
+    """
+    分析全部关键词，数据量大时分块交给进程池
+
+    Args:
+        keywords: 关键词列表
+        seed: 标题随机种子（None 表示随机选取）；同一种子下结果与是否并行、分块大小无关
+        workers: 进程数（None 表示CPU核数）
+        threshold: 启用进程池的最小关键词数
+        chunk_size: 每块的关键词数
+        with_titles: 是否生成爆款标题（标题也可之后用 keyword_rng(关键词, seed) 按需生成）
+
+    Returns:
+        DataFrame，索引为关键词（顺序与输入一致），列为 score / intent / length [/ catchy_title]
+    """
+    keywords = list(keywords)
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    workers = workers or os.cpu_count() or 1
+
+    if len(keywords) < threshold or workers <= 1:
+        return analyze_chunk(keywords, seed, with_titles)
+
+    chunks = [keywords[i:i + chunk_size] for i in range(0, len(keywords), chunk_size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        # map 按提交顺序返回，拼接结果与单进程完全一致
+        parts = list(executor.map(analyze_chunk, chunks, [seed] * len(chunks), [with_titles] * len(chunks)))
+    return pd.concat(parts)
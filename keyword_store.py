@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+紧凑的关键词记录存储
+每个关键词一个 __slots__ 记录：来源用位掩码表示、意图标签驻留（intern）共享、
+爆款标题按 (种子, 关键词) 按需生成，不再为每个关键词保存字典、来源列表和标题字符串
+"""
+
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from keyword_scoring import generate_catchy_title, keyword_rng
+
+# 已知数据源，按位编号（顺序即来源字符串中的拼接顺序）
+SOURCE_NAMES: List[str] = ["百度", "B站", "淘宝", "Google", "Bing", "备用生成"]
+SOURCE_BITS: Dict[str, int] = {name: 1 << i for i, name in enumerate(SOURCE_NAMES)}
+
+
+def source_bit(name: str) -> int:
+    """数据源对应的位，未知数据源自动分配新位"""
+    bit = SOURCE_BITS.get(name)
+    if bit is None:
+        bit = SOURCE_BITS[name] = 1 << len(SOURCE_NAMES)
+        SOURCE_NAMES.append(name)
+    return bit
+
+
+def source_names(mask: int) -> List[str]:
+    """位掩码 -> 数据源名称列表"""
+    return [name for name in SOURCE_NAMES if mask & SOURCE_BITS[name]]
+
+
+class KeywordRecord:
+    """单个关键词的分析结果"""
+
+    __slots__ = ("keyword", "source_mask", "score", "base_score", "intent", "title_seed")
+
+    # 支持 record["score"] 形式读取的字段（与旧版字典的键一致）
+    FIELDS = ("sources", "score", "intent", "catchy_title", "source")
+
+    def __init__(self, keyword: str, source_mask: int = 0):
+        self.keyword = keyword
+        self.source_mask = source_mask
+        self.score = 0
+        self.base_score = 0  # 规则分（不含趋势、来源等加分）
+        self.intent = ""
+        self.title_seed: Optional[int] = None
+
+    @property
+    def sources(self) -> List[str]:
+        """来源列表"""
+        return source_names(self.source_mask)
+
+    @property
+    def source(self) -> str:
+        """来源字符串，如 "百度+淘宝" """
+        return "+".join(self.sources)
+
+    @property
+    def catchy_title(self) -> str:
+        """爆款标题建议（未分析时为空）"""
+        if self.title_seed is None:
+            return ""
+        return generate_catchy_title(self.keyword, self.intent, keyword_rng(self.keyword, self.title_seed))
+
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self) -> dict:
+        """转换为字典（用于JSON输出）"""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class KeywordStore:
+    """关键词 -> KeywordRecord 的有序映射"""
+
+    def __init__(self):
+        self.records: Dict[str, KeywordRecord] = {}
+
+    def add(self, keyword: str, source: str) -> KeywordRecord:
+        """记录关键词来自某个数据源"""
+        record = self.records.get(keyword)
+        if record is None:
+            record = self.records[keyword] = KeywordRecord(keyword)
+        record.source_mask |= source_bit(source)
+        return record
+
+    def merge(self, keyword: str, into: str):
+        """删除关键词，把它的来源并入另一个关键词"""
+        record = self.records.pop(keyword)
+        self.records[into].source_mask |= record.source_mask
+
+    def set_analysis(self, keyword: str, score: int, intent: str, title_seed: int,
+                     base_score: Optional[int] = None):
+        """写入分析结果（意图标签驻留共享）；base_score 为不含加分的规则分，默认与 score 相同"""
+        record = self.records[keyword]
+        record.score = score
+        record.base_score = score if base_score is None else base_score
+        record.intent = sys.intern(intent)
+        record.title_seed = title_seed
+
+    def get(self, keyword: str, default=None) -> Optional[KeywordRecord]:
+        return self.records.get(keyword, default)
+
+    def __getitem__(self, keyword: str) -> KeywordRecord:
+        return self.records[keyword]
+
+    def __contains__(self, keyword) -> bool:
+        return keyword in self.records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.records)
+
+    def keys(self):
+        return self.records.keys()
+
+    def values(self):
+        return self.records.values()
+
+    def items(self) -> Iterator[Tuple[str, KeywordRecord]]:
+        return self.records.items()
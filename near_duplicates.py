@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+近似重复关键词聚类（MinHash + LSH）
+关键词先去掉不影响意图的虚字（的/啊/呀）、标点和空白得到"骨架"，"控糖饮食食谱"与"控糖饮食的食谱"的骨架相同；
+骨架按字符 n-gram 计算 MinHash 签名，签名分段（band）分桶，同桶的候选对再用精确 Jaccard 相似度确认，
+相似度达到阈值、且命中的评分/意图触发词完全相同的关键词并成一簇（"养生茶有用吗"不会并入"养生茶有用"）；每簇保留一个代表词，其余关键词的来源合并到代表词上
+"""
+
+import string
+import zlib
+from typing import Dict, List, Sequence, Set
+
+import numpy as np
+
+from keyword_scoring import KEYWORD_MATCHER
+
+# 骨架的 Jaccard 相似度达到该值才视为重复（字符二元组，"控糖饮食食谱推荐" 与 "控糖饮食食谱推荐表" 为 0.875）
+DEDUP_THRESHOLD = 0.8
+
+# 计算骨架时去掉的字符：不改变检索意图的虚字、标点和空白
+# （"吗""呢""吧"是疑问意图和评分的触发词，"和""还是"会改变意图，都不在其中）
+FILLER_CHARS = "的啊呀"
+PUNCTUATION_CHARS = string.punctuation + "，。！？、；：“”‘’（）《》【】…—·～ \t"
+SKELETON_TABLE = str.maketrans("", "", FILLER_CHARS + PUNCTUATION_CHARS)
+NGRAM = 2
+NUM_PERM = 64
+BANDS = 16
+
+# 同一个桶里超过该数量的关键词只与相邻成员比较，避免平方级比较
+MAX_BUCKET_PAIRS = 50
+
+# 每批计算签名的关键词数（控制中间矩阵的内存）
+SIGNATURE_CHUNK = 20000
+
+# 哈希函数 (a*x + b) mod P，P 为大于 2^32 的素数；a、x < 2^32 时乘积不会溢出 uint64
+_PRIME = np.uint64(4294967311)
+
+
+class NearDuplicateClusterer:
+    """MinHash/LSH 近似重复聚类器"""
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, ngram: int = NGRAM,
+                 num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1):
+        """
+        Args:
+            threshold: 骨架的精确 Jaccard 相似度阈值
+            ngram: 字符 n-gram 长度
+            num_perm: MinHash 签名长度
+            bands: LSH 分段数（num_perm 必须能被整除）
+            seed: 哈希函数的随机种子
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm}) 必须能被 bands({bands}) 整除")
+        self.threshold = threshold
+        self.ngram = ngram
+        self.num_perm = num_perm
+        self.bands = bands
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+    @staticmethod
+    def skeleton(keyword: str) -> str:
+        """去掉助词、标点和空白后的关键词（全部被去掉时保留原词）"""
+        return keyword.translate(SKELETON_TABLE) or keyword
+
+    def shingles(self, keyword: str) -> Set[str]:
+        """字符 n-gram 集合（比 n 短的关键词整体作为一个 n-gram）"""
+        n = self.ngram
+        if len(keyword) <= n:
+            return {keyword}
+        return {keyword[i:i + n] for i in range(len(keyword) - n + 1)}
+
+    def signatures(self, shingle_sets: Sequence[Set[str]]) -> np.ndarray:
+        """每个关键词一行 MinHash 签名 (n, num_perm)"""
+        signatures = np.empty((len(shingle_sets), self.num_perm), dtype=np.uint64)
+        for start in range(0, len(shingle_sets), SIGNATURE_CHUNK):
+            chunk = shingle_sets[start:start + SIGNATURE_CHUNK]
+            lengths = np.fromiter((len(s) for s in chunk), dtype=np.int64, count=len(chunk))
+            hashes = np.fromiter((zlib.crc32(sh.encode("utf-8")) for s in chunk for sh in s),
+                                 dtype=np.uint64, count=int(lengths.sum()))
+            permuted = (hashes[:, None] * self.a + self.b) % _PRIME
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            signatures[start:start + len(chunk)] = np.minimum.reduceat(permuted, offsets, axis=0)
+        return signatures
+
+    def _candidate_buckets(self, signatures: np.ndarray):
+        """逐个 band 分桶，产出成员数大于1的桶（关键词下标数组）"""
+        rows = self.num_perm // self.bands
+        for band in range(self.bands):
+            block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+            keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+            _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+            # 只处理成员数大于1的桶：按桶编号排序后在编号变化处切开
+            members = np.nonzero(counts[inverse] > 1)[0]
+            if not len(members):
+                continue
+            bucket_ids = inverse[members]
+            order = np.argsort(bucket_ids, kind="stable")
+            members, bucket_ids = members[order], bucket_ids[order]
+            boundaries = np.nonzero(np.diff(bucket_ids))[0] + 1
+            for bucket in np.split(members, boundaries):
+                yield bucket.tolist()
+
+    def clusters(self, keywords: Sequence[str]) -> List[List[int]]:
+        """
+        聚类
+
+        Args:
+            keywords: 关键词列表
+
+        Returns:
+            成员数大于1的簇（关键词下标列表，按下标升序）
+        """
+        if len(keywords) < 2:
+            return []
+        shingle_sets = [self.shingles(self.skeleton(kw)) for kw in keywords]
+        # 触发词不同的关键词评分和意图不同，即使字面相近也不合并
+        masks = [KEYWORD_MATCHER.match(kw) for kw in keywords]
+        parent = list(range(len(keywords)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        checked = set()
+        merged = set()
+        for bucket in self._candidate_buckets(self.signatures(shingle_sets)):
+            if len(bucket) <= MAX_BUCKET_PAIRS:
+                pairs = ((x, y) for i, x in enumerate(bucket) for y in bucket[i + 1:])
+            else:
+                pairs = zip(bucket, bucket[1:])
+            for x, y in pairs:
+                root_x, root_y = find(x), find(y)
+                if root_x == root_y or (x, y) in checked:
+                    continue
+                checked.add((x, y))
+                if masks[x] != masks[y]:
+                    continue
+                a, b = shingle_sets[x], shingle_sets[y]
+                if len(a & b) >= self.threshold * len(a | b):
+                    parent[max(root_x, root_y)] = min(root_x, root_y)
+                    merged.update((x, y))
+
+        groups: Dict[int, List[int]] = {}
+        for i in sorted(merged):
+            groups.setdefault(find(i), []).append(i)
+        return list(groups.values())
+
+
+def collapse_near_duplicates(store, clusterer: NearDuplicateClusterer = None) -> int:
+    """
+    合并关键词表中的近似重复关键词
+
+    每簇保留来源最多的关键词（同样多时保留最先发现的），其余关键词的来源并入代表词后删除
+
+    Args:
+        store: KeywordStore
+        clusterer: 聚类器，默认使用默认参数
+
+    Returns:
+        删除的关键词数
+    """
+    clusterer = clusterer or NearDuplicateClusterer()
+    keywords = list(store)
+    removed = 0
+    for members in clusterer.clusters(keywords):
+        canonical = min(members, key=lambda i: (-len(store[keywords[i]].sources), i))
+        for i in members:
+            if i != canonical:
+                store.merge(keywords[i], keywords[canonical])
+                removed += 1
+    return removed
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按主机限速模块
+每个主机一个令牌桶（每秒请求数 + 突发量），根据响应情况自适应调整：
+遇到 429/5xx/超时 时减半速率，连续健康响应后逐步恢复到配置上限
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 视为"被限流/服务过载"的状态码（与 urllib3 Retry 的 status_forcelist 一致）
+THROTTLE_STATUS = (429, 500, 502, 503, 504)
+
+# 未单独配置的主机使用的默认限速 (每秒请求数, 突发量)
+DEFAULT_RATE_LIMIT = (0.5, 1)
+
+# 速率下限占配置速率的比例，避免被连续惩罚后几乎停止
+MIN_RATE_RATIO = 0.05
+
+# 连续多少次健康响应后提升一次速率，以及每次提升的比例（占配置速率）
+RECOVER_AFTER = 5
+RECOVER_STEP = 0.1
+
+
+class TokenBucket:
+    """线程安全的令牌桶"""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate: 每秒补充的令牌数（即每秒请求数上限）
+            burst: 桶容量（允许的突发请求数）
+        """
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.healthy_streak = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        预订一个令牌
+
+        Returns:
+            需要等待的秒数（0 表示可以立即请求）
+        """
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            # 令牌可以透支，后来的请求自然排在更后面
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def penalize(self):
+        """被限流/超时：速率减半"""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.max_rate * MIN_RATE_RATIO, self.rate * 0.5)
+            self.healthy_streak = 0
+
+    def reward(self):
+        """健康响应：累计一定次数后逐步恢复速率"""
+        with self.lock:
+            self.healthy_streak += 1
+            if self.healthy_streak >= RECOVER_AFTER and self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVER_STEP)
+                self.healthy_streak = 0
+
+
+class HostRateLimiter:
+    """按主机划分的自适应限速器"""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default: Tuple[float, int] = DEFAULT_RATE_LIMIT):
+        """
+        Args:
+            limits: 主机 -> (每秒请求数, 突发量)
+            default: 未配置主机使用的限速
+        """
+        self.limits = dict(limits or {})
+        self.default = default
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """从URL中提取主机名"""
+        return urlparse(url).hostname or url
+
+    def configure(self, host: str, rate: float, burst: int):
+        """设置某个主机的限速（已存在的令牌桶不受影响）"""
+        with self.lock:
+            self.limits.setdefault(host, (rate, burst))
+
+    def bucket(self, host: str) -> TokenBucket:
+        """获取主机对应的令牌桶"""
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                rate, burst = self.limits.get(host, self.default)
+                bucket = self.buckets[host] = TokenBucket(rate, burst)
+            return bucket
+
+    def acquire(self, host: str) -> float:
+        """阻塞直到可以向该主机发起请求，返回实际等待的秒数"""
+        wait = self.bucket(host).reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, host: str) -> float:
+        """acquire 的异步版本"""
+        wait = self.bucket(host).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record(self, host: str, status: Optional[int] = None, throttled: bool = False):
+        """
+        记录一次请求结果，用于自适应调整速率
+
+        Args:
+            host: 主机名
+            status: HTTP 状态码（无响应时为 None）
+            throttled: 是否超时或重试耗尽（无状态码但应视为限流）
+        """
+        bucket = self.bucket(host)
+        if throttled or status in THROTTLE_STATUS:
+            bucket.penalize()
+            logger.debug(f"  🐢 {host}: 降速至 {bucket.rate:.2f} 次/秒")
+        elif status is not None and status < 400:
+            bucket.reward()
+
+
+# 进程内共享的限速器：同一主机的所有抓取器共用一个令牌桶
+default_limiter = HostRateLimiter()
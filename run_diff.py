@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行间差异
+对比最近两次运行的关键词快照：新增、消失、规则分或来源变化的关键词。
+推荐指数里含有只对单次运行有效的趋势加分和来源加分，"变化"按不含加分的规则分判断；
+上一次的快照按关键词编号建哈希表，本次的关键词逐个查表，整体 O(n)
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from snapshot_store import SnapshotStore
+
+
+def _source_labels(columns: Dict[str, np.ndarray]):
+    """每行的 (来源集合, 来源字符串)；同一位掩码只拼一次"""
+    names = columns["source_names"].tolist()
+    unique_masks, codes = np.unique(columns["source_mask"], return_inverse=True)
+    labels = []
+    for mask in unique_masks.tolist():
+        selected = [name for i, name in enumerate(names) if mask >> i & 1]
+        labels.append((frozenset(selected), "+".join(selected)))
+    return [labels[code] for code in codes.tolist()]
+
+
+def diff_snapshots(store: SnapshotStore, previous: Dict[str, np.ndarray],
+                   current: Dict[str, np.ndarray]) -> dict:
+    """
+    对比两个快照
+
+    Args:
+        store: 快照存储（用于把关键词编号还原为关键词）
+        previous: 上一次运行的快照列（SnapshotStore.read() 的结果）
+        current: 本次运行的快照列
+
+    Returns:
+        {"new": [...], "dropped": [...], "changed": [...], "counts": {...}}，
+        各列表按推荐指数（变化列表按规则分变化幅度）从高到低排列；
+        变化的关键词同时给出规则分（old_base_score / base_score）和推荐指数（old_score / score）
+    """
+    keywords = store.keywords
+    before = {
+        keyword_id: (base_score, score, sources)
+        for keyword_id, base_score, score, sources in zip(
+            previous["keyword_id"].tolist(), previous["base_score"].tolist(), previous["score"].tolist(),
+            _source_labels(previous))
+    }
+
+    new, changed = [], []
+    for keyword_id, base_score, score, (source_set, source) in zip(
+            current["keyword_id"].tolist(), current["base_score"].tolist(), current["score"].tolist(),
+            _source_labels(current)):
+        old = before.pop(keyword_id, None)
+        if old is None:
+            new.append({"keyword": keywords[keyword_id], "score": score, "source": source})
+            continue
+        old_base_score, old_score, (old_set, old_source) = old
+        if old_base_score != base_score or old_set != source_set:
+            changed.append({"keyword": keywords[keyword_id],
+                            "old_base_score": old_base_score, "base_score": base_score,
+                            "old_score": old_score, "score": score,
+                            "old_source": old_source, "source": source})
+
+    # 剩下的就是本次没有出现的关键词
+    dropped = [{"keyword": keywords[keyword_id], "score": score, "source": source}
+               for keyword_id, (_, score, (_, source)) in before.items()]
+
+    new.sort(key=lambda row: -row["score"])
+    dropped.sort(key=lambda row: -row["score"])
+    changed.sort(key=lambda row: -abs(row["base_score"] - row["old_base_score"]))
+    return {
+        "counts": {"new": len(new), "dropped": len(dropped), "changed": len(changed)},
+        "new": new,
+        "dropped": dropped,
+        "changed": changed,
+    }
+
+
+def diff_latest(store: SnapshotStore) -> Optional[dict]:
+    """
+    对比最近两次运行
+
+    Returns:
+        差异（含 previous_run / current_run 时间）；快照不足两次返回None
+    """
+    runs = store.list_runs()
+    if len(runs) < 2:
+        return None
+
+    (previous_at, previous_path), (current_at, current_path) = runs[-2:]
+    diff = diff_snapshots(store, store.read(previous_path), store.read(current_path))
+    return {
+        "previous_run": previous_at.isoformat(),
+        "current_run": current_at.isoformat(),
+        **diff,
+    }
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键词全量快照（列式存储）
+每次运行把完整的关键词表（关键词、来源、推荐指数、意图）保存为一个压缩的 .npz 文件：
+关键词字符串只在全局字典文件里存一次，快照中只有整数列（关键词编号、来源位掩码、推荐指数、规则分、意图编码），
+按日期范围加载时整列拼接，不逐行解析
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows 没有 flock，只能依赖多次运行不重叠
+    fcntl = None
+
+SNAPSHOT_DIR = "history/snapshots"
+
+# 全局关键词字典：每行一个 JSON 字符串，行号即关键词编号（只追加；读尾和追加都在文件锁内进行）
+DICTIONARY_FILE = "keywords.jsonl"
+
+SNAPSHOT_TIME_FORMAT = "%Y%m%d_%H%M%S"
+
+
+class SnapshotStore:
+    """按运行保存的关键词全量快照"""
+
+    def __init__(self, directory: str = SNAPSHOT_DIR):
+        """
+        Args:
+            directory: 快照目录（关键词字典也放在这里）
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dictionary_path = self.directory / DICTIONARY_FILE
+        self.keywords: List[str] = []
+        self.ids: Dict[str, int] = {}
+        # load() 结果中 source_mask 各位对应的数据源
+        self.source_names: List[str] = []
+        # 已读入的字典字节数（其他进程追加的内容从这里开始读）
+        self._dictionary_size = 0
+        self.refresh()
+
+    @contextmanager
+    def _locked_dictionary(self):
+        """打开字典文件并加排他锁：同时运行的多个进程串行地读尾、追加"""
+        with open(self.dictionary_path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            yield f  # 关闭文件即释放锁
+
+    def _read_tail(self, f):
+        """读入上次之后追加的行（须持有锁）；末尾的半行是中断的写入，快照不会引用它，截掉"""
+        f.seek(self._dictionary_size)
+        data = f.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) != len(data):
+            f.truncate(self._dictionary_size + len(complete))
+
+        for line in complete.decode("utf-8").split("\n")[:-1]:
+            keyword = json.loads(line)
+            self.ids[keyword] = len(self.keywords)
+            self.keywords.append(keyword)
+        self._dictionary_size += len(complete)
+
+    def refresh(self):
+        """读入其他进程追加到字典中的关键词"""
+        if not self.dictionary_path.exists():
+            return
+        with self._locked_dictionary() as f:
+            self._read_tail(f)
+
+    def _encode_keywords(self, keywords: List[str]) -> np.ndarray:
+        """关键词 -> 全局编号；新关键词在文件锁内先读入他人追加的行，再按真实行号追加"""
+        unique = list(dict.fromkeys(keywords))
+        if any(kw not in self.ids for kw in unique):
+            with self._locked_dictionary() as f:
+                self._read_tail(f)
+                new = [kw for kw in unique if kw not in self.ids]
+                if new:
+                    data = "".join(json.dumps(kw, ensure_ascii=False) + "\n" for kw in new).encode("utf-8")
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    for kw in new:
+                        self.ids[kw] = len(self.keywords)
+                        self.keywords.append(kw)
+                    self._dictionary_size += len(data)
+        return np.fromiter((self.ids[kw] for kw in keywords), dtype=np.uint32, count=len(keywords))
+
+    def path_for(self, run_at: datetime) -> Path:
+        return self.directory / f"snapshot_{run_at.strftime(SNAPSHOT_TIME_FORMAT)}.npz"
+
+    def save(self, run_at: datetime, rows: Iterable[Tuple[str, int, int, int, str]],
+             source_names: List[str]) -> Path:
+        """
+        保存一次运行的完整关键词表
+
+        Args:
+            run_at: 运行时间
+            rows: (关键词, 来源位掩码, 推荐指数, 规则分(不含加分), 意图标签)
+            source_names: 位掩码中第 i 位对应的数据源名称
+
+        Returns:
+            快照文件路径
+        """
+        keywords, masks, scores, base_scores, intents = [], [], [], [], []
+        for keyword, mask, score, base_score, intent in rows:
+            keywords.append(keyword)
+            masks.append(mask)
+            scores.append(score)
+            base_scores.append(base_score)
+            intents.append(intent)
+
+        intent_names, intent_codes = np.unique(np.array(intents, dtype=object), return_inverse=True)
+        columns = {
+            "keyword_id": self._encode_keywords(keywords),
+            "source_mask": np.array(masks, dtype=np.uint32),
+            "score": np.array(scores, dtype=np.int16),
+            "base_score": np.array(base_scores, dtype=np.int16),
+            "intent_code": intent_codes.astype(np.uint16),
+            "intent_names": np.array(intent_names.tolist(), dtype=str),
+            "source_names": np.array(source_names, dtype=str),
+        }
+
+        # 先写临时文件再替换，中断时不会留下半个快照
+        path = self.path_for(run_at)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **columns)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return path
+
+    def list_runs(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Tuple[datetime, Path]]:
+        """时间范围 [start, end) 内的快照（按时间排列），只看文件名不读内容"""
+        runs = []
+        for path in self.directory.glob("snapshot_*.npz"):
+            try:
+                run_at = datetime.strptime(path.stem[len("snapshot_"):], SNAPSHOT_TIME_FORMAT)
+            except ValueError:
+                continue
+            if (start is None or run_at >= start) and (end is None or run_at < end):
+                runs.append((run_at, path))
+        return sorted(runs)
+
+    def read(self, path) -> Dict[str, np.ndarray]:
+        """
+        读取单个快照的全部列（keyword_id / source_mask / score / base_score / intent_code / intent_names / source_names）
+
+        早期快照没有 base_score 列，用 score 代替
+        """
+        with np.load(path) as data:
+            columns = {name: data[name] for name in data.files}
+        columns.setdefault("base_score", columns["score"])
+        if len(columns["keyword_id"]) and int(columns["keyword_id"].max()) >= len(self.keywords):
+            self.refresh()  # 快照由其他进程写入，引用了之后才追加的关键词
+        return columns
+
+    def load(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        加载时间范围 [start, end) 内的全部快照
+
+        Returns:
+            DataFrame，列为 run_at / keyword / source_mask / source / score / base_score / intent；
+            source_mask 的位按 self.source_names 编号（各快照的位掩码已统一换算）
+        """
+        runs = self.list_runs(start, end)
+        self.source_names = []
+        parts = {"run_at": [], "keyword_id": [], "source_mask": [], "score": [], "base_score": [], "intent": []}
+        intent_ids: Dict[str, int] = {}
+
+        for run_at, path in runs:
+            with np.load(path) as data:
+                count = len(data["keyword_id"])
+                parts["run_at"].append(np.full(count, np.datetime64(run_at, "s")))
+                parts["keyword_id"].append(data["keyword_id"])
+                parts["score"].append(data["score"])
+                parts["base_score"].append(data["base_score"] if "base_score" in data.files else data["score"])
+                parts["source_mask"].append(self._remap_sources(data["source_mask"], data["source_names"].tolist()))
+
+                # 各快照的意图编码换算成统一编码
+                lookup = np.array([intent_ids.setdefault(name, len(intent_ids)) for name in data["intent_names"].tolist()],
+                                  dtype=np.uint16)
+                parts["intent"].append(lookup[data["intent_code"]] if len(lookup) else data["intent_code"])
+
+        if not runs:
+            return pd.DataFrame({
+                "run_at": pd.Series(dtype="datetime64[s]"), "keyword": pd.Series(dtype=object),
+                "source_mask": pd.Series(dtype=np.uint32), "source": pd.Series(dtype=object),
+                "score": pd.Series(dtype=np.int16), "base_score": pd.Series(dtype=np.int16),
+                "intent": pd.Categorical([]),
+            })
+
+        keyword_ids = np.concatenate(parts["keyword_id"])
+        if len(keyword_ids) and int(keyword_ids.max()) >= len(self.keywords):
+            self.refresh()
+        source_mask = np.concatenate(parts["source_mask"])
+        keyword_table = np.array(self.keywords, dtype=object)
+
+        # 来源字符串按不同的位掩码各拼一次，再整列映射
+        unique_masks, mask_codes = np.unique(source_mask, return_inverse=True)
+        labels = np.array(["+".join(name for i, name in enumerate(self.source_names) if int(mask) >> i & 1)
+                           for mask in unique_masks], dtype=object)
+
+        return pd.DataFrame({
+            "run_at": np.concatenate(parts["run_at"]),
+            "keyword": keyword_table[keyword_ids],
+            "source_mask": source_mask,
+            "source": labels[mask_codes],
+            "score": np.concatenate(parts["score"]),
+            "base_score": np.concatenate(parts["base_score"]),
+            "intent": pd.Categorical.from_codes(np.concatenate(parts["intent"]).astype(np.int32), list(intent_ids)),
+        })
+
+    def _remap_sources(self, masks: np.ndarray, names: List[str]) -> np.ndarray:
+        """快照自己的来源位 -> self.source_names 中的位"""
+        positions = []
+        for name in names:
+            if name not in self.source_names:
+                self.source_names.append(name)
+            positions.append(self.source_names.index(name))
+        if positions == list(range(len(positions))):
+            return masks
+
+        remapped = np.zeros_like(masks)
+        for bit, position in enumerate(positions):
+            remapped |= ((masks >> np.uint32(bit)) & np.uint32(1)) << np.uint32(position)
+        return remapped
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据源加权
+每个关键词记录的来源位掩码就是 关键词 -> 来源集合 的倒排索引；
+按配置的各数据源权重和跨数据源权重给关键词加分，同一个位掩码的加分只计算一次
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+
+from keyword_store import source_names
+
+logger = logging.getLogger(__name__)
+
+# config.json 中的配置段
+CONFIG_SECTION = "source_weighting"
+
+DEFAULT_SOURCE_WEIGHTS: Dict[str, float] = {}
+DEFAULT_CROSS_SOURCE_WEIGHT = 1.0   # 每多一个数据源的加分
+DEFAULT_MAX_BONUS = 3               # 加分上限（扣分下限为其相反数）
+
+
+class SourceWeighting:
+    """来源加分规则"""
+
+    def __init__(self, source_weights: Optional[Dict[str, float]] = None,
+                 cross_source_weight: float = DEFAULT_CROSS_SOURCE_WEIGHT,
+                 max_bonus: int = DEFAULT_MAX_BONUS):
+        """
+        Args:
+            source_weights: 数据源名称 -> 加分（可为负数，未列出的数据源为0）
+            cross_source_weight: 关键词每多出现在一个数据源的加分
+            max_bonus: 加分的绝对值上限
+        """
+        self.source_weights = dict(DEFAULT_SOURCE_WEIGHTS if source_weights is None else source_weights)
+        self.cross_source_weight = cross_source_weight
+        self.max_bonus = max_bonus
+        self._bonus_by_mask: Dict[int, int] = {}
+
+    @classmethod
+    def from_config(cls, path) -> "SourceWeighting":
+        """
+        从 config.json 的 source_weighting 段读取规则；文件或配置段不存在时使用默认值
+
+        Args:
+            path: 配置文件路径
+        """
+        section = {}
+        path = Path(path)
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    section = json.load(f).get(CONFIG_SECTION) or {}
+                if not isinstance(section, dict):
+                    raise ValueError(f"{CONFIG_SECTION} 应为对象，实际为 {type(section).__name__}")
+            except (OSError, ValueError, AttributeError) as e:
+                logger.warning(f"⚠️  配置文件读取失败，数据源加权使用默认值: {e}")
+                section = {}
+        return cls(
+            source_weights=section.get("source_weights"),
+            cross_source_weight=section.get("cross_source_weight", DEFAULT_CROSS_SOURCE_WEIGHT),
+            max_bonus=section.get("max_bonus", DEFAULT_MAX_BONUS),
+        )
+
+    def bonus(self, source_mask: int) -> int:
+        """来源位掩码对应的加分（四舍五入为整数并限制在 ±max_bonus 内）"""
+        bonus = self._bonus_by_mask.get(source_mask)
+        if bonus is None:
+            names = source_names(source_mask)
+            total = sum(self.source_weights.get(name, 0) for name in names)
+            total += self.cross_source_weight * max(len(names) - 1, 0)
+            bonus = self._bonus_by_mask[source_mask] = max(-self.max_bonus, min(self.max_bonus, round(total)))
+        return bonus
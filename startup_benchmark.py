@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动耗时基准
+在全新的解释器中导入各模块，测量导入耗时（取多次运行的中位数），并检查导入后没有加载绘图库等重依赖；
+超出预算或加载了不该加载的模块时以非零状态退出
+
+用法: python startup_benchmark.py [--runs 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# 各模块的导入耗时预算（毫秒）
+STARTUP_BUDGETS_MS = {
+    "health_hot_seo_hunter": 800,
+    "charts": 400,
+}
+
+# 导入以上模块时不应加载的重依赖（只在生成图表时才需要）
+FORBIDDEN_MODULES = ("matplotlib", "seaborn", "wordcloud", "bs4")
+
+RUNS = 5
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+loaded = sorted({{name.split(".")[0] for name in sys.modules}} & set({forbidden!r}))
+print(json.dumps({{"ms": elapsed, "loaded": loaded}}))
+"""
+
+
+def measure(module, runs=RUNS):
+    """
+    在新解释器中导入模块
+
+    Args:
+        module: 模块名
+        runs: 运行次数
+
+    Returns:
+        (导入耗时中位数(毫秒), 加载了的重依赖列表)
+    """
+    timings, loaded = [], set()
+    code = PROBE.format(module=module, forbidden=FORBIDDEN_MODULES)
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent,
+                                capture_output=True, text=True, check=True)
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(probe["ms"])
+        loaded.update(probe["loaded"])
+    return statistics.median(timings), sorted(loaded)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="检查模块导入耗时是否在预算内")
+    parser.add_argument("--runs", type=int, default=RUNS, help="每个模块的测量次数（取中位数）")
+    args = parser.parse_args(argv)
+
+    failed = False
+    print("⏱️  启动耗时基准")
+    print("-" * 60)
+    for module, budget in STARTUP_BUDGETS_MS.items():
+        elapsed, loaded = measure(module, args.runs)
+        ok = elapsed <= budget and not loaded
+        failed |= not ok
+        print(f"{'✅' if ok else '❌'} {module:<24} {elapsed:7.0f} ms / 预算 {budget} ms")
+        if loaded:
+            print(f"   ⚠️  导入时加载了重依赖: {', '.join(loaded)}")
+    print("-" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
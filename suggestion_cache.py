@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索建议本地缓存模块
+按 (数据源, 关键词) 缓存 fetch_suggestions / fetch_hot_topics 的结果：
+每个数据源独立的TTL、条目数上限 + LRU淘汰、原子写入（多个进程同时运行不会损坏文件）
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = "cache/suggestions.json"
+CACHE_VERSION = 1
+
+# 默认TTL（秒）：搜索建议变化慢，热榜变化快
+SUGGEST_TTL = 6 * 3600
+HOT_TTL = 10 * 60
+
+# 默认最多缓存的条目数
+MAX_ENTRIES = 50000
+
+
+def atomic_write_json(path, data):
+    """写入临时文件后用 os.replace 替换，任何时刻磁盘上的文件都是完整的"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class SuggestionCache:
+    """带TTL和LRU淘汰的持久化缓存"""
+
+    def __init__(self, path: str = CACHE_FILE, max_entries: int = MAX_ENTRIES):
+        """
+        初始化缓存并加载磁盘上的已有数据
+
+        Args:
+            path: 缓存文件路径
+            max_entries: 最多保留的条目数，超出时淘汰最久未使用的条目
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.lock = threading.Lock()
+        self.entries = self._load()
+
+    @staticmethod
+    def _key(source: str, keyword: str) -> str:
+        return f"{source}\t{keyword}"
+
+    def _load(self) -> "OrderedDict[str, dict]":
+        """读取缓存文件，按最近使用时间排序（最近使用的在末尾）"""
+        if not self.path.exists():
+            return OrderedDict()
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  缓存文件读取失败，已忽略: {e}")
+            return OrderedDict()
+
+        if data.get("version") != CACHE_VERSION:
+            return OrderedDict()
+
+        entries = data.get("entries", {})
+        return OrderedDict(sorted(entries.items(), key=lambda item: item[1].get("used", 0)))
+
+    def get(self, source: str, keyword: str = "") -> Optional[List[str]]:
+        """
+        读取缓存
+
+        Returns:
+            未过期的结果列表；未命中或已过期返回None
+        """
+        key = self._key(source, keyword)
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry["expires"] <= now:
+                self.misses += 1
+                return None
+
+            entry["used"] = now
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self.dirty = True
+            return list(entry["items"])
+
+    def set(self, source: str, keyword: str, items: List[str], ttl: float):
+        """写入缓存（仅在内存中，调用 save 落盘）"""
+        key = self._key(source, keyword)
+        now = time.time()
+        with self.lock:
+            self.entries[key] = {"items": list(items), "expires": now + ttl, "used": now}
+            self.entries.move_to_end(key)
+            self._evict()
+            self.dirty = True
+
+    def _evict(self):
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self):
+        """
+        原子写入磁盘
+
+        先与磁盘上的最新内容合并（保留其他进程写入的条目），再整体替换缓存文件
+        """
+        with self.lock:
+            if not self.dirty:
+                return
+
+            now = time.time()
+            merged = self._load()
+            for key, entry in self.entries.items():
+                other = merged.get(key)
+                if other is None or other.get("used", 0) <= entry["used"]:
+                    merged[key] = entry
+            merged = OrderedDict(sorted(
+                ((key, entry) for key, entry in merged.items() if entry["expires"] > now),
+                key=lambda item: item[1]["used"]
+            ))
+            self.entries = merged
+            self._evict()
+
+            atomic_write_json(self.path, {"version": CACHE_VERSION, "entries": self.entries})
+            self.dirty = False
+
+    def stats(self) -> dict:
+        """命中统计"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""测试配置：项目模块都在仓库根目录下（扁平结构），加入导入路径"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
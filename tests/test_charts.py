@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""图表数据汇总测试（不渲染图片）"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from charts import KeywordVisualizer
+
+
+def keyword_rows(scores):
+    return [(f"kw{i}", {"score": score, "intent": "疑问/购买" if i % 2 else "", "source": "百度"})
+            for i, score in enumerate(scores)]
+
+
+def test_aggregate_single_pass():
+    aggregates = KeywordVisualizer.aggregate(keyword_rows([9, 7, 5, 3]))
+
+    assert aggregates["scores"].tolist() == [9, 7, 5, 3]
+    assert aggregates["intent_counts"] == {"通用": 2, "疑问": 2}
+    assert aggregates["source_counts"] == {"百度": 4}
+    assert aggregates["top_keywords"] == [("kw0", 9), ("kw1", 7), ("kw2", 5), ("kw3", 3)]
+    assert aggregates["word_freq"] == {"kw0": 9, "kw1": 7, "kw2": 5, "kw3": 3}
+
+
+def test_mutated_input_is_reaggregated(tmp_path):
+    visualizer = KeywordVisualizer(str(tmp_path / "charts"))
+    rendered = []
+    visualizer._render = lambda jobs: rendered.append({name: payload for name, _, payload in jobs}) or [
+        (tmp_path / f"{i}.png", False) for i in range(len(jobs))]
+    history_db = str(tmp_path / "history.db")
+
+    data = keyword_rows([9, 7])
+    visualizer.generate_all_charts(data, history_db=history_db)
+    data.append(("kw_new", {"score": 10, "intent": "功效", "source": "B站"}))
+    visualizer.generate_all_charts(data, history_db=history_db)
+
+    first, second = rendered
+    assert np.array_equal(first["评分分布图"]["scores"], [9, 7])
+    assert np.array_equal(second["评分分布图"]["scores"], [9, 7, 10])
+    assert second["数据源分布图"]["source_counts"] == {"百度": 2, "B站": 1}
+    assert visualizer._aggregates is None
+    # 单独生成图表时按当前数据汇总
+    assert visualizer._score_payload(data[:1])["scores"].tolist() == [9]
+
+
+def crash_in_worker(output_dir, parent, name):
+    """在工作进程中直接退出（模拟渲染进程崩溃），在主进程中正常写出文件"""
+    if os.getpid() != parent:
+        os._exit(1)
+    path = Path(output_dir) / f"{name}.txt"
+    path.write_text(name, encoding="utf-8")
+    return path
+
+
+def fail_to_render(output_dir, parent, name):
+    raise ValueError(name)
+
+
+def test_broken_pool_falls_back_to_serial(tmp_path, capsys):
+    visualizer = KeywordVisualizer(str(tmp_path), workers=2)
+    jobs = [("a", crash_in_worker, {"parent": os.getpid(), "name": "a"}),
+            ("b", crash_in_worker, {"parent": os.getpid(), "name": "b"}),
+            ("c", fail_to_render, {"parent": os.getpid(), "name": "c"})]
+
+    results = visualizer._render_pending(jobs)
+
+    assert results[:2] == [tmp_path / "a.txt", tmp_path / "b.txt"]
+    assert isinstance(results[2], ValueError)
+    assert "逐个渲染" in capsys.readouterr().out
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""并发抓取调度器测试"""
+
+import threading
+
+from fetch_scheduler import ConcurrentFetchScheduler, budget_jobs
+
+
+def test_budget_is_shared_round_robin():
+    jobs = {"百度": list("abcdefgh"), "B站": list("xy"), "淘宝": []}
+
+    assert budget_jobs(jobs, 6) == {"百度": list("abcd"), "B站": list("xy"), "淘宝": []}
+    assert budget_jobs(jobs, 3) == {"百度": list("ab"), "B站": list("x"), "淘宝": []}
+    assert budget_jobs(jobs, 100) == jobs
+    assert budget_jobs(jobs, 0) == {"百度": [], "B站": [], "淘宝": []}
+
+
+def test_source_skipped_after_consecutive_misses():
+    queried = []
+    lock = threading.Lock()
+
+    def recorder(source, fetch):
+        def run(keyword):
+            with lock:
+                queried.append((source, keyword))
+            return fetch(keyword)
+        return run
+
+    def failing(keyword):
+        raise OSError("连接失败")
+
+    scheduler = ConcurrentFetchScheduler({
+        "坏": recorder("坏", failing),
+        "空": recorder("空", lambda keyword: [] if keyword != "k1" else [keyword + "x"]),
+        "好": recorder("好", lambda keyword: [keyword + "!"]),
+    })
+    jobs = {source: [f"k{i}" for i in range(10)] for source in scheduler.sources}
+
+    rows = scheduler.run_jobs(jobs, max_misses=3)
+
+    assert [kw for source, kw in queried if source == "坏"] == ["k0", "k1", "k2"]
+    # 中间有一次命中，连续无结果的计数重新开始
+    assert [kw for source, kw in queried if source == "空"] == ["k0", "k1", "k2", "k3", "k4"]
+    assert scheduler.skipped == {"坏": 7, "空": 5}
+    assert len(rows) == 30
+    assert [items for kw, source, items in rows if source == "好"] == [[f"k{i}!"] for i in range(10)]
+
+
+def test_no_skipping_by_default():
+    scheduler = ConcurrentFetchScheduler({"空": lambda keyword: []})
+    scheduler.run_jobs({"空": ["a", "b", "c", "d"]})
+    assert scheduler.skipped == {}
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""历史数据库测试"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from history_store import HistoryStore
+
+T0 = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def store(tmp_path):
+    with HistoryStore(str(tmp_path / "history.db")) as store:
+        for day in range(10):
+            store.record_run(T0 + timedelta(days=day), 100 + day, 5, day,
+                             [("养生茶", day, "通用", "百度")], [("热点", "知乎热榜")])
+        yield store
+
+
+def test_runs_time_range(store):
+    assert len(store.runs()) == 10
+    assert len(store.runs(start=T0 + timedelta(days=3))) == 7
+    assert len(store.runs(end=T0 + timedelta(days=3))) == 3
+    assert [run["keywords_count"] for run in store.runs(T0 + timedelta(days=2), T0 + timedelta(days=5))] == [102, 103, 104]
+    assert [run["keywords_count"] for run in store.runs(limit=2, newest_first=True)] == [109, 108]
+
+
+def test_keyword_history_time_range(store):
+    assert [row["score"] for row in store.keyword_history("养生茶", start=T0 + timedelta(days=8))] == [8, 9]
+    assert store.keyword_history("没出现过") == []
+
+
+def test_range_query_uses_run_at_index(store):
+    statements = []
+    store.conn.set_trace_callback(statements.append)
+    store.runs(T0 + timedelta(days=2), T0 + timedelta(days=5))
+    store.conn.set_trace_callback(None)
+
+    plan = " ".join(row[3] for row in store.conn.execute("EXPLAIN QUERY PLAN " + statements[-1]))
+    assert "USING INDEX" in plan and "run_at>" in plan
+
+
+def test_runs_in_the_same_second(tmp_path):
+    with HistoryStore(str(tmp_path / "history.db")) as store:
+        first = store.record_run(T0.replace(microsecond=1), 1, 0, 0, [], [])
+        second = store.record_run(T0.replace(microsecond=2), 2, 0, 0, [], [])
+
+        assert first != second
+        assert [run["keywords_count"] for run in store.runs()] == [1, 2]
+        assert len(store.runs(end=T0.replace(microsecond=2))) == 1
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""长尾词扩展器测试"""
+
+import threading
+
+from keyword_expander import KeywordExpander
+
+
+def make_expander(graph, max_depth=3, max_queries=100, batch_size=20, score=len):
+    """用固定的 关键词 -> 建议词 图模拟一个数据源，记录每个关键词的查询次数"""
+    queried = []
+    lock = threading.Lock()
+
+    def fetch(keyword):
+        with lock:
+            queried.append(keyword)
+        return graph.get(keyword, [])
+
+    def merge(all_keywords, results, source):
+        for kw in results:
+            all_keywords.setdefault(kw, set()).add(source)
+        return list(results)
+
+    expander = KeywordExpander({"测试": fetch}, merge, score, max_depth=max_depth,
+                               max_queries=max_queries, batch_size=batch_size)
+    return expander, queried
+
+
+def test_expands_breadth_first_up_to_max_depth():
+    graph = {"养生茶": ["养生茶做法"], "养生茶做法": ["养生茶做法大全"], "养生茶做法大全": ["太深了"]}
+    expander, queried = make_expander(graph, max_depth=3)
+    all_keywords = {"养生茶": {"种子"}}
+
+    added = expander.expand(["养生"], all_keywords)
+
+    # 第1层和第2层会被查询，第3层的建议词只合并、不再扩展
+    assert queried == ["养生茶", "养生茶做法"]
+    assert added == 2
+    assert "养生茶做法大全" in all_keywords
+    assert "太深了" not in all_keywords
+
+
+def test_each_keyword_is_queried_once_and_seeds_are_skipped():
+    graph = {"a": ["b", "养生"], "b": ["a", "c"], "c": ["a", "b"]}
+    expander, queried = make_expander(graph, max_depth=10)
+
+    expander.expand(["养生"], {"a": set()})
+
+    assert sorted(queried) == ["a", "b", "c"]
+
+
+def test_query_budget_and_score_order():
+    graph = {"种子": [], "短": ["短1"], "很长的关键词": ["长1"], "中等长度": ["中1"]}
+    expander, queried = make_expander(graph, max_depth=2, max_queries=2, batch_size=1)
+
+    expander.expand(["种子"], {"短": set(), "很长的关键词": set(), "中等长度": set()})
+
+    # 预算为2：按评分（长度）从高到低只扩展两个
+    assert queried == ["很长的关键词", "中等长度"]
+    assert expander.queries == 2
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""已分析关键词索引测试"""
+
+import json
+
+import keyword_index
+from keyword_index import KeywordIndex
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "index.json"
+    index = KeywordIndex(str(path))
+    index.update([("养生茶推荐", 9, "购买"), ("控糖", 3, "通用")], title_seed=42)
+    index.save()
+
+    reloaded = KeywordIndex(str(path))
+    assert len(reloaded) == 2
+    assert reloaded.get("养生茶推荐") == (9, "购买", 42)
+    assert "控糖" in reloaded
+    assert reloaded.get("没见过") is None
+
+
+def test_rules_change_discards_entries(tmp_path, monkeypatch):
+    path = tmp_path / "index.json"
+    index = KeywordIndex(str(path))
+    index.update([("养生", 3, "通用")], title_seed=1)
+    index.save()
+
+    monkeypatch.setattr(keyword_index, "rules_fingerprint", lambda: "changed")
+    assert len(KeywordIndex(str(path))) == 0
+
+
+def test_evicts_least_recently_seen(tmp_path):
+    path = tmp_path / "index.json"
+    index = KeywordIndex(str(path), max_entries=2)
+    index.update([("a", 1, "通用"), ("b", 2, "通用"), ("c", 3, "通用")], title_seed=0)
+    index.touch(["a"])
+    index.save()
+
+    assert sorted(KeywordIndex(str(path)).entries) == ["a", "c"]
+
+
+def test_corrupt_file_is_ignored(tmp_path):
+    path = tmp_path / "index.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    index = KeywordIndex(str(path))
+    assert len(index) == 0
+    index.update([("x", 1, "通用")], title_seed=0)
+    index.save()
+    assert json.loads(path.read_text(encoding="utf-8"))["entries"] == {"x": [1, "通用", 0]}
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Aho–Corasick 匹配器测试：结果必须与逐个触发词的子串扫描一致"""
+
+import random
+import re
+
+import pytest
+
+from keyword_matcher import KeywordMatcher
+from keyword_scoring import INTENT_RULES, SCORE_RULES, analyze_keyword, calculate_score, detect_intent
+
+
+def substring_score(keyword):
+    """旧版 calculate_score：逐个触发词做子串判断"""
+    score = sum(points for _, points, words in SCORE_RULES if any(w in keyword for w in words))
+    length = len(keyword)
+    if length >= 10:
+        score += 4
+    elif length >= 8:
+        score += 3
+    elif length >= 6:
+        score += 2
+    if re.search(r'\d+', keyword):
+        score += 1
+    return score
+
+
+def substring_intent(keyword):
+    """旧版 detect_intent"""
+    intents = [name for name, words in INTENT_RULES if any(w in keyword for w in words)]
+    return "/".join(intents) if intents else "通用"
+
+
+def random_keywords(count, seed=0):
+    """由触发词片段、触发词的单个字符和干扰字符随机拼接，覆盖重叠、前后缀共享等情况"""
+    words = [w for _, _, ws in SCORE_RULES for w in ws] + [w for _, ws in INTENT_RULES for w in ws]
+    pieces = words + [w[:1] for w in words] + [w[1:] for w in words if len(w) > 1] + list("的吗a1 9")
+    rng = random.Random(seed)
+    return ["".join(rng.choice(pieces) for _ in range(rng.randint(0, 6))) for _ in range(count)]
+
+
+def test_matches_substring_scan_on_random_keywords():
+    for keyword in random_keywords(5000):
+        assert calculate_score(keyword) == substring_score(keyword), keyword
+        assert detect_intent(keyword) == substring_intent(keyword), keyword
+        assert analyze_keyword(keyword) == (substring_score(keyword), substring_intent(keyword))
+
+
+@pytest.mark.parametrize("keyword", [
+    "", "养生", "怎么买京东养生茶推荐", "副作用和危害", "控糖饮食食谱7天", "减脂餐vs轻食VS代餐",
+    "熬夜后吃什么最好", "什么", "怎么怎么", "有效吗有用吗",
+])
+def test_matches_substring_scan_on_examples(keyword):
+    assert calculate_score(keyword) == substring_score(keyword)
+    assert detect_intent(keyword) == substring_intent(keyword)
+
+
+def test_overlapping_patterns_use_failure_links():
+    matcher = KeywordMatcher({"he": ["he"], "she": ["she"], "his": ["his"], "hers": ["hers"]})
+
+    assert matcher.categories("ushers") == ["he", "she", "hers"]
+    assert matcher.categories("ahishe") == ["he", "she", "his"]
+    assert matcher.categories("xyz") == []
+
+
+def test_word_in_several_categories():
+    matcher = KeywordMatcher({"a": ["推荐"], "b": ["推荐", "价格"]})
+
+    assert matcher.categories("好物推荐") == ["a", "b"]
+    assert matcher.categories("价格") == ["b"]
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Top-K 排名测试：必须与稳定降序排序后取前 K 个一致"""
+
+import random
+
+import pytest
+
+from keyword_ranker import TopKRanker
+
+
+class Record:
+    def __init__(self, score):
+        self.score = score
+
+
+def rows_with_ties(count, seed=0):
+    rng = random.Random(seed)
+    return [(f"kw{i}", Record(rng.randint(0, 5))) for i in range(count)]
+
+
+def stable_top(rows, k):
+    return sorted(rows, key=lambda row: row[1].score, reverse=True)[:k]
+
+
+@pytest.mark.parametrize("k", [1, 3, 10, 100, 1000])
+def test_matches_stable_sort_with_many_ties(k):
+    rows = rows_with_ties(500)
+    assert TopKRanker(k).extend(rows).top() == stable_top(rows, k)
+
+
+def test_ties_keep_insertion_order():
+    rows = [("a", Record(5)), ("b", Record(7)), ("c", Record(5)), ("d", Record(7)), ("e", Record(5))]
+
+    top = TopKRanker(4).extend(rows).top()
+
+    # 同分时先加入的排在前面，最晚加入的同分关键词被挤出
+    assert [kw for kw, _ in top] == ["b", "d", "a", "c"]
+
+
+def test_custom_key_and_fewer_rows_than_k():
+    rows = [("x", Record(1)), ("y", Record(3))]
+
+    top = TopKRanker(10).extend(rows, key=lambda record: -record.score).top()
+
+    assert [kw for kw, _ in top] == ["x", "y"]
+
+
+def test_iter_all_yields_top_then_rest_in_original_order():
+    rows = rows_with_ties(50, seed=1)
+    ranker = TopKRanker(5).extend(rows)
+
+    output = list(ranker.iter_all(rows))
+
+    top = stable_top(rows, 5)
+    assert output[:5] == top
+    assert output[5:] == [row for row in rows if row not in top]
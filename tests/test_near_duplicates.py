@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""近似重复聚类测试"""
+
+import random
+
+import pytest
+
+from keyword_store import KeywordStore
+from near_duplicates import NearDuplicateClusterer, collapse_near_duplicates
+
+
+def clustered(keywords, **kwargs):
+    clusterer = NearDuplicateClusterer(**kwargs)
+    return [[keywords[i] for i in members] for members in clusterer.clusters(keywords)]
+
+
+@pytest.mark.parametrize("variant", ["控糖饮食的食谱", "控糖饮食，食谱", "控糖饮食 食谱", "控糖饮食-食谱"])
+def test_request_examples_merge(variant):
+    assert clustered(["控糖饮食食谱", variant]) == [["控糖饮食食谱", variant]]
+
+
+def test_near_identical_long_tail_merges():
+    assert clustered(["控糖饮食食谱推荐", "控糖饮食食谱推荐表"]) == [["控糖饮食食谱推荐", "控糖饮食食谱推荐表"]]
+
+
+@pytest.mark.parametrize("a, b", [
+    ("养生", "养生茶"),
+    ("控糖饮食食谱", "控糖饮食菜单"),
+    ("减脂餐和轻食", "减脂餐还是轻食"),
+    ("养胃", "祛湿"),
+])
+def test_distinct_keywords_stay_apart(a, b):
+    assert clustered([a, b]) == []
+
+
+def test_question_variant_survives_collapse():
+    store = KeywordStore()
+    store.add("养生茶有用", "百度")
+    store.add("养生茶有用", "B站")
+    store.add("养生茶有用吗", "百度")
+
+    assert collapse_near_duplicates(store) == 0
+    assert list(store) == ["养生茶有用", "养生茶有用吗"]
+
+
+def test_clusters_are_transitive_and_sorted():
+    keywords = ["无关", "控糖饮食的食谱", "养生茶", "控糖饮食食谱", "控糖饮食，食谱"]
+    assert clustered(keywords) == [["控糖饮食的食谱", "控糖饮食食谱", "控糖饮食，食谱"]]
+
+
+def test_many_keywords_only_planted_duplicates_merge():
+    rng = random.Random(0)
+    chars = "养生控糖饮食减脂餐祛湿补气血熬夜胃茶汤粥水果蔬菜早晚推荐方法禁忌"
+    keywords = list(dict.fromkeys("".join(rng.choice(chars) for _ in range(rng.randint(6, 10))) for _ in range(3000)))
+    planted = keywords[:20]
+    keywords += [kw[:3] + "的" + kw[3:] for kw in planted]
+
+    clusters = clustered(keywords)
+    pairs = {frozenset(c) for c in clusters if len(c) == 2}
+    for kw in planted:
+        assert frozenset([kw, kw[:3] + "的" + kw[3:]]) in pairs
+
+
+def test_collapse_keeps_keyword_with_most_sources():
+    store = KeywordStore()
+    store.add("控糖饮食的食谱", "百度")
+    store.add("控糖饮食食谱", "百度")
+    store.add("控糖饮食食谱", "B站")
+    store.add("养生茶", "淘宝")
+
+    removed = collapse_near_duplicates(store)
+
+    assert removed == 1
+    assert list(store) == ["控糖饮食食谱", "养生茶"]
+    assert store["控糖饮食食谱"].sources == ["百度", "B站"]
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""运行间差异测试"""
+
+from datetime import datetime, timedelta
+
+from run_diff import diff_latest
+from snapshot_store import SnapshotStore
+
+SOURCES = ["百度", "B站"]
+T0 = datetime(2026, 1, 1, 8)
+
+
+def test_diff_ignores_bonus_only_changes(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    # (关键词, 来源位掩码, 推荐指数, 规则分, 意图)
+    store.save(T0, [
+        ("新词加分", 1, 8, 7, "通用"),     # 上次拿到"新出现"加分
+        ("规则分变", 1, 5, 5, "通用"),
+        ("来源变", 1, 5, 5, "通用"),
+        ("消失", 1, 3, 3, "通用"),
+    ], SOURCES)
+    store.save(T0 + timedelta(hours=1), [
+        ("新词加分", 1, 7, 7, "通用"),     # 只有加分没了，不算变化
+        ("规则分变", 1, 9, 8, "通用"),
+        ("来源变", 3, 6, 5, "通用"),
+        ("新增", 2, 4, 4, "通用"),
+    ], SOURCES)
+
+    diff = diff_latest(store)
+
+    assert diff["counts"] == {"new": 1, "dropped": 1, "changed": 2}
+    assert diff["new"] == [{"keyword": "新增", "score": 4, "source": "B站"}]
+    assert diff["dropped"] == [{"keyword": "消失", "score": 3, "source": "百度"}]
+    assert diff["changed"] == [
+        {"keyword": "规则分变", "old_base_score": 5, "base_score": 8, "old_score": 5, "score": 9,
+         "old_source": "百度", "source": "百度"},
+        {"keyword": "来源变", "old_base_score": 5, "base_score": 5, "old_score": 5, "score": 6,
+         "old_source": "百度", "source": "百度+B站"},
+    ]
+
+
+def test_needs_two_runs(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    assert diff_latest(store) is None
+    store.save(T0, [("a", 1, 1, 1, "通用")], SOURCES)
+    assert diff_latest(store) is None
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""关键词快照测试"""
+
+import multiprocessing
+from datetime import datetime, timedelta
+
+import pytest
+
+import snapshot_store
+from snapshot_store import SnapshotStore
+
+SOURCES = ["百度", "B站"]
+T0 = datetime(2026, 1, 1, 8)
+
+
+def rows(keywords, score=5):
+    return [(kw, 1, score, score, "通用") for kw in keywords]
+
+
+def decoded(store, path):
+    return [store.keywords[i] for i in store.read(path)["keyword_id"].tolist()]
+
+
+def test_round_trip(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.save(T0, [("养生茶", 3, 9, 7, "购买"), ("控糖", 1, 4, 4, "通用")], SOURCES)
+
+    frame = SnapshotStore(str(tmp_path)).load()
+    assert frame["keyword"].tolist() == ["养生茶", "控糖"]
+    assert frame["source"].tolist() == ["百度+B站", "百度"]
+    assert frame["score"].tolist() == [9, 4]
+    assert frame["base_score"].tolist() == [7, 4]
+    assert frame["intent"].tolist() == ["购买", "通用"]
+
+
+def test_overlapping_stores_agree_on_ids(tmp_path):
+    # 两次运行重叠：都在对方追加之前加载了字典
+    first, second = SnapshotStore(str(tmp_path)), SnapshotStore(str(tmp_path))
+    path_a = first.save(T0, rows(["a", "b"]), SOURCES)
+    path_b = second.save(T0 + timedelta(hours=1), rows(["b", "c"]), SOURCES)
+
+    fresh = SnapshotStore(str(tmp_path))
+    assert fresh.keywords == ["a", "b", "c"]
+    assert decoded(fresh, path_a) == ["a", "b"]
+    assert decoded(fresh, path_b) == ["b", "c"]
+    # 先加载的实例读到对方的快照时会补读字典
+    assert decoded(first, path_b) == ["b", "c"]
+
+
+def _save_run(directory, hour, keywords):
+    SnapshotStore(directory).save(T0 + timedelta(hours=hour), rows(keywords), SOURCES)
+
+
+@pytest.mark.skipif(snapshot_store.fcntl is None, reason="需要 fcntl 文件锁")
+def test_concurrent_processes(tmp_path):
+    context = multiprocessing.get_context("fork")
+    runs = {hour: [f"kw{hour}_{i}" for i in range(200)] + [f"shared{i}" for i in range(50)] for hour in range(6)}
+    processes = [context.Process(target=_save_run, args=(str(tmp_path), hour, keywords))
+                 for hour, keywords in runs.items()]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    store = SnapshotStore(str(tmp_path))
+    assert len(store.keywords) == len(set(store.keywords)) == 6 * 200 + 50
+    for hour, keywords in runs.items():
+        assert decoded(store, store.path_for(T0 + timedelta(hours=hour))) == keywords
+
+
+def test_partial_last_line_is_truncated(tmp_path):
+    SnapshotStore(str(tmp_path)).save(T0, rows(["a"]), SOURCES)
+    dictionary = tmp_path / snapshot_store.DICTIONARY_FILE
+    with open(dictionary, "ab") as f:
+        f.write(b'"half')
+
+    store = SnapshotStore(str(tmp_path))
+    assert store.keywords == ["a"]
+    store.save(T0 + timedelta(hours=1), rows(["b"]), SOURCES)
+    assert dictionary.read_text(encoding="utf-8") == '"a"\n"b"\n'
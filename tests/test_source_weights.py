@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""数据源加权配置测试"""
+
+import json
+
+import pytest
+
+from source_weights import DEFAULT_CROSS_SOURCE_WEIGHT, DEFAULT_MAX_BONUS, SourceWeighting
+
+
+def write_config(tmp_path, text):
+    path = tmp_path / "config.json"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_reads_section(tmp_path):
+    path = write_config(tmp_path, json.dumps({"source_weighting": {"source_weights": {"百度": 2}, "max_bonus": 5}}))
+    weighting = SourceWeighting.from_config(path)
+    assert weighting.source_weights == {"百度": 2}
+    assert weighting.max_bonus == 5
+
+
+@pytest.mark.parametrize("text", [
+    "{}",
+    '{"source_weighting": null}',
+    '{"source_weighting": [1, 2]}',
+    '{"source_weighting": "百度"}',
+    "[]",
+    "不是 JSON",
+])
+def test_bad_or_missing_section_falls_back_to_defaults(tmp_path, text):
+    weighting = SourceWeighting.from_config(write_config(tmp_path, text))
+    assert weighting.source_weights == {}
+    assert weighting.cross_source_weight == DEFAULT_CROSS_SOURCE_WEIGHT
+    assert weighting.max_bonus == DEFAULT_MAX_BONUS
+
+
+def test_missing_file_uses_defaults(tmp_path):
+    assert SourceWeighting.from_config(tmp_path / "missing.json").max_bonus == DEFAULT_MAX_BONUS
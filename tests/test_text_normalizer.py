@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""关键词规范化测试"""
+
+import random
+
+import pytest
+
+from text_normalizer import SIMPLIFIED_CHARS, TRADITIONAL_CHARS, normalize_keyword
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("養生茶", "养生茶"),
+    ("ＶＣ推薦", "vc推荐"),
+    ("养生 茶", "养生茶"),
+    ("養生　茶", "养生茶"),
+    ("  控糖\t飲食  ", "控糖饮食"),
+    ("Vitamin   C 推荐", "vitamin c 推荐"),
+    ("减脂餐 vs 轻食", "减脂餐 vs 轻食"),
+    ("１０天減脂計劃", "10天减脂计划"),
+    ("補氣血吃什麼？", "补气血吃什么?"),
+    ("", ""),
+    ("   ", ""),
+])
+def test_examples(raw, expected):
+    assert normalize_keyword(raw) == expected
+
+
+def test_character_tables_are_one_to_one():
+    assert len(TRADITIONAL_CHARS) == len(SIMPLIFIED_CHARS)
+    assert len(set(TRADITIONAL_CHARS)) == len(TRADITIONAL_CHARS)
+    assert not set(TRADITIONAL_CHARS) & set(SIMPLIFIED_CHARS)
+
+
+def test_idempotent():
+    rng = random.Random(0)
+    alphabet = TRADITIONAL_CHARS[:40] + "养生茶ＡＢａｂAB12１２ 　\t？?"
+    for _ in range(2000):
+        keyword = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        once = normalize_keyword(keyword)
+        assert normalize_keyword(once) == once, keyword
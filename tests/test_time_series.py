@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""运行历史时间序列测试"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from history_store import HistoryStore
+from time_series import RunTimeSeries, choose_window, window_start
+
+# 2026-01-07 是周三
+T0 = datetime(2026, 1, 7, 10, 30)
+
+
+def record(store, run_at, keywords_count, high_score_count=0):
+    store.record_run(run_at, keywords_count, 5, high_score_count, [], [])
+
+
+@pytest.fixture
+def store(tmp_path):
+    with HistoryStore(str(tmp_path / "history.db")) as store:
+        yield store
+
+
+def test_empty_history(store):
+    assert RunTimeSeries(store).series() is None
+
+
+def test_hour_buckets_min_mean_max(store):
+    for minutes, count in [(0, 10), (10, 20), (20, 60), (65, 7)]:
+        record(store, T0 + timedelta(minutes=minutes), count)
+
+    series = RunTimeSeries(store).series(window="hour")
+    assert series["starts"] == ["2026-01-07T10:00:00", "2026-01-07T11:00:00"]
+    assert series["runs"] == [3, 1]
+    assert series["keywords_count"] == {"min": [10, 7], "mean": [30, 7], "max": [60, 7]}
+
+
+def test_week_buckets_start_on_monday(store):
+    # 周三、周日、下周一、下周日 -> 两个周窗口
+    for day, count in [(0, 1), (4, 3), (5, 5), (11, 9)]:
+        record(store, T0 + timedelta(days=day), count)
+
+    series = RunTimeSeries(store).series(window="week")
+    assert series["starts"] == ["2026-01-05T00:00:00", "2026-01-12T00:00:00"]
+    assert all(datetime.fromisoformat(start).weekday() == 0 for start in series["starts"])
+    assert series["runs"] == [2, 2]
+    assert series["keywords_count"]["mean"] == [2, 7]
+
+
+def test_window_start_alignment():
+    assert window_start(T0, "hour") == datetime(2026, 1, 7, 10)
+    assert window_start(T0, "day") == datetime(2026, 1, 7)
+    assert window_start(T0, "week") == datetime(2026, 1, 5)
+    monday = datetime(2026, 1, 12)
+    assert window_start(monday, "week") == monday
+    assert window_start(monday - timedelta(seconds=1), "week") == datetime(2026, 1, 5)
+
+
+def test_choose_window():
+    assert choose_window(T0, T0 + timedelta(hours=59), max_points=60) == "hour"
+    assert choose_window(T0, T0 + timedelta(hours=60), max_points=60) == "day"
+    assert choose_window(T0, T0 + timedelta(days=100), max_points=60) == "week"
+    assert choose_window(T0, T0 + timedelta(days=1000), max_points=60) == "week"
+
+
+def test_auto_window_and_max_points(store):
+    for day in range(30):
+        record(store, T0 + timedelta(days=day), day)
+
+    series = RunTimeSeries(store).series(max_points=10)
+    assert series["window"] == "week"
+    assert len(series["starts"]) <= 10
+
+    series = RunTimeSeries(store).series(window="day", max_points=10)
+    assert series["runs"] == [1] * 10
+    assert series["keywords_count"]["max"] == list(range(20, 30))
+
+
+def test_missing_high_score_count_is_none(store):
+    record(store, T0, 10, high_score_count=None)
+    record(store, T0 + timedelta(days=1), 10, high_score_count=4)
+
+    series = RunTimeSeries(store).series(window="day", metrics=["high_score_count"])
+    assert series["high_score_count"]["mean"] == [None, 4]
+    assert "keywords_count" not in series
+
+
+def test_rejects_unknown_window_or_metric(store):
+    with pytest.raises(ValueError):
+        RunTimeSeries(store).series(window="month")
+    with pytest.raises(ValueError):
+        RunTimeSeries(store).series(metrics=["score"])
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""关键词趋势引擎测试"""
+
+from datetime import datetime
+
+from history_store import HistoryStore
+from trend_engine import TrendEngine
+
+
+def test_overlapping_engines_get_distinct_runs(tmp_path):
+    path = str(tmp_path / "history.db")
+    with HistoryStore(path) as a, HistoryStore(path) as b:
+        # 两个进程几乎同时启动：初始化时读到的运行序号相同
+        first, second = TrendEngine(a), TrendEngine(b)
+
+        assert first.update(datetime(2026, 1, 1), [("养生茶", 9, 1), ("祛湿", 3, 1)]) == 1
+        assert second.update(datetime(2026, 1, 1), [("养生茶", 3, 1), ("祛湿", 9, 2)]) == 2
+
+        rows = {row["keyword"]: dict(row) for row in b.conn.execute("SELECT * FROM keyword_trends")}
+        assert rows["祛湿"]["appearances"] == 2
+        assert rows["祛湿"]["velocity"] > 0
+        assert rows["养生茶"]["velocity"] < 0
+        assert [t["keyword"] for t in second.rising()] == ["祛湿"]
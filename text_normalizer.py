@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键词规范化
+全角转半角、常用繁体字转简体、英文转小写、空白整理，合并进关键词表之前统一处理，
+避免"養生茶"/"养生茶"、"ＶＣ"/"vc"、"养生 茶"/"养生茶" 被当成不同的关键词。
+字符替换在导入时编译成一张 str.translate 查找表，每个关键词只扫描一遍
+"""
+
+import re
+from typing import Dict
+
+# 常用繁体字 -> 简体字（逐字一一对应；只收录养生/饮食类关键词常见且无歧义的字）
+TRADITIONAL_CHARS = (
+    "養飲體氣補濕腸減藥醫療營蔔蘿蘋葉雞魚蝦湯麵飯豬鴨餅麥穀紅綠黃薑蔥鹽醬燉烏龍棗參歸"
+    "當熱涼溫虛腎壓臟頭髮膚顏運動覺點麼樣嗎還這個們為會對與說時間後裡裏種類關係質維鈣"
+    "鐵鋅纖錢買賣價貴購網實驗癒壞處無發現經過長幾週歲兒嬰婦產學習問題準標計劃單簡總結"
+    "論讓從東來開門見聽讀寫記認識應該沒國華區廣衛專業傳統鬆緊線級約綿細較輕軟邊達選適"
+    "鍋錯針陽陰難電靜韓預風飽館驚髒鮮鹹齒雜蘆薈藍檸濃淨滷糧燒爐獨環畫痠癢皺盡盤睏礙稱"
+    "穩糰團絡絕綜緩練縮績聯膽膠臉舊萬蓋藝蟲蠔術複視觸訂試詳誤調請護豐貨費資轉辦農遲釀"
+    "閒際隨險雙靈響項頻顆願餵餓饑鵝鹼黴齡瀉瘡癥脹膩薦號圖碼"
+)
+SIMPLIFIED_CHARS = (
+    "养饮体气补湿肠减药医疗营卜萝苹叶鸡鱼虾汤面饭猪鸭饼麦谷红绿黄姜葱盐酱炖乌龙枣参归"
+    "当热凉温虚肾压脏头发肤颜运动觉点么样吗还这个们为会对与说时间后里里种类关系质维钙"
+    "铁锌纤钱买卖价贵购网实验愈坏处无发现经过长几周岁儿婴妇产学习问题准标计划单简总结"
+    "论让从东来开门见听读写记认识应该没国华区广卫专业传统松紧线级约绵细较轻软边达选适"
+    "锅错针阳阴难电静韩预风饱馆惊脏鲜咸齿杂芦荟蓝柠浓净卤粮烧炉独环画酸痒皱尽盘困碍称"
+    "稳团团络绝综缓练缩绩联胆胶脸旧万盖艺虫蚝术复视触订试详误调请护丰货费资转办农迟酿"
+    "闲际随险双灵响项频颗愿喂饿饥鹅碱霉龄泻疮症胀腻荐号图码"
+)
+
+# 全角字符 ！..～ 对应半角 !..~，全角空格对应半角空格
+FULLWIDTH_OFFSET = 0xFF01 - 0x21
+IDEOGRAPHIC_SPACE = "\u3000"
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+# 两个汉字之间的空格（"养生 茶" -> "养生茶"）
+CJK_SPACE_PATTERN = re.compile(r"(?<=[\u4e00-\u9fff]) (?=[\u4e00-\u9fff])")
+
+
+def build_translation_table() -> Dict[int, str]:
+    """编译字符替换表：全角 -> 半角、繁体 -> 简体"""
+    table = {code: chr(code - FULLWIDTH_OFFSET) for code in range(0xFF01, 0xFF5F)}
+    table[ord(IDEOGRAPHIC_SPACE)] = " "
+    table.update(str.maketrans(TRADITIONAL_CHARS, SIMPLIFIED_CHARS))
+    return table
+
+
+TRANSLATION_TABLE = build_translation_table()
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    规范化关键词
+
+    Args:
+        keyword: 原始关键词
+
+    Returns:
+        全角转半角、繁体转简体、转小写、空白整理后的关键词（可能为空字符串）
+    """
+    keyword = keyword.translate(TRANSLATION_TABLE).lower()
+    keyword = WHITESPACE_PATTERN.sub(" ", keyword).strip()
+    return CJK_SPACE_PATTERN.sub("", keyword)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行历史时间序列
+把历史数据库中的运行记录按小时/天/周分桶，每个窗口计算最小/平均/最大值，点数有上限；
+只查询最近若干个窗口内的运行（走 run_at 索引），图表的点数与历史长度无关
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Optional, Sequence, Tuple
+
+from history_store import HistoryStore
+
+# 时间窗口 -> 秒数（按从细到粗的顺序自动选择）
+WINDOWS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+WINDOW_NAMES = {"hour": "小时", "day": "天", "week": "周"}
+WINDOW_LABEL_FORMATS = {"hour": "%m-%d %H:00", "day": "%Y-%m-%d", "week": "%Y-%m-%d"}
+
+# 1970-01-05 是周一：按周分桶时每个窗口从周一开始
+WINDOW_ORIGINS = {"hour": 0, "day": 0, "week": 4 * 86400}
+EPOCH = datetime(1970, 1, 1)
+
+# 时间序列最多的点数（窗口数）
+MAX_POINTS = 60
+
+# 可聚合的 runs 列
+METRICS = ("keywords_count", "high_score_count", "topics_count")
+
+
+def choose_window(first: datetime, last: datetime, max_points: int = MAX_POINTS) -> str:
+    """
+    选择能在 max_points 个点内覆盖整个历史跨度的最细窗口；都放不下时用最粗的窗口
+
+    Args:
+        first: 最早的运行时间
+        last: 最近的运行时间
+        max_points: 最多点数
+    """
+    span = (last - first).total_seconds()
+    for window, width in WINDOWS.items():
+        if math.floor(span / width) + 1 <= max_points:
+            return window
+    return list(WINDOWS)[-1]
+
+
+def window_start(moment: datetime, window: str) -> datetime:
+    """时间所在窗口的起始时间"""
+    width, origin = WINDOWS[window], WINDOW_ORIGINS[window]
+    bucket = (int((moment - EPOCH).total_seconds()) - origin) // width
+    return EPOCH + timedelta(seconds=origin + bucket * width)
+
+
+class RunTimeSeries:
+    """运行记录的分窗口聚合"""
+
+    def __init__(self, store: HistoryStore):
+        """
+        Args:
+            store: 历史数据库
+        """
+        self.conn = store.conn
+
+    def span(self) -> Optional[Tuple[datetime, datetime]]:
+        """最早和最近的运行时间（没有运行记录时为 None）"""
+        first, last = self.conn.execute("SELECT MIN(run_at), MAX(run_at) FROM runs").fetchone()
+        if first is None:
+            return None
+        return datetime.fromisoformat(first), datetime.fromisoformat(last)
+
+    def series(self, window: Optional[str] = None, max_points: int = MAX_POINTS,
+               metrics: Sequence[str] = METRICS) -> Optional[dict]:
+        """
+        最近 max_points 个窗口的聚合序列（没有运行记录的窗口不出点）
+
+        Args:
+            window: "hour" / "day" / "week"，None 表示按历史跨度自动选择
+            max_points: 最多点数
+            metrics: 聚合的 runs 列
+
+        Returns:
+            {"window": 窗口, "starts": 窗口起始时间(ISO), "labels": 坐标轴标签, "runs": 每个窗口的运行数,
+             指标: {"min": [...], "mean": [...], "max": [...]}}；没有运行记录时为 None。
+            旧版导入的运行没有高分关键词数，这类窗口的值为 None
+        """
+        unknown = [metric for metric in metrics if metric not in METRICS]
+        if unknown:
+            raise ValueError(f"未知的指标: {', '.join(unknown)}")
+        if window is not None and window not in WINDOWS:
+            raise ValueError(f"未知的时间窗口: {window}（可选 {', '.join(WINDOWS)}）")
+
+        span = self.span()
+        if span is None:
+            return None
+        first, last = span
+        window = window or choose_window(first, last, max_points)
+        width, origin = WINDOWS[window], WINDOW_ORIGINS[window]
+
+        # 只取最近 max_points 个窗口；按字符串比较的下界放宽一天，兼容旧版 "YYYY-MM-DD HH:MM:SS" 格式
+        first_start = max(window_start(first, window),
+                          window_start(last, window) - timedelta(seconds=width * (max_points - 1)))
+        first_bucket = (int((first_start - EPOCH).total_seconds()) - origin) // width
+
+        columns = ", ".join(f"MIN({m}), AVG({m}), MAX({m})" for m in metrics)
+        rows = self.conn.execute(
+            f"""SELECT bucket, COUNT(*), {columns} FROM (
+                    SELECT *, (CAST(strftime('%s', run_at) AS INTEGER) - :origin) / :width AS bucket
+                    FROM runs WHERE run_at >= :since
+                ) WHERE bucket >= :first_bucket
+                GROUP BY bucket ORDER BY bucket""",
+            {"origin": origin, "width": width, "first_bucket": first_bucket,
+             "since": (first_start - timedelta(days=1)).isoformat(timespec="seconds")}
+        ).fetchall()
+
+        starts = [EPOCH + timedelta(seconds=origin + row[0] * width) for row in rows]
+        result = {
+            "window": window,
+            "starts": [start.isoformat(timespec="seconds") for start in starts],
+            "labels": [start.strftime(WINDOW_LABEL_FORMATS[window]) for start in starts],
+            "runs": [row[1] for row in rows],
+        }
+        for i, metric in enumerate(metrics):
+            result[metric] = {
+                name: [row[2 + 3 * i + j] for row in rows] for j, name in enumerate(("min", "mean", "max"))
+            }
+        return result
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键词趋势引擎
+在历史数据库中为每个关键词维护滚动聚合：首次出现时间、出现次数、来源数变化、排名变化速度；
+每次运行只用本次的关键词增量更新（一条 UPSERT），不重新扫描历史
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from history_store import HistoryStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS keyword_trends (
+    keyword TEXT PRIMARY KEY,
+    first_run INTEGER NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_run INTEGER NOT NULL,
+    appearances INTEGER NOT NULL,
+    source_count INTEGER NOT NULL,
+    source_growth INTEGER NOT NULL,
+    rank_pct REAL NOT NULL,
+    velocity REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TEMP TABLE IF NOT EXISTS current_run (
+    keyword TEXT PRIMARY KEY,
+    source_count INTEGER NOT NULL,
+    rank_pct REAL NOT NULL
+);
+"""
+
+# 排名速度的指数平滑系数（越大越看重最近一次变化）
+TREND_SMOOTHING = 0.5
+
+# 排名速度达到该值（百分位/次）视为上升
+RISING_VELOCITY = 5.0
+
+TREND_COLUMNS = """t.keyword, t.first_seen, t.appearances, t.source_count, t.source_growth,
+                   t.velocity, t.rank_pct, t.first_run, t.last_run"""
+
+
+class TrendEngine:
+    """基于历史数据库的增量趋势统计"""
+
+    def __init__(self, store: HistoryStore, smoothing: float = TREND_SMOOTHING,
+                 rising_velocity: float = RISING_VELOCITY):
+        """
+        Args:
+            store: 历史数据库（趋势表与运行记录在同一个文件中）
+            smoothing: 排名速度的平滑系数
+            rising_velocity: 判定为上升的排名速度
+        """
+        self.conn = store.conn
+        self.conn.executescript(SCHEMA)
+        self.smoothing = smoothing
+        self.rising_velocity = rising_velocity
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'trend_runs'").fetchone()
+        self.run = int(row["value"]) if row else 0
+
+    @staticmethod
+    def rank_percentiles(scores: np.ndarray, source_counts: np.ndarray) -> np.ndarray:
+        """
+        按 (推荐指数, 来源数) 计算排名百分位：0 为第一名，100 为最后
+
+        同分同来源数的关键词排名相同；只做一次排序 + 二分查找
+        """
+        keys = scores.astype(np.int64) * 64 + np.minimum(source_counts, 63)
+        if not len(keys):
+            return np.zeros(0)
+        higher = len(keys) - np.searchsorted(np.sort(keys), keys, side="right")
+        return higher * 100.0 / len(keys)
+
+    def update(self, run_at: datetime, rows: Iterable[Tuple[str, int, int]]) -> int:
+        """
+        用本次运行的关键词更新滚动聚合
+
+        Args:
+            run_at: 运行时间
+            rows: (关键词, 推荐指数, 来源数)
+
+        Returns:
+            本次运行的序号（从1开始）
+        """
+        keywords, scores, source_counts = [], [], []
+        for keyword, score, source_count in rows:
+            keywords.append(keyword)
+            scores.append(score)
+            source_counts.append(source_count)
+        source_counts = np.array(source_counts, dtype=np.int64)
+        rank_pct = self.rank_percentiles(np.array(scores, dtype=np.int64), source_counts)
+
+        with self.conn:
+            # 先拿写锁再读运行序号，同时运行的另一个进程不会得到相同的序号
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'trend_runs'").fetchone()
+            self.run = (int(row["value"]) if row else 0) + 1
+            self.conn.execute("DELETE FROM current_run")
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO current_run (keyword, source_count, rank_pct) VALUES (?, ?, ?)",
+                zip(keywords, source_counts.tolist(), rank_pct.tolist())
+            )
+            # 右侧的列名都是更新前的值；排名速度按间隔的运行次数折算后做指数平滑
+            self.conn.execute(
+                """INSERT INTO keyword_trends (keyword, first_run, first_seen, last_run, appearances,
+                                               source_count, source_growth, rank_pct, velocity)
+                   SELECT keyword, :run, :run_at, :run, 1, source_count, 0, rank_pct, 0 FROM current_run WHERE true
+                   ON CONFLICT (keyword) DO UPDATE SET
+                       appearances = appearances + 1,
+                       source_growth = excluded.source_count - source_count,
+                       velocity = :alpha * (rank_pct - excluded.rank_pct) / (:run - last_run)
+                                  + (1 - :alpha) * velocity,
+                       source_count = excluded.source_count,
+                       rank_pct = excluded.rank_pct,
+                       last_run = :run""",
+                {"run": self.run, "run_at": run_at.isoformat(timespec="seconds"), "alpha": self.smoothing}
+            )
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('trend_runs', ?)", (str(self.run),))
+        return self.run
+
+    def _query(self, where: str, order: str, limit: int = None) -> List[dict]:
+        """查询本次运行中出现的关键词的趋势"""
+        sql = f"""SELECT {TREND_COLUMNS} FROM current_run c JOIN keyword_trends t ON t.keyword = c.keyword
+                  WHERE {where} ORDER BY {order}"""
+        params = {"run": self.run, "rising": self.rising_velocity}
+        if limit is not None:
+            sql += " LIMIT :limit"
+            params["limit"] = limit
+
+        trends = []
+        for row in self.conn.execute(sql, params):
+            trend = dict(row)
+            trend["frequency"] = trend["appearances"] / (self.run - trend.pop("first_run") + 1)
+            trends.append(trend)
+        return trends
+
+    def rising(self, limit: int = 10) -> List[dict]:
+        """本次排名上升最快的老关键词"""
+        return self._query("t.first_run < :run AND t.velocity >= :rising",
+                           "t.velocity DESC, t.source_growth DESC, t.rank_pct", limit)
+
+    def new_keywords(self, limit: int = 10) -> List[dict]:
+        """本次首次出现的关键词（按排名；第一次运行没有参照，返回空列表）"""
+        if self.run <= 1:
+            return []
+        return self._query("t.first_run = :run", "t.rank_pct, t.source_count DESC", limit)
+
+    def bonuses(self, weights: Dict[str, int]) -> Dict[str, int]:
+        """
+        趋势加分
+
+        Args:
+            weights: {"new": 新词加分, "rising": 上升加分, "source_growth": 来源数增加加分}
+
+        Returns:
+            关键词 -> 加分（只包含加分不为0的关键词）
+        """
+        bonuses = {}
+        is_baseline = self.run <= 1
+        for trend in self._query("(t.first_run = :run AND :run > 1) OR t.source_growth > 0 OR t.velocity >= :rising",
+                                 "t.keyword"):
+            bonus = 0
+            if trend["appearances"] == 1 and not is_baseline:
+                bonus += weights.get("new", 0)
+            if trend["velocity"] >= self.rising_velocity:
+                bonus += weights.get("rising", 0)
+            if trend["source_growth"] > 0:
+                bonus += weights.get("source_growth", 0)
+            if bonus:
+                bonuses[trend["keyword"]] = bonus
+        return bonuses
@@ -6,21 +6,97 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
 import json
 import re
-import time
 import random
 from typing import List, Dict, Optional
 from urllib.parse import quote, urlencode
 import logging
 
-# 配置日志
-logging.basicConfig(level=logging.INFO, format='%(message)s')
+from rate_limiter import HostRateLimiter, THROTTLE_STATUS, DEFAULT_RATE_LIMIT, default_limiter
+from suggestion_cache import SuggestionCache, SUGGEST_TTL, HOT_TTL
+
 logger = logging.getLogger(__name__)
 
 
-class EnhancedFetcher:
+# 前缀扩展字母表：搜索建议接口对"种子词+a"、"种子词+的"等会返回不同的补全结果
+LATIN_ALPHABET = tuple("abcdefghijklmnopqrstuvwxyz")  # 英文字母（百度等会按拼音首字母补全）
+COMMON_CHARS = ("的", "怎么", "吃", "能", "和", "是", "有", "不", "多", "哪")
+
+
+# ==================== 数据源定义 ====================
+# 每个数据源只描述"请求什么"和"如何解析"，同步/异步抓取器共用这些定义
+
+class SourceSpec:
+    """数据源定义基类"""
+
+    LABEL = ""               # 日志中的简称
+    SOURCE_NAME = ""         # 请求日志中的数据源名称
+    ITEM_NAME = "建议词"      # 结果条目的名称
+    SUGGEST_URL = None       # 搜索建议接口
+    HOT_URL = None           # 热榜接口
+    ENCODING = None          # 响应编码（None 表示按响应头自动识别）
+    RATE_LIMIT = DEFAULT_RATE_LIMIT  # 限速 (每秒请求数, 突发量)，按主机生效
+    CACHE_TTL = SUGGEST_TTL  # 结果缓存有效期（秒）
+    PREFIX_ALPHABET = ()     # 前缀扩展使用的字母表（空表示不做前缀扩展）
+
+    cache: Optional[SuggestionCache] = None
+
+    def suggest_params(self, keyword: str) -> dict:
+        """搜索建议接口的查询参数"""
+        return {}
+
+    def parse_suggestions(self, text: str) -> List[str]:
+        """解析搜索建议接口的响应文本"""
+        raise NotImplementedError
+
+    def prefix_variants(self, seed: str) -> List[str]:
+        """
+        生成前缀扩展查询词
+
+        Args:
+            seed: 种子词
+
+        Returns:
+            种子词 + 字母表中每个字符/词 组成的查询词列表
+        """
+        if not self.SUGGEST_URL:
+            return []
+        return [f"{seed}{char}" for char in self.PREFIX_ALPHABET]
+
+    def parse_hot_topics(self, text: str) -> List[str]:
+        """解析热榜接口的响应文本"""
+        raise NotImplementedError
+
+    def _cache_get(self, keyword: str = "") -> Optional[List[str]]:
+        """读取缓存，未启用缓存或未命中返回None"""
+        if self.cache is None:
+            return None
+        items = self.cache.get(self.LABEL, keyword)
+        if items is not None:
+            logger.info(f"  💾 {self.LABEL}: 缓存命中 {keyword or self.SOURCE_NAME}")
+        return items
+
+    def _cache_set(self, keyword: str, items: List[str]):
+        """写入缓存（空结果通常意味着请求失败，不缓存）"""
+        if self.cache is not None and items:
+            self.cache.set(self.LABEL, keyword, items, self.CACHE_TTL)
+
+    def _parse(self, parser, text: str) -> List[str]:
+        """调用解析函数并记录日志，解析失败返回空列表"""
+        try:
+            items = parser(text)
+        except Exception as e:
+            logger.warning(f"  ⚠️  {self.LABEL}解析失败: {e}")
+            return []
+
+        if items is None:
+            return []
+        logger.info(f"  ✅ {self.LABEL}: 获取 {len(items)} 个{self.ITEM_NAME}")
+        return items
+
+
+class EnhancedFetcher(SourceSpec):
     """增强版网络抓取器"""
 
     # 真实浏览器请求头池
@@ -54,16 +130,21 @@ class EnhancedFetcher:
         }
     ]
 
-    def __init__(self, use_proxy=False, proxy_list=None):
+    def __init__(self, use_proxy=False, proxy_list=None, rate_limiter: HostRateLimiter = None,
+                 cache: SuggestionCache = None):
         """
         初始化抓取器
 
         Args:
             use_proxy: 是否使用代理
             proxy_list: 代理列表 [{'http': '...', 'https': '...'}]
+            rate_limiter: 按主机限速器（默认使用进程内共享的限速器）
+            cache: 结果缓存（None 表示不缓存）
         """
         self.use_proxy = use_proxy
         self.proxy_list = proxy_list or []
+        self.rate_limiter = rate_limiter or default_limiter
+        self.cache = cache
         self.session = requests.Session()
         self.session.cookies = requests.cookies.RequestsCookieJar()
 
@@ -74,7 +155,7 @@ class EnhancedFetcher:
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=list(THROTTLE_STATUS),
             allowed_methods=["HEAD", "GET", "OPTIONS"]
         )
         adapter = HTTPAdapter(max_retries=retry_strategy)
@@ -110,9 +191,10 @@ class EnhancedFetcher:
         headers = self._get_random_headers()
         proxies = self._get_proxy()
 
-        # 随机延迟，避免请求过快
-        delay = random.uniform(1.0, 3.0)
-        time.sleep(delay)
+        # 按主机限速，避免请求过快
+        host = HostRateLimiter.host_of(url)
+        self.rate_limiter.configure(host, *self.RATE_LIMIT)
+        self.rate_limiter.acquire(host)
 
         try:
             if method.upper() == "GET":
@@ -132,6 +214,7 @@ class EnhancedFetcher:
                     timeout=timeout
                 )
 
+            self.rate_limiter.record(host, status=response.status_code)
             if response.status_code == 200:
                 logger.info(f"✅ {source_name}: 成功")
                 return response
@@ -140,8 +223,14 @@ class EnhancedFetcher:
                 return None
 
         except requests.exceptions.Timeout:
+            self.rate_limiter.record(host, throttled=True)
             logger.warning(f"⚠️  {source_name}: 超时")
             return None
+        except requests.exceptions.RetryError:
+            # 重试耗尽（持续 429/5xx）
+            self.rate_limiter.record(host, throttled=True)
+            logger.warning(f"⚠️  {source_name}: 重试耗尽")
+            return None
         except requests.exceptions.RequestException as e:
             logger.warning(f"⚠️  {source_name}: {type(e).__name__}")
             return None
@@ -149,13 +238,9 @@ class EnhancedFetcher:
             logger.warning(f"⚠️  {source_name}: 未知错误 - {str(e)[:50]}")
             return None
 
-
-class BaiduFetcher(EnhancedFetcher):
-    """百度搜索建议抓取器"""
-
     def fetch_suggestions(self, keyword: str) -> List[str]:
         """
-        抓取百度搜索建议
+        抓取搜索建议
 
         Args:
             keyword: 关键词
@@ -163,217 +248,234 @@ class BaiduFetcher(EnhancedFetcher):
         Returns:
             建议词列表
         """
-        url = "http://suggestion.baidu.com/su"
-        params = {"wd": keyword, "cb": "cb"}
-
-        logger.info(f"  🔍 百度: {keyword}")
-        response = self.fetch(url, params=params, source_name="百度下拉")
+        cached = self._cache_get(keyword)
+        if cached is not None:
+            return cached
 
+        logger.info(f"  🔍 {self.LABEL}: {keyword}")
+        response = self.fetch(self.SUGGEST_URL, params=self.suggest_params(keyword),
+                              source_name=self.SOURCE_NAME)
         if not response:
             return []
+        suggestions = self._parse(self.parse_suggestions, response.text)
+        self._cache_set(keyword, suggestions)
+        return suggestions
 
-        try:
-            # 百度返回的是GB2312编码的JSONP
-            text = response.text
-            match = re.search(r'cb\((.*)\)', text)
-            if match:
-                json_str = match.group(1)
-                # 尝试解码GB2312
-                try:
-                    json_str = json_str.encode('latin1').decode('gb2312')
-                except:
-                    pass
-
-                data = json.loads(json_str)
-                if isinstance(data, dict) and "s" in data:
-                    suggestions = data.get("s", [])
-                    logger.info(f"  ✅ 百度: 获取 {len(suggestions)} 个建议词")
-                    return suggestions
-        except Exception as e:
-            logger.warning(f"  ⚠️  百度解析失败: {e}")
-
-        return []
-
-
-class BilibiliFetcher(EnhancedFetcher):
-    """B站搜索建议抓取器"""
-
-    def fetch_suggestions(self, keyword: str) -> List[str]:
-        """抓取B站搜索建议"""
-        url = "https://s.search.bilibili.com/main/suggest"
-        params = {"term": keyword}
+    def fetch_hot_topics(self) -> List[str]:
+        """
+        抓取热榜话题
 
-        logger.info(f"  🔍 B站: {keyword}")
-        response = self.fetch(url, params=params, source_name="B站建议")
+        Returns:
+            话题标题列表
+        """
+        cached = self._cache_get()
+        if cached is not None:
+            return cached
 
+        logger.info(f"  🔍 {self.SOURCE_NAME}")
+        response = self.fetch(self.HOT_URL, source_name=self.SOURCE_NAME)
         if not response:
             return []
+        topics = self._parse(self.parse_hot_topics, response.text)
+        self._cache_set("", topics)
+        return topics
+
+
+# ==================== 数据源 ====================
+
+class BaiduSource(SourceSpec):
+    """百度搜索建议"""
+
+    LABEL = "百度"
+    SOURCE_NAME = "百度下拉"
+    SUGGEST_URL = "http://suggestion.baidu.com/su"
+    ENCODING = "gbk"
+    RATE_LIMIT = (2.0, 3)
+    PREFIX_ALPHABET = LATIN_ALPHABET + COMMON_CHARS
+
+    def suggest_params(self, keyword: str) -> dict:
+        return {"wd": keyword, "cb": "cb"}
+
+    def parse_suggestions(self, text: str) -> List[str]:
+        # 百度返回的是GB2312编码的JSONP
+        match = re.search(r'cb\((.*)\)', text)
+        if match:
+            json_str = match.group(1)
+            # 尝试解码GB2312
+            try:
+                json_str = json_str.encode('latin1').decode('gb2312')
+            except:
+                pass
+
+            data = json.loads(json_str)
+            if isinstance(data, dict) and "s" in data:
+                return data.get("s", [])
+        return None
+
+
+class BilibiliSource(SourceSpec):
+    """B站搜索建议"""
+
+    LABEL = "B站"
+    SOURCE_NAME = "B站建议"
+    SUGGEST_URL = "https://s.search.bilibili.com/main/suggest"
+    RATE_LIMIT = (1.0, 2)
+    PREFIX_ALPHABET = COMMON_CHARS
+
+    def suggest_params(self, keyword: str) -> dict:
+        return {"term": keyword}
+
+    def parse_suggestions(self, text: str) -> List[str]:
+        data = json.loads(text)
+        if isinstance(data, dict) and "result" in data:
+            return [item.get("value", "") for item in data.get("result", []) if "value" in item]
+        return None
+
+
+class TaobaoSource(SourceSpec):
+    """淘宝搜索建议"""
+
+    LABEL = "淘宝"
+    SOURCE_NAME = "淘宝建议"
+    SUGGEST_URL = "https://suggest.taobao.com/sug"
+    RATE_LIMIT = (1.0, 2)
+    PREFIX_ALPHABET = COMMON_CHARS
+
+    def suggest_params(self, keyword: str) -> dict:
+        return {"q": keyword, "code": "utf-8"}
+
+    def parse_suggestions(self, text: str) -> List[str]:
+        data = json.loads(text)
+        result = data.get("result", [])
+        suggestions = []
+        for item in result:
+            if isinstance(item, list) and len(item) > 0:
+                suggestions.append(item[0])
+        return suggestions
+
+
+class ZhihuSource(SourceSpec):
+    """知乎热榜"""
+
+    LABEL = "知乎"
+    SOURCE_NAME = "知乎热榜"
+    ITEM_NAME = "热榜话题"
+    HOT_URL = "https://www.zhihu.com/api/v3/feed/topstory/hot-lists/total"
+    RATE_LIMIT = (0.5, 1)
+    CACHE_TTL = HOT_TTL
+
+    def parse_hot_topics(self, text: str) -> List[str]:
+        data = json.loads(text)
+        items = data.get("data", [])
+        topics = []
+        for item in items[:50]:  # 取前50个
+            target = item.get("target", {})
+            title = target.get("title", "")
+            if title:
+                topics.append(title)
+        return topics
+
+
+class WeiboSource(SourceSpec):
+    """微博热搜（需要登录态，成功率较低）"""
+
+    LABEL = "微博"
+    SOURCE_NAME = "微博热搜"
+    ITEM_NAME = "热搜话题"
+    HOT_URL = "https://weibo.com/ajax/side/hotSearch"
+    RATE_LIMIT = (0.2, 1)
+    CACHE_TTL = HOT_TTL
+
+    def parse_hot_topics(self, text: str) -> List[str]:
+        data = json.loads(text)
+        items = data.get("data", {}).get("realtime", [])
+        return [item.get("word", "") for item in items]
+
+
+class GoogleSource(SourceSpec):
+    """Google搜索建议"""
+
+    LABEL = "Google"
+    SOURCE_NAME = "Google建议"
+    SUGGEST_URL = "http://suggestqueries.google.com/complete/search"
+    RATE_LIMIT = (5.0, 5)
+    PREFIX_ALPHABET = LATIN_ALPHABET + COMMON_CHARS
+
+    def suggest_params(self, keyword: str) -> dict:
+        return {
+            "client": "youtube",
+            "ds": "yt",
+            "q": keyword,
+            "output": "json"
+        }
 
-        try:
-            data = response.json()
-            if isinstance(data, dict) and "result" in data:
-                suggestions = [item.get("value", "") for item in data.get("result", []) if "value" in item]
-                logger.info(f"  ✅ B站: 获取 {len(suggestions)} 个建议词")
-                return suggestions
-        except Exception as e:
-            logger.warning(f"  ⚠️  B站解析失败: {e}")
-
-        return []
+    def parse_suggestions(self, text: str) -> List[str]:
+        # Google返回的是JavaScript代码，需要解析
+        match = re.search(r'\((.*)\)', text)
+        if match:
+            data = json.loads(match.group(1))
+            return data[1] if len(data) > 1 else []
+        return None
 
 
-class TaobaoFetcher(EnhancedFetcher):
-    """淘宝搜索建议抓取器"""
+class BingSource(SourceSpec):
+    """Bing搜索建议"""
 
-    def fetch_suggestions(self, keyword: str) -> List[str]:
-        """抓取淘宝搜索建议"""
-        url = "https://suggest.taobao.com/sug"
-        params = {"q": keyword, "code": "utf-8"}
+    LABEL = "Bing"
+    SOURCE_NAME = "Bing建议"
+    SUGGEST_URL = "http://api.bing.com/qsonhs.aspx"
+    RATE_LIMIT = (5.0, 5)
+    PREFIX_ALPHABET = LATIN_ALPHABET + COMMON_CHARS
 
-        logger.info(f"  🔍 淘宝: {keyword}")
-        response = self.fetch(url, params=params, source_name="淘宝建议")
+    def suggest_params(self, keyword: str) -> dict:
+        return {
+            "type": "cb",
+            "q": keyword
+        }
 
-        if not response:
-            return []
+    def parse_suggestions(self, text: str) -> List[str]:
+        match = re.search(r'AS\.AddSugg\((.*)\)', text)
+        if match:
+            data = json.loads(match.group(1))
+            if isinstance(data, dict) and "AS" in data:
+                results = data["AS"]["Results"]
+                suggestions = []
+                for result in results:
+                    for suggestion in result.get("Suggs", []):
+                        suggestions.append(suggestion.get("Txt", ""))
+                return suggestions
+        return None
 
-        try:
-            data = response.json()
-            result = data.get("result", [])
-            suggestions = []
-            for item in result:
-                if isinstance(item, list) and len(item) > 0:
-                    suggestions.append(item[0])
-            logger.info(f"  ✅ 淘宝: 获取 {len(suggestions)} 个建议词")
-            return suggestions
-        except Exception as e:
-            logger.warning(f"  ⚠️  淘宝解析失败: {e}")
 
-        return []
+# ==================== 同步抓取器 ====================
 
+class BaiduFetcher(BaiduSource, EnhancedFetcher):
+    """百度搜索建议抓取器"""
 
-class ZhihuFetcher(EnhancedFetcher):
-    """知乎热榜抓取器"""
 
-    def fetch_hot_topics(self) -> List[str]:
-        """抓取知乎热榜"""
-        url = "https://www.zhihu.com/api/v3/feed/topstory/hot-lists/total"
+class BilibiliFetcher(BilibiliSource, EnhancedFetcher):
+    """B站搜索建议抓取器"""
 
-        logger.info(f"  🔍 知乎热榜")
-        response = self.fetch(url, source_name="知乎热榜")
 
-        if not response:
-            return []
+class TaobaoFetcher(TaobaoSource, EnhancedFetcher):
+    """淘宝搜索建议抓取器"""
 
-        try:
-            data = response.json()
-            items = data.get("data", [])
-            topics = []
-            for item in items[:50]:  # 取前50个
-                target = item.get("target", {})
-                title = target.get("title", "")
-                if title:
-                    topics.append(title)
-            logger.info(f"  ✅ 知乎: 获取 {len(topics)} 个热榜话题")
-            return topics
-        except Exception as e:
-            logger.warning(f"  ⚠️  知乎热榜解析失败: {e}")
 
-        return []
+class ZhihuFetcher(ZhihuSource, EnhancedFetcher):
+    """知乎热榜抓取器"""
 
 
-class WeiboFetcher(EnhancedFetcher):
+class WeiboFetcher(WeiboSource, EnhancedFetcher):
     """微博热搜抓取器（难度较高）"""
 
-    def fetch_hot_topics(self) -> List[str]:
-        """抓取微博热搜（需要登录态，成功率较低）"""
-        url = "https://weibo.com/ajax/side/hotSearch"
-
-        logger.info(f"  🔍 微博热搜")
-        response = self.fetch(url, source_name="微博热搜")
-
-        if not response:
-            return []
-
-        try:
-            data = response.json()
-            items = data.get("data", {}).get("realtime", [])
-            topics = [item.get("word", "") for item in items]
-            logger.info(f"  ✅ 微博: 获取 {len(topics)} 个热搜话题")
-            return topics
-        except Exception as e:
-            logger.warning(f"  ⚠️  微博热搜解析失败: {e}")
-
-        return []
 
-
-class GoogleAutoCompleteFetcher(EnhancedFetcher):
+class GoogleAutoCompleteFetcher(GoogleSource, EnhancedFetcher):
     """Google自动补全抓取器（新增）"""
 
-    def fetch_suggestions(self, keyword: str) -> List[str]:
-        """抓取Google搜索建议"""
-        url = "http://suggestqueries.google.com/complete/search"
-        params = {
-            "client": "youtube",
-            "ds": "yt",
-            "q": keyword,
-            "output": "json"
-        }
-
-        logger.info(f"  🔍 Google: {keyword}")
-        response = self.fetch(url, params=params, source_name="Google建议")
-
-        if not response:
-            return []
-
-        try:
-            text = response.text
-            # Google返回的是JavaScript代码，需要解析
-            match = re.search(r'\((.*)\)', text)
-            if match:
-                data = json.loads(match.group(1))
-                suggestions = data[1] if len(data) > 1 else []
-                logger.info(f"  ✅ Google: 获取 {len(suggestions)} 个建议词")
-                return suggestions
-        except Exception as e:
-            logger.warning(f"  ⚠️  Google解析失败: {e}")
-
-        return []
-
 
-class BingAutoCompleteFetcher(EnhancedFetcher):
+class BingAutoCompleteFetcher(BingSource, EnhancedFetcher):
     """Bing自动补全抓取器（新增）"""
 
-    def fetch_suggestions(self, keyword: str) -> List[str]:
-        """抓取Bing搜索建议"""
-        url = "http://api.bing.com/qsonhs.aspx"
-        params = {
-            "type": "cb",
-            "q": keyword
-        }
-
-        logger.info(f"  🔍 Bing: {keyword}")
-        response = self.fetch(url, params=params, source_name="Bing建议")
-
-        if not response:
-            return []
-
-        try:
-            text = response.text
-            match = re.search(r'AS\.AddSugg\((.*)\)', text)
-            if match:
-                data = json.loads(match.group(1))
-                if isinstance(data, dict) and "AS" in data:
-                    results = data["AS"]["Results"]
-                    suggestions = []
-                    for result in results:
-                        for suggestion in result.get("Suggs", []):
-                            suggestions.append(suggestion.get("Txt", ""))
-                    logger.info(f"  ✅ Bing: 获取 {len(suggestions)} 个建议词")
-                    return suggestions
-        except Exception as e:
-            logger.warning(f"  ⚠️  Bing解析失败: {e}")
-
-        return []
-
 
 # 工厂函数
 def create_fetcher(source: str, **kwargs) -> EnhancedFetcher:
@@ -403,6 +505,7 @@ def create_fetcher(source: str, **kwargs) -> EnhancedFetcher:
 
 if __name__ == "__main__":
     # 测试代码
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     print("=" * 60)
     print("🌐 增强版网络抓取器测试")
     print("=" * 60)